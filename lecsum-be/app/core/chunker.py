@@ -0,0 +1,230 @@
+# 토큰 기준 청킹 (페이지 / 슬라이드 경계 유지)
+# - 글자 수가 아닌 토큰 수로 청크 크기를 맞춰 한글 / 영어 문서의 청크 크기 편차를 줄임
+# - 청크가 페이지 중간에서 다른 페이지와 섞이지 않음
+#   · 작은 페이지(슬라이드)는 예산 안에서 통째로 이어 붙임
+#     (내용으로 정한 페이지 그룹 경계는 넘지 않음 → 재업로드 시 수정된 페이지의 그룹만 청크가 바뀜)
+#   · 예산보다 큰 페이지만 문단 / 문장 단위로 나누고, 이때만 페이지 안에서 겹침(overlap) 적용
+# - 각 청크 메타데이터에 token_count / page_start / page_end 저장
+# - 컬렉션별 설정: CHUNKING_CONFIG='{"lecture_docs": {"chunk_tokens": 500, "overlap_tokens": 50}}'
+import os
+import re
+import json
+import hashlib
+from functools import lru_cache
+
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+from app.core.tokenizer import count_tokens, split_by_tokens
+
+load_dotenv()
+
+# 청크 최대 토큰 수
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "500"))
+# 큰 페이지를 나눌 때 이전 청크와 겹치는 토큰 수 (페이지 경계를 넘어서는 겹치지 않음)
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))
+# 작은 페이지를 다음 페이지와 이어 붙일지 여부
+CHUNK_MERGE_PAGES = os.getenv("CHUNK_MERGE_PAGES", "true").lower() == "true"
+# 이어 붙이기 그룹의 평균 페이지 수 (페이지 내용 해시로 그룹 시작 페이지를 정함, 최대 2배, 0 이면 그룹 없이 이어 붙임)
+# 앞 페이지의 토큰 수가 바뀌어도 다른 그룹의 청크 경계는 그대로 유지됨
+CHUNK_MERGE_GROUP_PAGES = int(os.getenv("CHUNK_MERGE_GROUP_PAGES", "8"))
+# 컬렉션별 설정 (JSON, 항목이 없으면 위 기본값 사용)
+CHUNKING_CONFIG = os.getenv("CHUNKING_CONFIG", "")
+
+# 문장 경계: 마침표/물음표/느낌표(+닫는 따옴표/괄호) 뒤 공백
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])[\"')\]]*\s+")
+
+
+class ChunkingConfig:
+    """청킹 설정 (컬렉션 단위)"""
+
+    def __init__(
+        self,
+        chunk_tokens: int = CHUNK_TOKENS,
+        overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+        merge_pages: bool = CHUNK_MERGE_PAGES,
+        merge_group_pages: int = CHUNK_MERGE_GROUP_PAGES,
+    ):
+        if chunk_tokens <= 0:
+            raise ValueError("chunk_tokens 는 0보다 커야 합니다.")
+        if not 0 <= overlap_tokens < chunk_tokens:
+            raise ValueError("overlap_tokens 는 0 이상 chunk_tokens 미만이어야 합니다.")
+        if merge_group_pages < 0:
+            raise ValueError("merge_group_pages 는 0 이상이어야 합니다.")
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.merge_pages = merge_pages
+        self.merge_group_pages = merge_group_pages
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkingConfig(chunk_tokens={self.chunk_tokens}, "
+            f"overlap_tokens={self.overlap_tokens}, merge_pages={self.merge_pages}, "
+            f"merge_group_pages={self.merge_group_pages})"
+        )
+
+
+def _starts_merge_group(page_text: str, group_pages: int) -> bool:
+    """
+    페이지 내용 해시로 이어 붙이기 그룹의 시작 페이지인지 판단 (평균 group_pages 페이지마다 한 번)
+    페이지 번호가 아닌 내용으로 정하므로 슬라이드를 넣거나 빼도 다른 그룹의 경계는 바뀌지 않음
+    """
+    if group_pages <= 1:
+        return group_pages == 1
+    digest = hashlib.blake2b(page_text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % group_pages == 0
+
+
+def _split_units(text: str, max_tokens: int) -> list[tuple[str, int]]:
+    """
+    텍스트를 (단위 텍스트, 토큰 수) 목록으로 분할
+    줄 단위 → 문장 단위 → 토큰 단위 순으로, max_tokens 이하가 될 때까지 잘게 나눔
+    """
+    units: list[tuple[str, int]] = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        tokens = count_tokens(line)
+        if tokens <= max_tokens:
+            units.append((line, tokens))
+            continue
+        for sentence in _SENTENCE_BOUNDARY.split(line):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            tokens = count_tokens(sentence)
+            if tokens <= max_tokens:
+                units.append((sentence, tokens))
+                continue
+            for piece in split_by_tokens(sentence, max_tokens):
+                if piece.strip():
+                    units.append((piece, count_tokens(piece)))
+    return units
+
+
+class TokenChunker:
+    """페이지(슬라이드)별 Document 목록을 토큰 예산 청크로 분할"""
+
+    def __init__(self, config: ChunkingConfig | None = None):
+        self.config = config or ChunkingConfig()
+
+    def _make_chunk(self, texts: list[str], pages: list[Document]) -> Document:
+        content = "\n".join(texts)
+        first, last = pages[0].metadata, pages[-1].metadata
+        page_start = first.get("page", 0)
+        page_end = last.get("page", page_start)
+        metadata = {
+            **first,
+            "page": page_start,
+            "page_start": page_start,
+            "page_end": page_end,
+            "token_count": count_tokens(content),
+        }
+        if "slide" in first:
+            metadata["slide_end"] = last.get("slide", first["slide"])
+        return Document(page_content=content, metadata=metadata)
+
+    def _split_page(self, page: Document, units: list[tuple[str, int]]) -> list[Document]:
+        """예산보다 큰 페이지를 페이지 안에서만 겹치도록 분할"""
+        chunk_tokens, overlap_tokens = self.config.chunk_tokens, self.config.overlap_tokens
+        chunks: list[Document] = []
+        current: list[tuple[str, int]] = []
+        current_tokens = 0
+
+        for text, tokens in units:
+            if current and current_tokens + tokens > chunk_tokens:
+                chunks.append(self._make_chunk([t for t, _ in current], [page]))
+                # 이전 청크 끝부분을 overlap_tokens 이내로 이어받음
+                carried: list[tuple[str, int]] = []
+                carried_tokens = 0
+                for unit in reversed(current):
+                    if carried_tokens + unit[1] > overlap_tokens or carried_tokens + unit[1] + tokens > chunk_tokens:
+                        break
+                    carried.insert(0, unit)
+                    carried_tokens += unit[1]
+                current, current_tokens = carried, carried_tokens
+            current.append((text, tokens))
+            current_tokens += tokens
+
+        if current:
+            chunks.append(self._make_chunk([t for t, _ in current], [page]))
+        return chunks
+
+    def split_documents(self, docs: list[Document]) -> list[Document]:
+        stream = self.stream()
+        chunks = [chunk for page in docs for chunk in stream.feed(page)]
+        chunks.extend(stream.flush())
+        return chunks
+
+    def stream(self) -> "ChunkStream":
+        """페이지를 하나씩 넣으며 청크를 받는 점진 분할기 (스트리밍 수집용)"""
+        return ChunkStream(self)
+
+
+class ChunkStream:
+    """
+    TokenChunker.split_documents 와 같은 결과를 페이지 단위로 점진 생성
+    (이어 붙이는 중인 작은 페이지들만 메모리에 유지)
+    """
+
+    def __init__(self, chunker: TokenChunker):
+        self.chunker = chunker
+        self._texts: list[str] = []
+        self._pages: list[Document] = []
+        self._tokens = 0
+        # 현재 이어 붙이기 그룹에 들어간 페이지 수 (그룹이 너무 길어지지 않도록 제한)
+        self._group_pages = 0
+
+    def flush(self) -> list[Document]:
+        chunks = [self.chunker._make_chunk(self._texts, self._pages)] if self._pages else []
+        self._texts, self._pages, self._tokens = [], [], 0
+        return chunks
+
+    def feed(self, page: Document) -> list[Document]:
+        config = self.chunker.config
+        units = _split_units(page.page_content or "", config.chunk_tokens)
+        if not units:
+            return []
+        page_text = "\n".join(text for text, _ in units)
+        page_tokens = sum(tokens for _, tokens in units)
+
+        if page_tokens > config.chunk_tokens:
+            self._group_pages = 0
+            return self.flush() + self.chunker._split_page(page, units)
+
+        chunks = []
+        group_pages = config.merge_group_pages
+        if group_pages and (
+            _starts_merge_group(page_text, group_pages) or self._group_pages >= group_pages * 2
+        ):
+            chunks = self.flush()
+            self._group_pages = 0
+        if not config.merge_pages or self._tokens + page_tokens > config.chunk_tokens:
+            chunks += self.flush()
+        self._group_pages += 1
+        self._texts.append(page_text)
+        self._pages.append(page)
+        self._tokens += page_tokens
+        return chunks
+
+
+def _load_collection_configs() -> dict:
+    if not CHUNKING_CONFIG:
+        return {}
+    try:
+        return json.loads(CHUNKING_CONFIG)
+    except json.JSONDecodeError as e:
+        print(f"⚠️ CHUNKING_CONFIG 파싱 실패, 기본 청킹 설정을 사용합니다: {e}")
+        return {}
+
+
+def get_chunking_config(collection_name: str) -> ChunkingConfig:
+    """컬렉션별 청킹 설정 (CHUNKING_CONFIG 에 없으면 기본값)"""
+    return ChunkingConfig(**_load_collection_configs().get(collection_name, {}))
+
+
+@lru_cache(maxsize=None)
+def get_chunker(collection_name: str) -> TokenChunker:
+    """컬렉션별 청커 싱글톤"""
+    return TokenChunker(get_chunking_config(collection_name))
@@ -0,0 +1,174 @@
+# PDF / PPTX 텍스트 추출 (CPU 작업 → 전용 프로세스 풀에서 실행)
+# 주의: 자식 프로세스에서 import 되므로 LLM 클라이언트 등 무거운 모듈을 import 하지 않는다.
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator
+
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+from pptx import Presentation
+from pypdf import PdfReader
+
+load_dotenv()
+
+# 텍스트 추출 프로세스 수
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 한 작업이 추출하는 페이지(슬라이드) 수. 이보다 큰 문서는 범위로 나눠 병렬 추출
+PARSER_PAGES_PER_TASK = int(os.getenv("PARSER_PAGES_PER_TASK", "25"))
+
+SUPPORTED_EXTENSIONS = (".pdf", ".pptx")
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def is_supported(filename: str) -> bool:
+    return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def extract_text_from_pptx(file_path: str) -> str:
+    """PPTX 파일에서 텍스트 추출"""
+    return "\n".join(doc.page_content for doc in _extract_pptx_slides(file_path, "", 0, None))
+
+
+def _extract_pdf_pages(file_path: str, filename: str, start: int, end: int | None) -> list[Document]:
+    """PDF [start, end) 페이지를 페이지별 Document 로 추출 (PyPDFLoader 와 같은 메타데이터)"""
+    reader = PdfReader(file_path)
+    total_pages = len(reader.pages)
+    end = total_pages if end is None else min(end, total_pages)
+    # page_labels 는 접근할 때마다 문서 전체 라벨을 다시 계산하므로 한 번만 읽음
+    labels = reader.page_labels
+
+    docs: list[Document] = []
+    for page_number in range(start, end):
+        docs.append(Document(
+            page_content=reader.pages[page_number].extract_text() or "",
+            metadata={
+                "source": filename,
+                "page": page_number,
+                "page_label": labels[page_number],
+                "total_pages": total_pages,
+            },
+        ))
+    return docs
+
+
+def _extract_pptx_slides(file_path: str, filename: str, start: int, end: int | None) -> list[Document]:
+    """PPTX [start, end) 슬라이드를 슬라이드별 Document 로 추출"""
+    slides = list(Presentation(file_path).slides)
+    total_slides = len(slides)
+    end = total_slides if end is None else min(end, total_slides)
+
+    docs: list[Document] = []
+    for slide_number in range(start, end):
+        texts = [
+            shape.text
+            for shape in slides[slide_number].shapes
+            if hasattr(shape, "text")
+        ]
+        docs.append(Document(
+            page_content="\n".join(texts),
+            metadata={
+                "source": filename,
+                "page": slide_number,
+                "slide": slide_number + 1,
+                "total_pages": total_slides,
+            },
+        ))
+    return docs
+
+
+def count_pages(file_path: str, filename: str) -> int:
+    """PDF 페이지 수 / PPTX 슬라이드 수"""
+    if filename.lower().endswith(".pdf"):
+        return len(PdfReader(file_path).pages)
+    if filename.lower().endswith(".pptx"):
+        return len(Presentation(file_path).slides)
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {filename}")
+
+
+def extract_range(file_path: str, filename: str, start: int, end: int | None = None) -> list[Document]:
+    """파일 유형별 [start, end) 범위 추출 (동기, 프로세스 풀 안에서 실행)"""
+    if filename.lower().endswith(".pdf"):
+        return _extract_pdf_pages(file_path, filename, start, end)
+    if filename.lower().endswith(".pptx"):
+        return _extract_pptx_slides(file_path, filename, start, end)
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {filename}")
+
+
+def load_documents(file_path: str, filename: str) -> list[Document]:
+    """문서 전체를 페이지(슬라이드)별 Document 로 로드 (동기)"""
+    return extract_range(file_path, filename, 0, None)
+
+
+def page_ranges(total_pages: int, pages_per_task: int) -> list[tuple[int, int]]:
+    """[0, total_pages) 를 pages_per_task 크기의 범위로 분할"""
+    step = max(1, pages_per_task)
+    return [
+        (start, min(start + step, total_pages))
+        for start in range(0, total_pages, step)
+    ]
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """텍스트 추출 전용 프로세스 풀 싱글톤"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PARSER_WORKERS)
+    return _executor
+
+
+async def iter_document_pages(
+    file_path: str,
+    filename: str,
+    semaphore: asyncio.Semaphore | None = None,
+) -> AsyncIterator[Document]:
+    """
+    PARSER_PAGES_PER_TASK 페이지 범위 단위로 추출하며 페이지를 하나씩 반환 (스트리밍 수집용)
+    - 다음 범위 추출을 하나 미리 시작해 소비 쪽 처리와 겹쳐 진행
+    - 메모리에는 최대 두 범위의 페이지만 유지 → 문서 크기와 무관
+    semaphore: 있으면 범위 추출마다 이 세마포어 안에서 실행 (문서 간 파싱 동시 실행 한도)
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    total_pages = await loop.run_in_executor(executor, count_pages, file_path, filename)
+    ranges = page_ranges(total_pages, PARSER_PAGES_PER_TASK)
+
+    async def _extract(start: int, end: int) -> list[Document]:
+        if semaphore is None:
+            return await loop.run_in_executor(executor, extract_range, file_path, filename, start, end)
+        async with semaphore:
+            return await loop.run_in_executor(executor, extract_range, file_path, filename, start, end)
+
+    next_task = asyncio.ensure_future(_extract(*ranges[0])) if ranges else None
+    try:
+        for idx in range(len(ranges)):
+            docs = await next_task
+            next_task = asyncio.ensure_future(_extract(*ranges[idx + 1])) if idx + 1 < len(ranges) else None
+            for doc in docs:
+                yield doc
+    finally:
+        if next_task is not None and not next_task.done():
+            next_task.cancel()
+
+
+async def parse_document(file_path: str, filename: str) -> list[Document]:
+    """
+    프로세스 풀에서 텍스트 추출
+    - 큰 문서를 파싱하는 동안에도 이벤트 루프(다른 API 요청)가 멈추지 않는다.
+    - PARSER_PAGES_PER_TASK 보다 큰 문서는 페이지 범위로 나눠 여러 코어에서 추출 후 순서대로 합친다.
+    - 각 Document 는 page(0-based) / total_pages (PPTX 는 slide 1-based 포함) 메타데이터를 가진다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+
+    total_pages = await loop.run_in_executor(executor, count_pages, file_path, filename)
+    ranges = page_ranges(total_pages, PARSER_PAGES_PER_TASK)
+    if len(ranges) <= 1:
+        return await loop.run_in_executor(executor, load_documents, file_path, filename)
+
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(executor, extract_range, file_path, filename, start, end)
+        for start, end in ranges
+    ))
+    return [doc for part in parts for doc in part]
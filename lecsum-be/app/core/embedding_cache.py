@@ -0,0 +1,254 @@
+# 임베딩 디스크 캐시 (SQLite)
+# - 키: (임베딩 모델, sha256(text))
+# - 재업로드 청크, 반복 질문 등 같은 텍스트는 API 호출 없이 캐시에서 반환
+# - 최대 항목 수 초과 시 가장 오래 사용되지 않은 항목부터 삭제
+# - 캐시에 없는 같은 텍스트 묶음을 동시에 요청하면 API 는 한 번만 호출 (single-flight)
+# - 실제 API 호출은 전역 속도 제한(rate_limiter, embedding)을 거침 (우선순위는 호출한 요청의 llm_priority)
+import os
+import time
+import array
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+
+from app.core.enums import BASE_DIR
+from app.core.model_backend import get_embedding_model, embedding_cache_model
+from app.core.single_flight import get_single_flight
+from app.core.rate_limiter import get_rate_limiter, current_priority
+from app.core.tokenizer import count_tokens
+
+load_dotenv()
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(BASE_DIR, "vectorstore", "embedding_cache.sqlite3"),
+)
+# 캐시 최대 항목 수 (text-embedding-3-small 1536차원 float32 ≒ 6KB / 항목)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+# 한도 초과 시 한 번에 지우는 비율 (매 쓰기마다 정리하지 않도록 여유를 둠)
+EMBEDDING_CACHE_EVICT_RATIO = 0.1
+# 임베딩 API 한 요청에 들어가는 텍스트 수 (OpenAIEmbeddings 기본 chunk_size, 속도 제한 요청 수 계산용)
+EMBEDDING_TEXTS_PER_REQUEST = 1000
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array.array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array.array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """(model, sha256(text)) → 벡터 SQLite 캐시"""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, hashes: List[str]) -> List[Optional[List[float]]]:
+        """해시 목록 순서대로 벡터 반환 (없으면 None)"""
+        if not hashes:
+            return []
+        found: dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        now = time.time()
+
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = _unpack(blob)
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, key) for key in found],
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in hashes]
+            hit_count = sum(1 for vector in results if vector is not None)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, model: str, hashes: List[str], vectors: List[List[float]]):
+        if not hashes:
+            return
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(model, key, _pack(vector), now) for key, vector in zip(hashes, vectors)],
+            )
+            self._count += self._conn.total_changes - before
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """가장 오래 사용되지 않은 항목부터 한도의 일정 비율만큼 여유가 생기도록 삭제"""
+        target = int(self.max_entries * (1 - EMBEDDING_CACHE_EVICT_RATIO))
+        overflow = self._count - target
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE rowid IN (
+                SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+        )
+        self.evictions += overflow
+        self._count -= overflow
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 모델 래퍼: 캐시에 있는 텍스트는 그대로 반환하고 없는 텍스트만 API로 계산
+    Chroma(embedding_function=...) 등 LangChain Embeddings 자리에 그대로 사용 가능
+    """
+
+    def __init__(self, model: str, underlying: Embeddings, cache: "EmbeddingCache"):
+        self.model = model
+        self.underlying = underlying
+        self.cache = cache
+        self._flight = get_single_flight(f"embedding:{model}")
+
+    def _split_misses(self, texts: List[str]):
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.model, hashes)
+        # 같은 텍스트가 여러 번 있어도 한 번만 계산
+        missing: dict[str, str] = {}
+        for key, text, vector in zip(hashes, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        return hashes, vectors, missing
+
+    def _flight_key(self, missing: dict[str, str]) -> str:
+        return hashlib.sha256("|".join(missing.keys()).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _limit_args(texts: List[str]) -> tuple:
+        """(우선순위, 토큰 수, 요청 수) — 수집 중 임베딩은 백그라운드, 챗봇 질문 등은 호출한 쪽 우선순위"""
+        requests = max(1, -(-len(texts) // EMBEDDING_TEXTS_PER_REQUEST))
+        return current_priority(), sum(count_tokens(text) for text in texts), requests
+
+    @staticmethod
+    def _merge(hashes, vectors, computed: dict[str, List[float]]) -> List[List[float]]:
+        return [vector if vector is not None else computed[key] for key, vector in zip(hashes, vectors)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, vectors, missing = self._split_misses(texts)
+        computed: dict[str, List[float]] = {}
+        if missing:
+            def _compute() -> dict[str, List[float]]:
+                texts_to_embed = list(missing.values())
+                with get_rate_limiter("embedding").limit_sync(*self._limit_args(texts_to_embed)):
+                    new_vectors = self.underlying.embed_documents(texts_to_embed)
+                result = dict(zip(missing.keys(), new_vectors))
+                self.cache.put_many(self.model, list(result.keys()), list(result.values()))
+                return result
+
+            computed = self._flight.run_sync(self._flight_key(missing), _compute)
+        return self._merge(hashes, vectors, computed)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, vectors, missing = await asyncio.to_thread(self._split_misses, texts)
+        computed: dict[str, List[float]] = {}
+        if missing:
+            async def _compute() -> dict[str, List[float]]:
+                texts_to_embed = list(missing.values())
+                async with get_rate_limiter("embedding").limit(*self._limit_args(texts_to_embed)):
+                    new_vectors = await self.underlying.aembed_documents(texts_to_embed)
+                result = dict(zip(missing.keys(), new_vectors))
+                await asyncio.to_thread(
+                    self.cache.put_many, self.model, list(result.keys()), list(result.values())
+                )
+                return result
+
+            computed = await self._flight.run(self._flight_key(missing), _compute)
+        return self._merge(hashes, vectors, computed)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+_cache: Optional[EmbeddingCache] = None
+_embeddings: dict[str, CachedEmbeddings] = {}
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache()
+    return _cache
+
+
+def get_embeddings(model: str = DEFAULT_EMBEDDING_MODEL) -> CachedEmbeddings:
+    """모델별 캐시 적용 임베딩 싱글톤"""
+    if model not in _embeddings:
+        _embeddings[model] = CachedEmbeddings(
+            model=embedding_cache_model(model),
+            underlying=get_embedding_model(model),
+            cache=get_embedding_cache(),
+        )
+    return _embeddings[model]
@@ -0,0 +1,128 @@
+# 대량 임베딩 계산 / Chroma 저장
+# - 청크를 토큰 수 기준 배치로 묶어 한 번의 API 요청으로 임베딩
+# - 배치 요청은 동시 호출 수 제한 하에 병렬 실행
+# - Chroma 저장은 큰 배치 단위 upsert (청크마다 add 호출하지 않음)
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+
+from app.core.tokenizer import count_tokens
+from app.core.embedding_cache import get_embeddings
+
+load_dotenv()
+
+# 배치 하나의 최대 토큰 수 (OpenAI 임베딩 요청당 300k 토큰 제한보다 여유 있게)
+EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "100000"))
+# 배치 하나의 최대 입력 개수 (OpenAI 요청당 2048개 제한)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "512"))
+# 동시에 보내는 배치 요청 수
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+# Chroma upsert 한 번에 저장하는 항목 수
+CHROMA_UPSERT_BATCH = int(os.getenv("CHROMA_UPSERT_BATCH", "1000"))
+
+
+def batch_by_tokens(
+    texts: List[str],
+    max_tokens: int = EMBEDDING_BATCH_TOKENS,
+    max_items: int = EMBEDDING_BATCH_SIZE,
+) -> List[List[int]]:
+    """텍스트 순서를 유지하며 토큰 수 / 개수 한도 이하의 인덱스 배치로 묶는다."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for idx, text in enumerate(texts):
+        tokens = count_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(idx)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _merge_batches(total: int, batches: List[List[int]], results: List[List[List[float]]]) -> List[List[float]]:
+    vectors: List[Optional[List[float]]] = [None] * total
+    for batch, batch_vectors in zip(batches, results):
+        for idx, vector in zip(batch, batch_vectors):
+            vectors[idx] = vector
+    return vectors
+
+
+async def embed_texts(
+    texts: List[str],
+    embeddings: Optional[Embeddings] = None,
+    concurrency: int = EMBEDDING_CONCURRENCY,
+) -> List[List[float]]:
+    """토큰 기준 배치 + 동시 호출 제한으로 임베딩 계산 (입력 순서 유지)"""
+    if not texts:
+        return []
+    embeddings = embeddings or get_embeddings()
+    batches = batch_by_tokens(texts)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _embed_batch(batch: List[int]) -> List[List[float]]:
+        async with semaphore:
+            return await embeddings.aembed_documents([texts[idx] for idx in batch])
+
+    results = await asyncio.gather(*(_embed_batch(batch) for batch in batches))
+    return _merge_batches(len(texts), batches, results)
+
+
+def embed_texts_sync(
+    texts: List[str],
+    embeddings: Optional[Embeddings] = None,
+    concurrency: int = EMBEDDING_CONCURRENCY,
+) -> List[List[float]]:
+    """embed_texts 의 동기 버전 (스레드 풀로 배치 병렬 처리)"""
+    if not texts:
+        return []
+    embeddings = embeddings or get_embeddings()
+    batches = batch_by_tokens(texts)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as executor:
+        results = list(executor.map(
+            lambda batch: embeddings.embed_documents([texts[idx] for idx in batch]),
+            batches,
+        ))
+    return _merge_batches(len(texts), batches, results)
+
+
+def upsert_in_batches(
+    collection,
+    ids: List[str],
+    embeddings: List[List[float]],
+    documents: List[str],
+    metadatas: List[dict],
+    batch_size: int = CHROMA_UPSERT_BATCH,
+):
+    """Chroma 컬렉션에 큰 배치 단위로 upsert (동기)"""
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        collection.upsert(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end],
+            documents=documents[start:end],
+            metadatas=metadatas[start:end],
+        )
+
+
+async def aupsert_in_batches(
+    collection,
+    ids: List[str],
+    embeddings: List[List[float]],
+    documents: List[str],
+    metadatas: List[dict],
+    batch_size: int = CHROMA_UPSERT_BATCH,
+):
+    """upsert_in_batches 를 이벤트 루프 밖(스레드)에서 실행"""
+    await asyncio.to_thread(
+        upsert_in_batches, collection, ids, embeddings, documents, metadatas, batch_size
+    )
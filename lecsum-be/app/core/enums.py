@@ -7,4 +7,49 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CHROMA_PERSIST_DIR = os.path.join(BASE_DIR, "vectorstore", "chroma")
 
 class ChromaDB(str, Enum):
-    COLLECTION_NAME = "lecture_docs"
\ No newline at end of file
+    COLLECTION_NAME = "lecture_docs"
+
+# 문서 수집(Ingestion) 파이프라인 단계
+class IngestionStage(str, Enum):
+    PARSING = "parsing"
+    SUMMARIZING = "summarizing"
+    KEYWORDS = "keywords"
+    TOP_SENTENCES = "top_sentences"
+    CHUNKING = "chunking"
+    EMBEDDING = "embedding"
+    SAVING = "saving"
+    # 동일 내용 문서가 이미 있어 파이프라인을 건너뛰거나 재사용한 경우
+    DEDUPLICATED = "deduplicated"
+
+
+# 수집 프로필
+class IngestionProfile(str, Enum):
+    # 로컬 키워드 후보 + LLM 보정
+    STANDARD = "standard"
+    # 키워드 LLM 호출 생략 (로컬 추출 결과 그대로 사용)
+    FAST = "fast"
+
+
+# LLM / 임베딩 모델 백엔드
+class ModelBackend(str, Enum):
+    OPENAI = "openai"
+    # 네트워크 없이 결정적으로 응답하는 로컬 모델 (부하 테스트 / 벤치마크용)
+    FAKE = "fake"
+
+
+# 수집 Job 상태
+class IngestionJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# OpenAI 호출 우선순위 (전역 속도 제한에서 한도가 찰 때 먼저 통과하는 순서)
+class LLMPriority(str, Enum):
+    # 챗봇 / 자료 추천 등 사용자가 화면에서 기다리는 대화형 요청
+    CHAT = "chat"
+    # 채점 / 해설 보강 / 퀴즈 생성
+    GRADING = "grading"
+    # 문서 수집(요약 / 키워드 / 임베딩) 등 백그라운드 작업
+    BACKGROUND = "background"
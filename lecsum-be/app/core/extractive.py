@@ -0,0 +1,177 @@
+# 로컬 추출 요약: 핵심 문장 선정 (LLM 호출 없음)
+# 1. 청크 임베딩(수집 시 이미 계산된 값)으로 코사인 유사도 그래프를 만들고 TextRank 로 청크 중요도 계산
+# 2. 중요도 상위 청크의 문장을 후보로, 문서 전체 TF-IDF 중심 벡터와의 유사도로 문장 점수 계산
+# 3. 문장 점수 = 청크 중요도 × 문장 중심성, 중복 / 같은 청크 편중을 피해 top-k 선택
+import re
+import math
+from collections import Counter
+
+import numpy as np
+
+# TextRank 감쇠 계수 / 반복 횟수 / 수렴 기준
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITER = 100
+TEXTRANK_TOL = 1e-6
+
+# 문장 후보 길이 (글자 수)
+MIN_SENTENCE_CHARS = 20
+MAX_SENTENCE_CHARS = 300
+# 한 청크에서 뽑는 최대 문장 수
+MAX_SENTENCES_PER_CHUNK = 2
+# 후보 문장 어휘 상한 (TF-IDF 행렬 크기 제한)
+MAX_VOCAB = 4096
+# 스트리밍 수집에서 유지하는 후보 청크 수
+SENTENCE_POOL_SIZE = 64
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+_WORD = re.compile(r"[0-9A-Za-z가-힣]{2,}")
+
+
+def textrank(vectors: np.ndarray) -> np.ndarray:
+    """
+    임베딩 행렬(n × d)로 TextRank 점수 계산
+    간선 가중치 = 양의 코사인 유사도 (자기 자신 제외)
+    """
+    n = vectors.shape[0]
+    if n == 1:
+        return np.ones(1, dtype=np.float32)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.maximum(norms, 1e-12)
+    similarity = np.clip(unit @ unit.T, 0.0, None)
+    np.fill_diagonal(similarity, 0.0)
+
+    # 행 정규화 (연결이 없는 노드는 균등 분배)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(row_sums > 0, similarity / np.maximum(row_sums, 1e-12), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n, dtype=np.float64)
+    for _ in range(TEXTRANK_MAX_ITER):
+        updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TEXTRANK_TOL:
+            scores = updated
+            break
+        scores = updated
+    return scores / scores.max()
+
+
+def split_sentences(text: str) -> list[str]:
+    """후보 문장 분리 (너무 짧거나 긴 문장, 글자가 없는 줄 제외)"""
+    sentences = []
+    for sentence in _SENTENCE_SPLIT.split(text or ""):
+        sentence = " ".join(sentence.split())
+        if MIN_SENTENCE_CHARS <= len(sentence) <= MAX_SENTENCE_CHARS and _WORD.search(sentence):
+            sentences.append(sentence)
+    return sentences
+
+
+def _tfidf_matrix(sentences: list[str], documents: list[str]) -> np.ndarray:
+    """문장 × 어휘 TF-IDF 행렬 (IDF 는 청크 단위 문서 빈도 기준, L2 정규화)"""
+    tokenized = [_WORD.findall(sentence.lower()) for sentence in sentences]
+    document_freq = Counter(word for doc in documents for word in set(_WORD.findall(doc.lower())))
+    vocab_counts = Counter(word for words in tokenized for word in words)
+    vocab = {word: idx for idx, (word, _) in enumerate(vocab_counts.most_common(MAX_VOCAB))}
+
+    n_docs = max(1, len(documents))
+    idf = np.zeros(len(vocab), dtype=np.float32)
+    for word, idx in vocab.items():
+        idf[idx] = math.log((1 + n_docs) / (1 + document_freq.get(word, 0))) + 1
+
+    matrix = np.zeros((len(sentences), len(vocab)), dtype=np.float32)
+    for row, words in enumerate(tokenized):
+        for word, count in Counter(words).items():
+            idx = vocab.get(word)
+            if idx is not None:
+                matrix[row, idx] = count
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class SentencePool:
+    """
+    스트리밍 수집용 핵심 문장 후보 청크 풀 (청크 전체를 들고 있지 않음)
+    - 모든 청크 임베딩(단위 벡터)의 합으로 문서 중심 벡터를 누적
+    - 풀이 capacity 의 2배가 되면 현재 중심 벡터와 덜 비슷한 청크부터 버려 capacity 로 줄임
+    - 끝나면 남은 청크로 rank_top_sentences (중심과 가까운 청크 = TextRank 점수가 높은 청크 근사)
+    """
+
+    def __init__(self, capacity: int = SENTENCE_POOL_SIZE):
+        self.capacity = capacity
+        self._centroid: np.ndarray | None = None
+        # (등장 순번, 청크 텍스트, 단위 벡터)
+        self._items: list[tuple[int, str, np.ndarray]] = []
+        self._seen = 0
+
+    def add(self, text: str, vector: list[float]):
+        unit = np.asarray(vector, dtype=np.float32)
+        unit /= max(float(np.linalg.norm(unit)), 1e-12)
+        self._centroid = unit.copy() if self._centroid is None else self._centroid + unit
+        self._items.append((self._seen, text, unit))
+        self._seen += 1
+        if len(self._items) >= 2 * self.capacity:
+            self._evict()
+
+    def _evict(self):
+        similarity = np.stack([unit for _, _, unit in self._items]) @ self._centroid
+        keep = np.sort(np.argsort(-similarity)[:self.capacity])
+        self._items = [self._items[idx] for idx in keep.tolist()]
+
+    def select(self, k: int = 5) -> list[str]:
+        if not self._items:
+            return []
+        self._items.sort(key=lambda item: item[0])
+        return rank_top_sentences(
+            [text for _, text, _ in self._items],
+            [unit for _, _, unit in self._items],
+            k,
+        )
+
+
+def rank_top_sentences(chunks: list[str], vectors: list[list[float]], k: int = 5) -> list[str]:
+    """
+    청크 텍스트와 청크 임베딩으로 핵심 문장 k개를 문서 등장 순서대로 반환
+    """
+    if not chunks or not vectors or k <= 0:
+        return []
+
+    chunk_scores = textrank(np.asarray(vectors, dtype=np.float32))
+    # 상위 청크에서만 후보 문장 수집 (문서 길이와 무관하게 계산량 고정)
+    candidate_chunks = np.argsort(-chunk_scores)[:max(3 * k, 10)]
+
+    sentences: list[str] = []
+    owners: list[int] = []
+    seen: set[str] = set()
+    for chunk_idx in sorted(candidate_chunks.tolist()):
+        for sentence in split_sentences(chunks[chunk_idx]):
+            # 청크 겹침(overlap)으로 인한 중복 문장 제거
+            if sentence in seen:
+                continue
+            seen.add(sentence)
+            sentences.append(sentence)
+            owners.append(chunk_idx)
+    if not sentences:
+        return []
+
+    tfidf = _tfidf_matrix(sentences, chunks)
+    centroid = tfidf.mean(axis=0)
+    centroid /= max(float(np.linalg.norm(centroid)), 1e-12)
+    centrality = tfidf @ centroid
+
+    scores = centrality * chunk_scores[np.asarray(owners)]
+    # 청크가 적은 짧은 문서는 청크당 상한을 늘려 k개를 채움
+    per_chunk_limit = max(MAX_SENTENCES_PER_CHUNK, math.ceil(k / len(candidate_chunks)))
+    selected: list[int] = []
+    per_chunk: Counter = Counter()
+    for idx in np.argsort(-scores).tolist():
+        if per_chunk[owners[idx]] >= per_chunk_limit:
+            continue
+        # 이미 고른 문장과 거의 같은 문장은 건너뜀
+        if selected and float(np.max(tfidf[selected] @ tfidf[idx])) > 0.8:
+            continue
+        selected.append(idx)
+        per_chunk[owners[idx]] += 1
+        if len(selected) == k:
+            break
+
+    return [sentences[idx] for idx in sorted(selected)]
@@ -0,0 +1,230 @@
+# 수집(Ingestion) 단계별 체크포인트 저장소 (SQLite)
+# - 키: 업로드 원본 content_hash (요약만 summary_type 별로 저장)
+# - 단계 결과(요약 / 키워드 / 청크 / 임베딩)를 완료 즉시 저장하여
+#   VectorDB / MySQL 저장 단계에서 실패해도 재시도 시 이미 비용을 낸 LLM / 임베딩 결과를 재사용
+# - 수집 기록(ingestions)으로 실패 / 중단된 수집을 조회하고 이어서 처리
+# - 수집이 끝까지 성공하면 해당 문서의 체크포인트는 삭제
+# (추출 텍스트는 수집 후에도 계속 쓰이므로 text_store 에 따로 영구 보관)
+import os
+import json
+import time
+import zlib
+import array
+import sqlite3
+import threading
+from typing import Any, List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.enums import BASE_DIR, IngestionJobStatus
+
+load_dotenv()
+
+INGESTION_CHECKPOINT_PATH = os.getenv(
+    "INGESTION_CHECKPOINT_PATH",
+    os.path.join(BASE_DIR, "vectorstore", "ingestion_checkpoints.sqlite3"),
+)
+# running 상태로 이 시간(초) 이상 갱신이 없으면 중단된 수집으로 간주
+INGESTION_STALE_SEC = int(os.getenv("INGESTION_STALE_SEC", "1800"))
+
+# 체크포인트 단계 이름
+CHECKPOINT_KEYWORDS = "keywords"
+CHECKPOINT_CHUNKS = "chunks"
+CHECKPOINT_EMBEDDINGS = "embeddings"
+
+
+def summary_checkpoint(summary_type: str) -> str:
+    """요약은 스타일별로 따로 저장"""
+    return f"summary:{summary_type}"
+
+
+def _pack_vectors(vectors: List[List[float]]) -> bytes:
+    dim = len(vectors[0]) if vectors else 0
+    values = array.array("f", [value for vector in vectors for value in vector])
+    return dim.to_bytes(4, "little") + values.tobytes()
+
+
+def _unpack_vectors(blob: bytes) -> List[List[float]]:
+    dim = int.from_bytes(blob[:4], "little")
+    values = array.array("f")
+    values.frombytes(blob[4:])
+    flat = values.tolist()
+    return [flat[i:i + dim] for i in range(0, len(flat), dim)] if dim else []
+
+
+class IngestionCheckpointStore:
+    """content_hash 단위 단계 결과 / 수집 상태 저장소"""
+
+    def __init__(self, path: str = INGESTION_CHECKPOINT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS ingestions (
+                content_hash TEXT NOT NULL,
+                summary_type TEXT NOT NULL,
+                document_uuid TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                status TEXT NOT NULL,
+                last_stage TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, summary_type)
+            );
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                content_hash TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, stage)
+            );
+            """
+        )
+        self._conn.commit()
+
+    # ---------- 단계 결과 ----------
+    def _put(self, content_hash: str, stage: str, payload: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (content_hash, stage, payload, updated_at) VALUES (?, ?, ?, ?)",
+                (content_hash, stage, zlib.compress(payload), time.time()),
+            )
+            self._conn.commit()
+
+    def _get(self, content_hash: str, stage: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM checkpoints WHERE content_hash = ? AND stage = ?",
+                (content_hash, stage),
+            ).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def put_json(self, content_hash: str, stage: str, value: Any):
+        self._put(content_hash, stage, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def get_json(self, content_hash: str, stage: str) -> Any:
+        payload = self._get(content_hash, stage)
+        return json.loads(payload) if payload is not None else None
+
+    def put_vectors(self, content_hash: str, stage: str, vectors: List[List[float]]):
+        self._put(content_hash, stage, _pack_vectors(vectors))
+
+    def get_vectors(self, content_hash: str, stage: str) -> Optional[List[List[float]]]:
+        payload = self._get(content_hash, stage)
+        return _unpack_vectors(payload) if payload is not None else None
+
+    def stages(self, content_hash: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage FROM checkpoints WHERE content_hash = ? ORDER BY updated_at",
+                (content_hash,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self, content_hash: str):
+        """수집 완료 후 체크포인트 삭제 (같은 내용의 다른 스타일 수집이 진행 중이면 유지)"""
+        with self._lock:
+            pending = self._conn.execute(
+                "SELECT COUNT(*) FROM ingestions WHERE content_hash = ? AND status != ?",
+                (content_hash, IngestionJobStatus.COMPLETED.value),
+            ).fetchone()[0]
+            if pending == 0:
+                self._conn.execute("DELETE FROM checkpoints WHERE content_hash = ?", (content_hash,))
+                self._conn.commit()
+
+    # ---------- 수집 상태 ----------
+    def start(self, content_hash: str, summary_type: str, filename: str, document_uuid: str) -> str:
+        """
+        수집 시작 기록
+        이전에 끝나지 않은 같은 수집이 있으면 그때의 document_uuid 를 재사용 (VectorDB 청크 ID 유지)
+        Returns: document_uuid
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document_uuid, status FROM ingestions WHERE content_hash = ? AND summary_type = ?",
+                (content_hash, summary_type),
+            ).fetchone()
+            if row and row[1] != IngestionJobStatus.COMPLETED.value:
+                document_uuid = row[0]
+            self._conn.execute(
+                """
+                INSERT INTO ingestions
+                    (content_hash, summary_type, document_uuid, filename, status, last_stage, error, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, ?)
+                ON CONFLICT (content_hash, summary_type) DO UPDATE SET
+                    document_uuid = excluded.document_uuid,
+                    filename = excluded.filename,
+                    status = excluded.status,
+                    error = NULL,
+                    updated_at = excluded.updated_at
+                """,
+                (content_hash, summary_type, document_uuid, filename,
+                 IngestionJobStatus.RUNNING.value, now, now),
+            )
+            self._conn.commit()
+        return document_uuid
+
+    def _update(self, content_hash: str, summary_type: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingestions SET {assignments} WHERE content_hash = ? AND summary_type = ?",
+                [*fields.values(), content_hash, summary_type],
+            )
+            self._conn.commit()
+
+    def mark_stage(self, content_hash: str, summary_type: str, stage: str):
+        self._update(content_hash, summary_type, last_stage=stage)
+
+    def mark_failed(self, content_hash: str, summary_type: str, error: str):
+        self._update(content_hash, summary_type, status=IngestionJobStatus.FAILED.value, error=error)
+
+    def mark_completed(self, content_hash: str, summary_type: str):
+        self._update(content_hash, summary_type, status=IngestionJobStatus.COMPLETED.value, error=None)
+
+    def get_ingestion(self, content_hash: str, summary_type: str) -> Optional[dict]:
+        rows = self._select(
+            "WHERE content_hash = ? AND summary_type = ?", (content_hash, summary_type)
+        )
+        return rows[0] if rows else None
+
+    def list_unfinished(self, limit: int = 100) -> List[dict]:
+        """실패했거나 INGESTION_STALE_SEC 이상 진행이 멈춘 수집 목록"""
+        stale_before = time.time() - INGESTION_STALE_SEC
+        return self._select(
+            "WHERE status = ? OR (status = ? AND updated_at < ?) ORDER BY updated_at DESC LIMIT ?",
+            (IngestionJobStatus.FAILED.value, IngestionJobStatus.RUNNING.value, stale_before, limit),
+        )
+
+    def _select(self, clause: str, params: tuple) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT content_hash, summary_type, document_uuid, filename, status, last_stage, error, "
+                f"created_at, updated_at FROM ingestions {clause}",
+                params,
+            ).fetchall()
+        keys = (
+            "content_hash", "summary_type", "document_uuid", "filename", "status",
+            "last_stage", "error", "created_at", "updated_at",
+        )
+        results = [dict(zip(keys, row)) for row in rows]
+        for item in results:
+            item["checkpoints"] = self.stages(item["content_hash"])
+        return results
+
+
+_store: Optional[IngestionCheckpointStore] = None
+
+
+def get_checkpoint_store() -> IngestionCheckpointStore:
+    global _store
+    if _store is None:
+        _store = IngestionCheckpointStore()
+    return _store
@@ -0,0 +1,312 @@
+# 로컬 키워드 추출 (LLM 호출 없음)
+# - 후보: 문장 부호 / 불용어 / 서술어로 끊기는 명사구(1~3 단어 n-gram), 한국어 조사는 떼어서 정규화
+# - 점수: BM25 (문서 내 빈도 × 전체 업로드 문서 기준 IDF), 여러 단어 후보에 가중치
+# - 코퍼스 통계(문서 수 / 후보별 문서 빈도)는 업로드마다 SQLite 에 누적 → 검색 가중치 등에 재사용
+import os
+import re
+import math
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.enums import BASE_DIR
+
+load_dotenv()
+
+KEYWORD_CORPUS_PATH = os.getenv(
+    "KEYWORD_CORPUS_PATH",
+    os.path.join(BASE_DIR, "vectorstore", "keyword_corpus.sqlite3"),
+)
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 후보 최대 단어 수
+MAX_PHRASE_WORDS = 3
+# 여러 단어 후보 가중치 (단어 하나 늘 때마다)
+PHRASE_LENGTH_BOOST = 0.3
+# 여러 단어 후보는 문서에 이 횟수 이상 나와야 후보로 인정
+MIN_PHRASE_FREQ = 2
+# 문서 하나에서 유지하는 최대 후보 수 (아주 긴 문서의 메모리 상한)
+KEYWORD_MAX_CANDIDATES = int(os.getenv("KEYWORD_MAX_CANDIDATES", "200000"))
+
+_TOKEN = re.compile(r"[0-9A-Za-z가-힣][0-9A-Za-z가-힣+#]*")
+# 명사구가 이어지지 않는 경계 (문장 부호 / 줄바꿈)
+_SEGMENT_BOUNDARY = re.compile(r"[\n.,;:!?()\[\]{}\"'“”‘’·•|/]+")
+
+# 긴 것부터 검사 (예: "에서는" 을 "는" 보다 먼저)
+_PARTICLES = sorted(
+    [
+        "에서는", "에서의", "으로는", "으로써", "으로서", "에게서", "이라는", "이라고",
+        "에서", "으로", "에게", "까지", "부터", "보다", "처럼", "마다", "이나", "라는",
+        "과의", "와의", "에는", "에도", "로는", "로써", "로서", "들은", "들이", "들을", "들의",
+        "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만",
+    ],
+    key=len,
+    reverse=True,
+)
+# 서술어 / 연결 어미 (명사구 경계로 취급)
+_PREDICATE = re.compile(
+    r"(다|니다|하고|하며|하면|해서|하여|하는|되고|되며|되면|되어|되는|있는|없는|"
+    r"이고|이며|이면|지만|으며|으면|는데|도록|므로|거나|하기|되기|시킨|시켜|해야|어야|아야)$"
+)
+_STOPWORDS = {
+    # 한국어
+    "및", "등", "또는", "그리고", "그러나", "하지만", "따라서", "또한", "즉", "이", "그", "저",
+    "것", "수", "때", "경우", "통해", "위해", "대해", "같은", "다음", "이번", "여기",
+    "사용", "과정", "방식", "예시", "설명", "내용", "부분", "정도", "자료", "강의", "페이지",
+    "문제", "방법", "가지", "이상", "이하", "모든", "각", "더", "매우", "가장", "다른", "우리",
+    "위한", "의한", "관한", "따른", "통한", "대한",
+    # 영어
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "by", "is", "are",
+    "was", "were", "be", "been", "this", "that", "these", "those", "it", "its", "as", "at",
+    "from", "we", "you", "can", "will", "not", "but", "if", "then", "than", "so", "such",
+    "into", "which", "what", "when", "how", "use", "using", "used", "example", "page",
+}
+
+
+def _normalize_token(token: str) -> tuple[Optional[str], bool]:
+    """
+    토큰 정규화
+    Returns: (정규화된 토큰 또는 None(경계), 조사를 떼었는지 여부)
+    """
+    if token.lower() in _STOPWORDS or token.isdigit():
+        return None, False
+    if not re.search(r"[가-힣]", token):
+        return (token if len(token) >= 2 else None), False
+
+    if _PREDICATE.search(token):
+        return None, False
+    for particle in _PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            stem = token[:-len(particle)]
+            return (None if stem in _STOPWORDS else stem), True
+    return (token if len(token) >= 2 else None), False
+
+
+class CandidateCounter:
+    """
+    명사구 후보 빈도 누적 (페이지 단위로 add 가능 → 전체 텍스트를 한 번에 들고 있을 필요 없음)
+    후보 수가 KEYWORD_MAX_CANDIDATES 를 넘으면 한 번만 나온 후보부터 정리 (lossy counting)
+    """
+
+    def __init__(self, max_candidates: int = KEYWORD_MAX_CANDIDATES):
+        self.max_candidates = max_candidates
+        self.counts: Counter = Counter()
+        # 소문자 키와 표기가 다른 경우만 표기별 빈도 기록 (대부분의 한국어 후보는 키 = 표기)
+        self._surfaces: Dict[str, Counter] = {}
+        self.length = 0
+        self._prune_floor = 1
+
+    def _emit(self, phrase: List[str]):
+        for n in range(1, min(MAX_PHRASE_WORDS, len(phrase)) + 1):
+            for i in range(len(phrase) - n + 1):
+                surface = " ".join(phrase[i:i + n])
+                key = surface.lower()
+                self.counts[key] += 1
+                if surface != key:
+                    self._surfaces.setdefault(key, Counter())[surface] += 1
+
+    def add(self, text: str):
+        for segment in _SEGMENT_BOUNDARY.split(text or ""):
+            phrase: List[str] = []
+            for token in _TOKEN.findall(segment):
+                word, ends_phrase = _normalize_token(token)
+                if word is None:
+                    self._emit(phrase)
+                    phrase = []
+                    continue
+                self.length += 1
+                phrase.append(word)
+                # 조사가 붙은 단어에서 명사구가 끝남
+                if ends_phrase:
+                    self._emit(phrase)
+                    phrase = []
+            self._emit(phrase)
+
+        if len(self.counts) > self.max_candidates:
+            self._prune()
+
+    def _prune(self):
+        for key in [key for key, count in self.counts.items() if count <= self._prune_floor]:
+            del self.counts[key]
+            self._surfaces.pop(key, None)
+        # 정리 후에도 상한의 절반을 넘으면 다음 정리 기준을 올림
+        if len(self.counts) > self.max_candidates // 2:
+            self._prune_floor += 1
+
+    def surface(self, key: str) -> str:
+        """가장 많이 나온 표기"""
+        variants = self._surfaces.get(key)
+        if not variants:
+            return key
+        surface, count = variants.most_common(1)[0]
+        return surface if count > self.counts[key] - sum(variants.values()) else key
+
+    def candidates(self) -> Counter:
+        """후보(소문자 키) → 빈도 (여러 단어 후보는 MIN_PHRASE_FREQ 이상만)"""
+        return Counter({
+            key: count for key, count in self.counts.items()
+            if " " not in key or count >= MIN_PHRASE_FREQ
+        })
+
+
+class KeywordCorpus:
+    """업로드 문서 전체의 후보별 문서 빈도(DF) 누적 저장소"""
+
+    def __init__(self, path: str = KEYWORD_CORPUS_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS corpus_documents (
+                doc_key TEXT PRIMARY KEY,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS corpus_terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        self._documents, self._total_length = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM corpus_documents"
+        ).fetchone()
+
+    def add_document(self, doc_key: str, terms: Iterable[str], length: int) -> bool:
+        """문서 한 건의 후보를 DF 에 반영 (같은 doc_key 는 한 번만 반영)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO corpus_documents (doc_key, length) VALUES (?, ?)",
+                (doc_key, length),
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._conn.executemany(
+                "INSERT INTO corpus_terms (term, df) VALUES (?, 1) "
+                "ON CONFLICT (term) DO UPDATE SET df = df + 1",
+                [(term,) for term in set(terms)],
+            )
+            self._conn.commit()
+            self._documents += 1
+            self._total_length += length
+        return True
+
+    def document_frequencies(self, terms: List[str]) -> Dict[str, int]:
+        frequencies: Dict[str, int] = {}
+        with self._lock:
+            # SQLite 바인딩 변수 개수 제한 → 나눠서 조회
+            for i in range(0, len(terms), 500):
+                batch = terms[i:i + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                frequencies.update(self._conn.execute(
+                    f"SELECT term, df FROM corpus_terms WHERE term IN ({placeholders})", batch
+                ).fetchall())
+        return frequencies
+
+    @property
+    def documents(self) -> int:
+        return self._documents
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / self._documents if self._documents else 0.0
+
+    def idf(self, terms: List[str]) -> Dict[str, float]:
+        """BM25 IDF (검색 질의 가중치 등에서 재사용, 소문자 후보 키 기준)"""
+        frequencies = self.document_frequencies(terms)
+        n = max(self._documents, 1)
+        return {
+            term: math.log(1 + (n - frequencies.get(term, 0) + 0.5) / (frequencies.get(term, 0) + 0.5))
+            for term in terms
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            terms = self._conn.execute("SELECT COUNT(*) FROM corpus_terms").fetchone()[0]
+        return {
+            "path": self.path,
+            "documents": self._documents,
+            "terms": terms,
+            "average_length": round(self.average_length, 1),
+        }
+
+
+def _contains(phrase: str, part: str) -> bool:
+    return f" {part} " in f" {phrase} "
+
+
+def extract_keywords(
+    text: str,
+    k: int = 10,
+    doc_key: Optional[str] = None,
+    corpus: Optional["KeywordCorpus"] = None,
+) -> List[str]:
+    """
+    BM25 점수 상위 키워드 k개 (점수 순)
+    doc_key 가 있으면 이 문서를 코퍼스 통계에 반영한 뒤 점수 계산
+    """
+    counter = CandidateCounter()
+    counter.add(text)
+    return rank_keywords(counter, k, doc_key, corpus)
+
+
+def rank_keywords(
+    counter: CandidateCounter,
+    k: int = 10,
+    doc_key: Optional[str] = None,
+    corpus: Optional["KeywordCorpus"] = None,
+) -> List[str]:
+    """누적된 후보 빈도로 BM25 상위 키워드 k개 선정 (스트리밍 수집은 페이지마다 counter.add 후 호출)"""
+    counts = counter.candidates()
+    if not counts:
+        return []
+    length = counter.length
+
+    corpus = corpus or get_keyword_corpus()
+    if doc_key:
+        corpus.add_document(doc_key, counts.keys(), length)
+
+    terms = list(counts.keys())
+    idf = corpus.idf(terms)
+    length_norm = 1 - BM25_B + BM25_B * (length / corpus.average_length if corpus.average_length else 1.0)
+
+    scores = {}
+    for term, tf in counts.items():
+        saturation = tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+        scores[term] = idf[term] * saturation * (1 + PHRASE_LENGTH_BOOST * term.count(" "))
+
+    # 이미 고른 구에 포함된 후보는 제외, 고른 단어를 포함하는 더 긴 구가 충분히 자주 나오면 교체
+    selected: List[str] = []
+    for term in sorted(terms, key=lambda t: scores[t], reverse=True):
+        if any(_contains(chosen, term) for chosen in selected):
+            continue
+        covered = [chosen for chosen in selected if _contains(term, chosen)]
+        if covered:
+            if all(counts[term] * 2 >= counts[chosen] for chosen in covered):
+                selected = [chosen for chosen in selected if chosen not in covered]
+            else:
+                continue
+        selected.append(term)
+        if len(selected) == k:
+            break
+
+    return [counter.surface(term) for term in selected]
+
+
+_corpus: Optional[KeywordCorpus] = None
+
+
+def get_keyword_corpus() -> KeywordCorpus:
+    global _corpus
+    if _corpus is None:
+        _corpus = KeywordCorpus()
+    return _corpus
@@ -0,0 +1,245 @@
+# LLM 호출 지연 정책 (체인별)
+# - 관측 지연 시간(최근 LATENCY_WINDOW 건)으로 p50 / p95 / p99 계산
+# - 시간 제한: p95 × LLM_TIMEOUT_P95_MULTIPLIER (LLM_TIMEOUT_MIN_SEC ~ LLM_TIMEOUT_MAX_SEC, 표본이 적으면 기본값)
+# - 헤지(hedged request): 짧고 같은 요청을 다시 보내도 되는 체인(채점 / 키워드 등)은
+#   첫 요청이 헤지 지연(기본: 관측 p95)을 넘기면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+# - 재시도: 시간 초과 / 429 / 연결 오류 / 5xx 만, 지수 백오프 + full jitter
+# - 동기 호출은 재시도만 적용 (시간 제한은 ChatOpenAI 요청 timeout 으로 대신함)
+import os
+import math
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import openai
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 백분위 계산에 쓰는 최근 표본 수 / 적응형 시간 제한을 쓰기 시작하는 최소 표본 수
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "500"))
+LATENCY_MIN_SAMPLES = int(os.getenv("LATENCY_MIN_SAMPLES", "20"))
+# 시간 제한 (초)
+LLM_TIMEOUT_DEFAULT_SEC = float(os.getenv("LLM_TIMEOUT_DEFAULT_SEC", "60"))
+LLM_TIMEOUT_MIN_SEC = float(os.getenv("LLM_TIMEOUT_MIN_SEC", "10"))
+LLM_TIMEOUT_MAX_SEC = float(os.getenv("LLM_TIMEOUT_MAX_SEC", "120"))
+LLM_TIMEOUT_P95_MULTIPLIER = float(os.getenv("LLM_TIMEOUT_P95_MULTIPLIER", "3"))
+# 헤지 적용 체인 / 지연 (ms, 0 이면 관측 p95 사용, 표본이 적을 때는 LLM_HEDGE_DEFAULT_DELAY_MS)
+LLM_HEDGE_CHAINS = {
+    chain.strip() for chain in os.getenv("LLM_HEDGE_CHAINS", "grade,keyword").split(",") if chain.strip()
+}
+LLM_HEDGE_DELAY_MS = float(os.getenv("LLM_HEDGE_DELAY_MS", "0"))
+LLM_HEDGE_DEFAULT_DELAY_MS = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_MS", "3000"))
+LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "500"))
+# 재시도 (첫 호출 제외 횟수 / 백오프 기준·상한 ms)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_MS = float(os.getenv("LLM_RETRY_BASE_MS", "500"))
+LLM_RETRY_MAX_MS = float(os.getenv("LLM_RETRY_MAX_MS", "8000"))
+
+T = TypeVar("T")
+
+# 다시 보내면 성공할 수 있는 오류
+_RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """정렬된 표본의 nearest-rank 백분위"""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[min(len(ordered), max(1, rank)) - 1]
+
+
+class LatencyPolicy:
+    """체인 하나의 지연 시간 관측 + 시간 제한 / 헤지 / 재시도"""
+
+    def __init__(self, chain: str, hedge: bool = False):
+        self.chain = chain
+        self.hedge = hedge
+        self.calls = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._samples: deque = deque(maxlen=LATENCY_WINDOW)
+
+    # ---- 관측 ----
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentiles(self) -> Optional[Dict[str, float]]:
+        """{p50, p95, p99} (초), 표본이 없으면 None"""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return {f"p{q}": _percentile(ordered, q) for q in (50, 95, 99)}
+
+    def _p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < LATENCY_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return _percentile(ordered, 95)
+
+    def timeout_sec(self) -> float:
+        p95 = self._p95()
+        if p95 is None:
+            return LLM_TIMEOUT_DEFAULT_SEC
+        return min(LLM_TIMEOUT_MAX_SEC, max(LLM_TIMEOUT_MIN_SEC, p95 * LLM_TIMEOUT_P95_MULTIPLIER))
+
+    def hedge_delay_sec(self) -> float:
+        if LLM_HEDGE_DELAY_MS > 0:
+            return LLM_HEDGE_DELAY_MS / 1000
+        p95 = self._p95()
+        if p95 is None:
+            return LLM_HEDGE_DEFAULT_DELAY_MS / 1000
+        return max(LLM_HEDGE_MIN_DELAY_MS / 1000, p95)
+
+    @staticmethod
+    def backoff_sec(retry: int) -> float:
+        """full jitter: 0 ~ min(상한, 기준 × 2^retry)"""
+        return random.uniform(0, min(LLM_RETRY_MAX_MS, LLM_RETRY_BASE_MS * (2 ** retry))) / 1000
+
+    # ---- 실행 ----
+    async def timed(self, call: Awaitable[T]) -> T:
+        """호출 1건에 시간 제한을 걸고 지연 시간 기록 (시간 초과도 제한 시간으로 기록해 p95 가 낮게 치우치지 않도록)"""
+        timeout = self.timeout_sec()
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.record(timeout)
+            print(f"⚠️ LLM 시간 초과 ({self.chain}, {timeout:.1f}s)")
+            raise
+        self.record(time.perf_counter() - started)
+        return result
+
+    def timed_sync(self, call: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        result = call()
+        self.record(time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, attempt: Callable[[], Awaitable[T]], can_hedge: Callable[[], bool]) -> T:
+        primary = asyncio.ensure_future(attempt())
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay_sec())
+        if done or not can_hedge():
+            return await primary
+
+        self.hedges += 1
+        backup = asyncio.ensure_future(attempt())
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # 늦은 쪽 요청은 취소 (응답은 이미 받았거나 호출한 쪽이 취소됨)
+            for task in (primary, backup):
+                task.cancel()
+
+    async def arun(
+        self,
+        attempt: Callable[[], Awaitable[T]],
+        can_hedge: Callable[[], bool] = lambda: True,
+        on_retry: Optional[Callable[[], None]] = None,
+    ) -> T:
+        """
+        attempt: 호출 1건을 만드는 함수 (재시도 / 헤지마다 새로 호출, 안에서 timed 사용)
+        can_hedge: 헤지 직전 확인 (속도 제한 대기열이 밀려 있으면 중복 요청을 보내지 않음)
+        on_retry: 재시도할 때마다 호출 (호출 단위 사용량 집계용)
+        """
+        self.calls += 1
+        for retry in range(LLM_MAX_RETRIES + 1):
+            try:
+                if self.hedge:
+                    return await self._hedged(attempt, can_hedge)
+                return await attempt()
+            except _RETRYABLE_ERRORS as e:
+                if retry == LLM_MAX_RETRIES:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                if on_retry is not None:
+                    on_retry()
+                delay = self.backoff_sec(retry)
+                print(f"⚠️ LLM 재시도 ({self.chain}, {retry + 1}/{LLM_MAX_RETRIES}, {delay:.2f}s 후): {type(e).__name__}")
+                await asyncio.sleep(delay)
+            except Exception:
+                self.failures += 1
+                raise
+
+    def run(self, attempt: Callable[[], T], on_retry: Optional[Callable[[], None]] = None) -> T:
+        self.calls += 1
+        for retry in range(LLM_MAX_RETRIES + 1):
+            try:
+                return attempt()
+            except _RETRYABLE_ERRORS as e:
+                if retry == LLM_MAX_RETRIES:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                if on_retry is not None:
+                    on_retry()
+                delay = self.backoff_sec(retry)
+                print(f"⚠️ LLM 재시도 ({self.chain}, {retry + 1}/{LLM_MAX_RETRIES}, {delay:.2f}s 후): {type(e).__name__}")
+                time.sleep(delay)
+            except Exception:
+                self.failures += 1
+                raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = len(self._samples)
+        percentiles = self.percentiles() or {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        return {
+            "chain": self.chain,
+            "samples": samples,
+            "p50_ms": round(percentiles["p50"] * 1000, 1),
+            "p95_ms": round(percentiles["p95"] * 1000, 1),
+            "p99_ms": round(percentiles["p99"] * 1000, 1),
+            "timeout_sec": round(self.timeout_sec(), 2),
+            "hedge": self.hedge,
+            "hedge_delay_ms": round(self.hedge_delay_sec() * 1000, 1) if self.hedge else None,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failures": self.failures,
+        }
+
+
+_policies: Dict[str, LatencyPolicy] = {}
+
+
+def get_latency_policy(chain: str) -> LatencyPolicy:
+    """체인별 지연 정책 싱글톤 (헤지 여부는 LLM_HEDGE_CHAINS)"""
+    if chain not in _policies:
+        _policies[chain] = LatencyPolicy(chain, hedge=chain in LLM_HEDGE_CHAINS)
+    return _policies[chain]
+
+
+def latency_stats() -> List[dict]:
+    return [policy.stats() for _, policy in sorted(_policies.items())]
@@ -0,0 +1,466 @@
+# LLM 응답 캐시 (정확히 같은 요청만 재사용)
+# - 키: sha256(모델 | temperature | 렌더링된 프롬프트 메시지 | 출력 스키마)
+# - 저장소: memory (프로세스 내 LRU) | sqlite (디스크, 재시작 후에도 유지) | off
+# - 항목마다 만료 시간(TTL), 체인별 hit / miss 카운터
+# - 재시도된 채점 요청, 같은 문서의 자료 추천, 중복 내용 재요약 등 같은 프롬프트는 API 호출 없이 반환
+# - 캐시에 없는 같은 요청이 동시에 들어오면 한 번만 호출하고 결과를 공유 (single-flight, 스트리밍 제외)
+# - 실제 모델 호출(캐시 miss)은 전역 속도 제한(rate_limiter)의 우선순위 대기열을 거침
+# - 체인별 지연 정책(latency_policy): 적응형 시간 제한 / 헤지 / 재시도 (스트리밍은 지연 시간 기록만)
+# - 호출마다 토큰 / 소요 시간 / 재시도 집계(usage_accounting, 캐시 hit 포함)
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from app.core.enums import BASE_DIR, LLMPriority
+from app.core.single_flight import get_single_flight
+from app.core.rate_limiter import get_rate_limiter, current_priority, LLM_EXPECTED_COMPLETION_TOKENS
+from app.core.latency_policy import get_latency_policy
+from app.core.usage_accounting import track_invocation
+from app.core.tokenizer import count_tokens
+
+load_dotenv()
+
+# memory | sqlite | off
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(BASE_DIR, "vectorstore", "llm_cache.sqlite3"),
+)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+# 기본 만료 시간 (초)
+LLM_CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", "86400"))
+# 챗봇 답변 / 자료 추천 만료 시간 (초, 검색 결과와 대화 맥락이 자주 바뀜)
+LLM_CACHE_CHAT_TTL_SEC = int(os.getenv("LLM_CACHE_CHAT_TTL_SEC", "600"))
+# 진행 중인 동일 요청 병합 여부
+LLM_SINGLE_FLIGHT = os.getenv("LLM_SINGLE_FLIGHT", "true").lower() == "true"
+# 한도 초과 시 한 번에 지우는 비율 (sqlite)
+LLM_CACHE_EVICT_RATIO = 0.1
+
+
+class MemoryCacheBackend:
+    """프로세스 내 LRU (key → (value, 만료 시각))"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, chain: str, value: str, ttl_sec: int):
+        with self._lock:
+            self._items[key] = (value, time.time() + ttl_sec)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def entries(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class SQLiteCacheBackend:
+    """디스크 캐시 (만료 항목은 조회 시 / 한도 초과 정리 시 삭제)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                chain TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used ON llm_responses (last_used);
+            """
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._count -= 1
+            else:
+                self._conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[0] if row[1] > now else None
+
+    def put(self, key: str, chain: str, value: str, ttl_sec: int):
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, chain, value, expires_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, chain, value, now + ttl_sec, now),
+            )
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """만료 항목을 먼저 지우고, 그래도 넘치면 가장 오래 사용되지 않은 항목부터 삭제"""
+        self._count -= self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,)).rowcount
+        overflow = self._count - int(self.max_entries * (1 - LLM_CACHE_EVICT_RATIO))
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            """
+            DELETE FROM llm_responses WHERE rowid IN (
+                SELECT rowid FROM llm_responses ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+        )
+        self.evictions += overflow
+        self._count -= overflow
+
+    def entries(self) -> int:
+        return self._count
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+            self._count = 0
+
+
+class LLMResponseCache:
+    """저장소 + 체인별 hit / miss 카운터"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._counters: dict[str, list[int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, chain: str, hit: bool):
+        with self._lock:
+            counter = self._counters.setdefault(chain, [0, 0])
+            counter[0 if hit else 1] += 1
+
+    def get(self, chain: str, key: str) -> Optional[str]:
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        self._count(chain, value is not None)
+        return value
+
+    def put(self, chain: str, key: str, value: str, ttl_sec: int):
+        if self.backend is not None and ttl_sec > 0:
+            self.backend.put(key, chain, value, ttl_sec)
+
+    async def aget(self, chain: str, key: str) -> Optional[str]:
+        """디스크 저장소는 이벤트 루프 밖(스레드)에서 조회"""
+        if isinstance(self.backend, SQLiteCacheBackend):
+            return await asyncio.to_thread(self.get, chain, key)
+        return self.get(chain, key)
+
+    async def aput(self, chain: str, key: str, value: str, ttl_sec: int):
+        if isinstance(self.backend, SQLiteCacheBackend):
+            await asyncio.to_thread(self.put, chain, key, value, ttl_sec)
+        else:
+            self.put(chain, key, value, ttl_sec)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {chain: list(counter) for chain, counter in self._counters.items()}
+        chains = []
+        for chain, (hits, misses) in sorted(counters.items()):
+            total = hits + misses
+            chains.append({
+                "chain": chain,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+            })
+        hits = sum(item["hits"] for item in chains)
+        total = hits + sum(item["misses"] for item in chains)
+        return {
+            "backend": self.backend.name if self.backend is not None else "off",
+            "entries": self.backend.entries() if self.backend is not None else 0,
+            "max_entries": self.backend.max_entries if self.backend is not None else 0,
+            "evictions": self.backend.evictions if self.backend is not None else 0,
+            "hits": hits,
+            "misses": total - hits,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "chains": chains,
+        }
+
+
+def _to_messages(model_input: Any) -> list[BaseMessage]:
+    if isinstance(model_input, PromptValue):
+        return model_input.to_messages()
+    if isinstance(model_input, str):
+        return [HumanMessage(content=model_input)]
+    return convert_to_messages(model_input)
+
+
+def _usage_tokens(result) -> Optional[int]:
+    """응답의 실제 토큰 사용량 (구조화 출력은 원본 응답이 없어 알 수 없음)"""
+    usage = getattr(result, "usage_metadata", None) if isinstance(result, AIMessage) else None
+    return usage.get("total_tokens") if usage else None
+
+
+def _schema_id(schema: Optional[type[BaseModel]]) -> Optional[dict]:
+    return schema.model_json_schema() if schema is not None else None
+
+
+class CachedModel(Runnable):
+    """
+    채팅 모델(또는 구조화 출력 모델) 앞의 응답 캐시
+    - 입력: 프롬프트 출력(PromptValue) 또는 메시지 목록 / 출력: 감싼 모델과 같음 (AIMessage 또는 스키마 객체)
+    - 스트리밍: 캐시에 있으면 한 번에, 없으면 모델 스트림을 그대로 전달하고 끝까지 받은 응답만 저장
+    - priority: 체인 기본 우선순위 (llm_priority 로 지정된 요청 우선순위가 있으면 그쪽을 따름)
+    """
+
+    def __init__(
+        self,
+        llm,
+        chain: str,
+        schema: Optional[type[BaseModel]] = None,
+        ttl_sec: int = LLM_CACHE_TTL_SEC,
+        cache: Optional[LLMResponseCache] = None,
+        priority: LLMPriority = LLMPriority.BACKGROUND,
+    ):
+        self.llm = llm
+        self.chain = chain
+        self.schema = schema
+        self.ttl_sec = ttl_sec
+        self.priority = priority
+        self.name = chain
+        self._cache = cache
+        self._flight = get_single_flight(f"llm:{chain}")
+        self._latency = get_latency_policy(chain)
+        self._model = llm.with_structured_output(schema) if schema is not None else llm
+        self._model_id = json.dumps({
+            "model": getattr(llm, "model_name", type(llm).__name__),
+            "temperature": getattr(llm, "temperature", None),
+            "schema": _schema_id(schema),
+        }, sort_keys=True, ensure_ascii=False)
+
+    @property
+    def cache(self) -> LLMResponseCache:
+        return self._cache or get_llm_cache()
+
+    def cache_key(self, model_input: Any) -> str:
+        messages = [
+            {"role": message.type, "content": message.content}
+            for message in _to_messages(model_input)
+        ]
+        payload = self._model_id + json.dumps(messages, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _limit_args(self, model_input: Any) -> tuple[LLMPriority, int]:
+        """(우선순위, 추정 토큰 수 = 프롬프트 토큰 + 예상 응답 토큰)"""
+        prompt_tokens = sum(
+            count_tokens(message.content) if isinstance(message.content, str) else 0
+            for message in _to_messages(model_input)
+        )
+        return current_priority(self.priority), prompt_tokens + LLM_EXPECTED_COMPLETION_TOKENS
+
+    def _load(self, value: str):
+        if self.schema is not None:
+            return self.schema.model_validate_json(value)
+        return AIMessage(content=value, response_metadata={"cache_hit": True})
+
+    def _dump(self, result) -> str:
+        if self.schema is not None:
+            return result.model_dump_json()
+        return result.content if isinstance(result.content, str) else json.dumps(result.content, ensure_ascii=False)
+
+    def _shared(self, result):
+        """병합된 결과는 여러 요청이 공유하므로 구조화 출력은 복사해서 반환 (서비스 코드에서 수정함)"""
+        return result.model_copy(deep=True) if self.schema is not None else result
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any):
+        with track_invocation(self.chain) as usage:
+            cache = self.cache
+            key = self.cache_key(input) if cache.enabled or LLM_SINGLE_FLIGHT else None
+            cached = cache.get(self.chain, key) if key and cache.enabled else None
+            if cached is not None:
+                usage.cache_hit = True
+                return self._load(cached)
+
+            limiter = get_rate_limiter("chat")
+
+            def _attempt():
+                with limiter.limit_sync(*self._limit_args(input)) as permit:
+                    result = self._latency.timed_sync(
+                        lambda: self._model.invoke(input, usage.config(config), **kwargs)
+                    )
+                    permit.settle(_usage_tokens(result))
+                    return result
+
+            def _call():
+                result = self._latency.run(_attempt, on_retry=usage.add_retry)
+                if cache.enabled:
+                    cache.put(self.chain, key, self._dump(result), self.ttl_sec)
+                return result
+
+            if not LLM_SINGLE_FLIGHT:
+                return _call()
+            return self._shared(self._flight.run_sync(key, _call))
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any):
+        with track_invocation(self.chain) as usage:
+            cache = self.cache
+            key = self.cache_key(input) if cache.enabled or LLM_SINGLE_FLIGHT else None
+            cached = await cache.aget(self.chain, key) if key and cache.enabled else None
+            if cached is not None:
+                usage.cache_hit = True
+                return self._load(cached)
+
+            limiter = get_rate_limiter("chat")
+
+            async def _attempt():
+                # 시간 제한은 대기열을 통과한 뒤의 모델 호출에만 적용
+                async with limiter.limit(*self._limit_args(input)) as permit:
+                    result = await self._latency.timed(self._model.ainvoke(input, usage.config(config), **kwargs))
+                    permit.settle(_usage_tokens(result))
+                    return result
+
+            async def _call():
+                result = await self._latency.arun(_attempt, limiter.has_capacity, on_retry=usage.add_retry)
+                if cache.enabled:
+                    await cache.aput(self.chain, key, self._dump(result), self.ttl_sec)
+                return result
+
+            # 병합되어 결과만 받은 호출은 토큰 0 으로 기록 (토큰은 실제로 호출한 쪽에 기록)
+            if not LLM_SINGLE_FLIGHT:
+                return await _call()
+            return self._shared(await self._flight.run(key, _call))
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator:
+        if self.schema is not None:
+            yield self.invoke(input, config, **kwargs)
+            return
+        with track_invocation(self.chain) as usage:
+            cache = self.cache
+            key = self.cache_key(input) if cache.enabled else None
+            cached = cache.get(self.chain, key) if key else None
+            if cached is not None:
+                usage.cache_hit = True
+                yield AIMessageChunk(content=cached, response_metadata={"cache_hit": True})
+                return
+            parts = []
+            # 스트림이 끝날 때까지 동시 호출 자리를 차지
+            with get_rate_limiter("chat").limit_sync(*self._limit_args(input)) as permit:
+                total_tokens = None
+                started = time.perf_counter()
+                for chunk in self._model.stream(input, usage.config(config), **kwargs):
+                    parts.append(chunk.content)
+                    if chunk.usage_metadata:
+                        total_tokens = (total_tokens or 0) + chunk.usage_metadata.get("total_tokens", 0)
+                    yield chunk
+                permit.settle(total_tokens)
+                self._latency.record(time.perf_counter() - started)
+            if key:
+                cache.put(self.chain, key, "".join(parts), self.ttl_sec)
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AsyncIterator:
+        if self.schema is not None:
+            yield await self.ainvoke(input, config, **kwargs)
+            return
+        with track_invocation(self.chain) as usage:
+            cache = self.cache
+            key = self.cache_key(input) if cache.enabled else None
+            cached = await cache.aget(self.chain, key) if key else None
+            if cached is not None:
+                usage.cache_hit = True
+                yield AIMessageChunk(content=cached, response_metadata={"cache_hit": True})
+                return
+            parts = []
+            async with get_rate_limiter("chat").limit(*self._limit_args(input)) as permit:
+                total_tokens = None
+                started = time.perf_counter()
+                async for chunk in self._model.astream(input, usage.config(config), **kwargs):
+                    parts.append(chunk.content)
+                    if chunk.usage_metadata:
+                        total_tokens = (total_tokens or 0) + chunk.usage_metadata.get("total_tokens", 0)
+                    yield chunk
+                permit.settle(total_tokens)
+                self._latency.record(time.perf_counter() - started)
+            if key:
+                await cache.aput(self.chain, key, "".join(parts), self.ttl_sec)
+
+def cached_llm(
+    llm,
+    chain: str,
+    schema: Optional[type[BaseModel]] = None,
+    ttl_sec: int = LLM_CACHE_TTL_SEC,
+    priority: LLMPriority = LLMPriority.BACKGROUND,
+) -> CachedModel:
+    """체인 이름(카운터 / 로그용)과 기본 우선순위를 붙여 모델을 응답 캐시 / 속도 제한으로 감쌈"""
+    return CachedModel(llm, chain, schema, ttl_sec, priority=priority)
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _cache
+    if _cache is None:
+        if LLM_CACHE_BACKEND == "sqlite":
+            backend = SQLiteCacheBackend()
+        elif LLM_CACHE_BACKEND == "memory":
+            backend = MemoryCacheBackend()
+        else:
+            backend = None
+        _cache = LLMResponseCache(backend)
+    return _cache
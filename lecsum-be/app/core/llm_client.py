@@ -1,35 +1,40 @@
 import os
+import asyncio
+from typing import AsyncIterator
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI
 from langchain_core.runnables import Runnable, RunnablePassthrough, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.language_models.chat_models import BaseChatModel
 from app.core.prompt_templates.quiz_prompt import *
 from app.db.quiz_schemas import *
 
-from app.core.prompt_templates.summary_prompt import get_summary_prompt
+from app.core.model_backend import get_chat_model
+from app.core.llm_cache import cached_llm, LLM_CACHE_CHAT_TTL_SEC
+from app.core.enums import LLMPriority
+from app.db.mentor_schemas import RecommendResponse
+from app.core.prompt_templates.summary_prompt import get_summary_prompt, get_map_summary_prompt
+from app.core.tokenizer import count_tokens, truncate_to_tokens, split_by_tokens
 from app.core.prompt_templates.keyword_prompt import get_keyword_prompt
 from app.core.prompt_templates.quiz_prompt import (get_quiz_prompt, get_grading_prompt)
 from app.core.prompt_templates.retry_quiz_prompt import get_retry_quiz_prompt
 from app.db.quiz_schemas import QuizResponse, GradeResultList
-from langchain_core.output_parsers import JsonOutputParser
 
 # 환경변수 로드
 load_dotenv()
 
-# API 키 검증
-if not os.getenv("OPENAI_API_KEY"):
-    raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+# 공통 LLM 인스턴스 (LLM_BACKEND 에 따라 OpenAI 또는 로컬 fake 모델)
+chatOpenAI = get_chat_model(temperature=0)
 
-# 공통 LLM 인스턴스
-chatOpenAI = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0,
+# 챗봇 / 자료 추천 (체인 없이 메시지 목록으로 직접 호출, 응답 캐시 적용)
+# 체인별 기본 우선순위: 챗봇 / 자료 추천 > 퀴즈 생성 / 채점 > 요약 / 키워드(수집)
+chatbot_llm = cached_llm(
+    get_chat_model(temperature=0.7), "chatbot",
+    ttl_sec=LLM_CACHE_CHAT_TTL_SEC, priority=LLMPriority.CHAT,
 )
-
-chatbot_llm = ChatOpenAI(
-    temperature=0.7,
-    model="gpt-4o-mini",
+recommend_llm = cached_llm(
+    chatOpenAI, "recommend", RecommendResponse,
+    ttl_sec=LLM_CACHE_CHAT_TTL_SEC, priority=LLMPriority.CHAT,
 )
 
 # -----------------------------
@@ -53,13 +58,191 @@ summary_chain: Runnable = (
     RunnableLambda(route_summary_prompt)
     | RunnablePassthrough.assign(context=lambda x: x["context"])
     | (lambda x: x["prompt"])
-    | chatOpenAI
+    | cached_llm(chatOpenAI, "summary")
     | StrOutputParser()
 )
 
+# -----------------------------
+# 긴 문서 계층적(Map-Reduce) 요약
+# -----------------------------
+# 입력 토큰이 이 값을 넘으면 Map-Reduce 요약으로 전환 (단일 호출 입력 상한이기도 함)
+SUMMARY_MAX_INPUT_TOKENS = int(os.getenv("SUMMARY_MAX_INPUT_TOKENS", "12000"))
+# Map 단계 한 호출에 묶는 페이지/청크 그룹 토큰 수
+SUMMARY_MAP_GROUP_TOKENS = int(os.getenv("SUMMARY_MAP_GROUP_TOKENS", "6000"))
+# Map 단계 동시 호출 수
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+# 중간 요약이 여전히 길 때 반복할 최대 Map 단계 수
+SUMMARY_MAX_MAP_ROUNDS = 3
+
+map_summary_chain: Runnable = (
+    get_map_summary_prompt()
+    | cached_llm(chatOpenAI, "map_summary")
+    | StrOutputParser()
+)
+
+def group_texts_by_tokens(texts: list[str], max_tokens: int) -> list[str]:
+    """
+    페이지(또는 청크) 순서를 유지하며 max_tokens 이하 그룹으로 묶는다.
+    한 페이지가 max_tokens 보다 크면 토큰 단위로 잘라서 넣는다.
+    """
+    groups: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        if not text or not text.strip():
+            continue
+        tokens = count_tokens(text)
+        pieces = [text] if tokens <= max_tokens else split_by_tokens(text, max_tokens)
+
+        for piece in pieces:
+            piece_tokens = tokens if len(pieces) == 1 else count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                groups.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        groups.append("\n".join(current))
+    return groups
+
+async def _map_summaries(texts: list[str]) -> list[str]:
+    """그룹별 중간 요약을 동시 호출 수 제한 하에 병렬 생성"""
+    semaphore = asyncio.Semaphore(SUMMARY_MAP_CONCURRENCY)
+    groups = group_texts_by_tokens(texts, SUMMARY_MAP_GROUP_TOKENS)
+
+    async def _summarize_group(group: str) -> str:
+        async with semaphore:
+            return await map_summary_chain.ainvoke({"context": group})
+
+    return await asyncio.gather(*(_summarize_group(group) for group in groups))
+
+async def _prepare_summary_context(texts: list[str]) -> str:
+    """
+    최종 요약 입력 준비
+    - 전체 토큰이 SUMMARY_MAX_INPUT_TOKENS 이하: 원문 그대로
+    - 초과: 페이지 그룹별 중간 요약(Map, 병렬)을 반복해 상한 이하로 축약
+    """
+    full_text = "\n".join(texts)
+
+    if count_tokens(full_text) > SUMMARY_MAX_INPUT_TOKENS:
+        partials = texts
+        for _ in range(SUMMARY_MAX_MAP_ROUNDS):
+            partials = await _map_summaries(partials)
+            full_text = "\n\n".join(partials)
+            if count_tokens(full_text) <= SUMMARY_MAX_INPUT_TOKENS:
+                break
+        # 반복 후에도 길면 안전하게 잘라서 전달
+        full_text = truncate_to_tokens(full_text, SUMMARY_MAX_INPUT_TOKENS)
+
+    return full_text
+
+class StreamingSummaryContext:
+    """
+    스트리밍 수집용 요약 입력 누적기 (원문 전체를 메모리에 두지 않음)
+    - 페이지를 SUMMARY_MAP_GROUP_TOKENS 그룹으로 모으다가 그룹이 차면 바로 중간 요약(Map) 시작
+    - 진행 중인 Map 이 SUMMARY_MAP_CONCURRENCY 개면 가장 오래된 것을 기다림 (대기 그룹이 쌓이지 않도록)
+    - 중간 요약 합이 SUMMARY_MAX_INPUT_TOKENS 를 넘으면 중간 요약끼리 다시 Map 으로 축약
+    slot: 있으면 Map 호출마다 이 세마포어 안에서 실행 (수집 전체의 LLM 동시 호출 한도 공유)
+    """
+
+    def __init__(self, slot: asyncio.Semaphore | None = None):
+        self._slot = slot
+        self._buffer: list[str] = []
+        self._buffer_tokens = 0
+        self._pending: list[asyncio.Task] = []
+        self._partials: list[str] = []
+        self._mapped = False
+
+    async def _map(self, group: str) -> str:
+        if self._slot is None:
+            return await map_summary_chain.ainvoke({"context": group})
+        async with self._slot:
+            return await map_summary_chain.ainvoke({"context": group})
+
+    async def add(self, text: str):
+        if not text or not text.strip():
+            return
+        tokens = count_tokens(text)
+        pieces = [text] if tokens <= SUMMARY_MAP_GROUP_TOKENS else split_by_tokens(text, SUMMARY_MAP_GROUP_TOKENS)
+        for piece in pieces:
+            piece_tokens = tokens if len(pieces) == 1 else count_tokens(piece)
+            if self._buffer and self._buffer_tokens + piece_tokens > SUMMARY_MAP_GROUP_TOKENS:
+                await self._flush()
+            self._buffer.append(piece)
+            self._buffer_tokens += piece_tokens
+
+    async def _flush(self):
+        group = "\n".join(self._buffer)
+        self._buffer, self._buffer_tokens = [], 0
+        self._mapped = True
+        self._pending.append(asyncio.create_task(self._map(group)))
+        while len(self._pending) >= SUMMARY_MAP_CONCURRENCY:
+            self._partials.append(await self._pending.pop(0))
+        await self._compact()
+
+    async def _compact(self):
+        """중간 요약 합이 상한을 넘으면 중간 요약끼리 다시 Map"""
+        if count_tokens("\n\n".join(self._partials)) <= SUMMARY_MAX_INPUT_TOKENS:
+            return
+        groups = group_texts_by_tokens(self._partials, SUMMARY_MAP_GROUP_TOKENS)
+        self._partials = list(await asyncio.gather(*(self._map(group) for group in groups)))
+
+    async def context(self) -> str:
+        """최종 요약(summary_chain) 입력 (SUMMARY_MAX_INPUT_TOKENS 이하)"""
+        if not self._mapped and self._buffer_tokens <= SUMMARY_MAX_INPUT_TOKENS:
+            return "\n".join(self._buffer)
+
+        if self._buffer:
+            group = "\n".join(self._buffer)
+            self._buffer, self._buffer_tokens = [], 0
+            self._pending.append(asyncio.create_task(self._map(group)))
+        pending, self._pending = self._pending, []
+        self._partials.extend(await asyncio.gather(*pending))
+
+        for _ in range(SUMMARY_MAX_MAP_ROUNDS):
+            full_text = "\n\n".join(self._partials)
+            if count_tokens(full_text) <= SUMMARY_MAX_INPUT_TOKENS:
+                return full_text
+            await self._compact()
+        return truncate_to_tokens("\n\n".join(self._partials), SUMMARY_MAX_INPUT_TOKENS)
+
+    def cancel(self):
+        """수집 실패 시 진행 중인 Map 호출 취소"""
+        for task in self._pending:
+            task.cancel()
+        self._pending = []
+
+async def summarize_document(texts: list[str], summary_type: str) -> str:
+    """
+    문서 요약 진입점
+    - 전체 토큰이 SUMMARY_MAX_INPUT_TOKENS 이하: summary_chain 단일 호출
+    - 초과: 페이지 그룹별 중간 요약(Map, 병렬) → 최종 스타일 요약(Reduce)
+    어떤 호출도 SUMMARY_MAX_INPUT_TOKENS 를 넘는 입력을 받지 않는다.
+    """
+    full_text = await _prepare_summary_context(texts)
+    return await summary_chain.ainvoke({
+        "context": full_text,
+        "summary_type": summary_type
+    })
+
+async def astream_summary(texts: list[str], summary_type: str) -> AsyncIterator[str]:
+    """
+    summarize_document 의 스트리밍 버전
+    최종 요약(summary_chain) 토큰을 생성되는 대로 반환한다. (긴 문서는 Map 단계가 끝난 뒤 시작)
+    """
+    full_text = await _prepare_summary_context(texts)
+    async for delta in summary_chain.astream({
+        "context": full_text,
+        "summary_type": summary_type
+    }):
+        if delta:
+            yield delta
+
 keyword_chain: Runnable = (
     get_keyword_prompt()
-    | chatOpenAI
+    | cached_llm(chatOpenAI, "keyword")
     | StrOutputParser()
 )
 
@@ -67,18 +250,21 @@ keyword_chain: Runnable = (
 # 구조화 출력 체인
 # -----------------------------
 def build_structured_chain(
-    llm: ChatOpenAI,
+    llm: BaseChatModel,
     prompt,
     output_schema,
+    name: str,
+    priority: LLMPriority = LLMPriority.BACKGROUND,
 ) -> Runnable:
     """
     Structured Output(JSON Schema) 기반 체인 생성
+    (name: 응답 캐시 카운터용 체인 이름, priority: 전역 속도 제한 기본 우선순위)
     """
-    structured_llm = llm.with_structured_output(output_schema)
+    structured_llm = cached_llm(llm, name, output_schema, priority=priority)
     return prompt | structured_llm
 
-def build_llm_chain(llm, prompt) -> Runnable:
-    chain = prompt | llm | StrOutputParser()
+def build_llm_chain(llm, prompt, name: str, priority: LLMPriority = LLMPriority.BACKGROUND) -> Runnable:
+    chain = prompt | cached_llm(llm, name, priority=priority) | StrOutputParser()
     return chain
 
 
@@ -86,15 +272,21 @@ quiz_chain: Runnable = build_structured_chain(
     chatOpenAI,
     get_quiz_prompt(),
     QuizGenerationOutput,
+    "quiz",
+    LLMPriority.GRADING,
 )
 critic_chain: Runnable = build_llm_chain(
     chatOpenAI,
-    get_critic_prompt()
+    get_critic_prompt(),
+    "critic",
+    LLMPriority.GRADING,
 )
 refiner_chain: Runnable = build_structured_chain(
     chatOpenAI,
-    get_refiner_prompt(), 
-    QuizGenerationOutput
+    get_refiner_prompt(),
+    QuizGenerationOutput,
+    "refiner",
+    LLMPriority.GRADING,
 )
 
 def route_quiz_generation(info):
@@ -141,10 +333,14 @@ grade_chain: Runnable = build_structured_chain(
     chatOpenAI,
     get_grading_prompt(),
     GradeResultList,
+    "grade",
+    LLMPriority.GRADING,
 )
 enrich_chain: Runnable = build_llm_chain(
-    ChatOpenAI(model="gpt-4o-mini", temperature=0.7),
-    get_enrichment_prompt()
+    get_chat_model(temperature=0.7),
+    get_enrichment_prompt(),
+    "enrich",
+    LLMPriority.GRADING,
 )
 
 # 오답 재시험 체인
@@ -152,15 +348,6 @@ retry_quiz_chain: Runnable = build_structured_chain(
     chatOpenAI,
     get_retry_quiz_prompt(),
     QuizResponse, # 퀴즈 생성과 동일한 방식으로 재시험 생성
-)
-
-top_sentence_chain: Runnable = (
-    ChatPromptTemplate.from_template("""
-    다음 문서에서 가장 중요한 문장 {k}개를 추출하라.
-    JSON 배열로 반환하라.
-
-    {context}
-    """)
-    | chatOpenAI
-    | JsonOutputParser()
+    "retry_quiz",
+    LLMPriority.GRADING,
 )
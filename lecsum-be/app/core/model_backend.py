@@ -0,0 +1,397 @@
+# LLM / 임베딩 모델 백엔드
+# - openai (기본): ChatOpenAI / OpenAIEmbeddings
+# - fake: 네트워크 없이 입력만으로 응답을 만드는 로컬 모델 (부하 테스트 / 벤치마크 / 오프라인 개발용)
+#   · 같은 입력이면 항상 같은 출력과 같은 지연 시간 (입력 해시로 난수 시드)
+#   · 구조화 출력은 요청한 Pydantic 스키마를 만족하는 객체를 생성
+#     (퀴즈 생성 / 채점 / 자료 추천은 서비스 코드의 검증을 통과하도록 전용 생성기 사용)
+#   · 지연 시간 주입: 호출당 기본 지연 + 출력 토큰당 지연 ± 지터
+#
+# OPENAI_API_KEY 가 없어도 import 시점에는 실패하지 않음 (openai 백엔드는 실제 호출 시 인증 오류)
+import os
+import re
+import time
+import types
+import random
+import asyncio
+import hashlib
+import typing
+from collections import Counter
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from app.core.enums import ModelBackend
+from app.core.latency_policy import LLM_TIMEOUT_MAX_SEC
+from app.core.tokenizer import count_tokens
+from app.db.quiz_schemas import QuizItem, QuizGenerationOutput, QuizResponse, SingleGradeResult, GradeResultList
+from app.db.mentor_schemas import RecommendItem, RecommendResponse
+
+load_dotenv()
+
+LLM_BACKEND = ModelBackend(os.getenv("LLM_BACKEND", ModelBackend.OPENAI.value))
+DEFAULT_CHAT_MODEL = "gpt-4o-mini"
+
+# fake 채팅 모델 지연 시간 (ms)
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+FAKE_LLM_MS_PER_TOKEN = float(os.getenv("FAKE_LLM_MS_PER_TOKEN", "0"))
+FAKE_LLM_JITTER_MS = float(os.getenv("FAKE_LLM_JITTER_MS", "0"))
+# fake 임베딩 모델 지연 시간 (호출당 ms + 텍스트당 ms) / 차원
+FAKE_EMBEDDING_LATENCY_MS = float(os.getenv("FAKE_EMBEDDING_LATENCY_MS", "0"))
+FAKE_EMBEDDING_MS_PER_TEXT = float(os.getenv("FAKE_EMBEDDING_MS_PER_TEXT", "0"))
+FAKE_EMBEDDING_DIM = int(os.getenv("FAKE_EMBEDDING_DIM", "1536"))
+# 구조화 출력 목록 길이 (퀴즈 / 추천 자료 수)
+FAKE_LIST_ITEMS = int(os.getenv("FAKE_LIST_ITEMS", "5"))
+
+_WORD = re.compile(r"[0-9A-Za-z가-힣][0-9A-Za-z가-힣+#]+")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+_QUESTION_BLOCK = re.compile(r"\[문제 (\d+)\](.*?)(?=\[문제 \d+\]|\Z)", re.DOTALL)
+_TOPIC_STOPWORDS = {"다음", "문제", "내용", "텍스트", "후보", "강의", "설명", "있다", "한다", "그리고", "the", "and"}
+_QUIZ_TYPES = list(typing.get_args(QuizItem.model_fields["type"].annotation))
+_RESOURCE_TYPES = ["Documentation", "Tutorial", "GitHub", "Video"]
+
+_warned_missing_key = False
+
+
+def _openai_api_key() -> str:
+    """OPENAI_API_KEY (없으면 경고 후 자리표시 값 → 실제 호출 시 인증 오류)"""
+    global _warned_missing_key
+    key = os.getenv("OPENAI_API_KEY")
+    if key:
+        return key
+    if not _warned_missing_key:
+        print("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. LLM / 임베딩 호출이 실패합니다. (오프라인 실행은 LLM_BACKEND=fake)")
+        _warned_missing_key = True
+    return "OPENAI_API_KEY-not-set"
+
+
+# -----------------------------
+# 입력 → 결정적 응답 재료
+# -----------------------------
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "\n".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+
+def _last_human_text(messages: List[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if message.type == "human":
+            return _message_text(message)
+    return _message_text(messages[-1]) if messages else ""
+
+
+def _rng(*parts: str) -> random.Random:
+    digest = hashlib.sha256("\x00".join(parts).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "little"))
+
+
+def _topics(text: str, n: int) -> List[str]:
+    """입력에서 자주 나오는 단어 n개 (부족하면 기본 단어로 채움)"""
+    counts = Counter(word for word in _WORD.findall(text) if word.lower() not in _TOPIC_STOPWORDS)
+    topics = [word for word, _ in counts.most_common(n)]
+    fillers = ["핵심 개념", "기본 원리", "응용 사례", "주요 용어", "정리"]
+    return topics + fillers[:max(0, n - len(topics))]
+
+
+def _sentence_with(text: str, word: str) -> str:
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = " ".join(sentence.split())
+        if word in sentence and len(sentence) > len(word) + 5:
+            return sentence[:160]
+    return f"{word}의 정의와 특징을 정리한다."
+
+
+def _fake_text(messages: List[BaseMessage]) -> str:
+    """자유 텍스트 응답 (요약 / 키워드 / 비평 / 챗봇 답변)"""
+    last = _last_human_text(messages)
+    full = "\n".join(_message_text(message) for message in messages)
+
+    # 키워드 보정: 후보 목록을 그대로 상위 10개 반환
+    if "후보:" in last:
+        candidates = last.rsplit("후보:", 1)[1].strip().splitlines()[0]
+        return ", ".join([c.strip() for c in candidates.split(",") if c.strip()][:10])
+    # 퀴즈 비평: 수정 없이 통과
+    if "수정 사항 없음" in full:
+        return "수정 사항 없음"
+
+    topics = _topics(last, 4)
+    lines = [f"## {topics[0]} 정리"]
+    for topic in topics:
+        lines.append(f"### {topic}")
+        lines.append(f"- {_sentence_with(last, topic)}")
+    return "\n".join(lines)
+
+
+# -----------------------------
+# 구조화 출력 생성기
+# -----------------------------
+def _fake_quizzes(text: str, rng: random.Random) -> List[QuizItem]:
+    topics = _topics(text, max(4, FAKE_LIST_ITEMS))
+    quizzes = []
+    for idx in range(FAKE_LIST_ITEMS):
+        topic = topics[idx % len(topics)]
+        quiz_type = _QUIZ_TYPES[idx % len(_QUIZ_TYPES)]
+        sentence = _sentence_with(text, topic)
+        if quiz_type == "multiple_choice":
+            options = [topic] + [t for t in topics if t != topic][:3]
+            rng.shuffle(options)
+            quizzes.append(QuizItem(
+                question=f"다음 설명에 해당하는 개념은? \"{sentence.replace(topic, '○○')}\"",
+                type=quiz_type, options=options, correct_answer=topic, explanation=sentence,
+            ))
+        elif quiz_type == "true_false":
+            quizzes.append(QuizItem(
+                question=f"{sentence} (O/X)", type=quiz_type, options=["O", "X"],
+                correct_answer="O", explanation=sentence,
+            ))
+        elif quiz_type == "fill_in_blank":
+            quizzes.append(QuizItem(
+                question=sentence.replace(topic, "_____", 1) if topic in sentence else "_____ 의 정의를 쓰시오.",
+                type=quiz_type, correct_answer=topic, explanation=sentence,
+            ))
+        else:
+            quizzes.append(QuizItem(
+                question=f"{topic}에 대해 설명하는 용어를 쓰시오.",
+                type=quiz_type, correct_answer=topic, explanation=sentence,
+            ))
+    return quizzes
+
+
+def _normalize_answer(answer: str) -> str:
+    return re.sub(r"\s+", "", answer).lower()
+
+
+def _fake_grades(text: str) -> GradeResultList:
+    """[문제 N] 블록마다 실제 정답 / 사용자 답을 비교해 채점 (문제 수와 결과 수가 항상 같음)"""
+    results = []
+    for _, block in _QUESTION_BLOCK.findall(text):
+        answer = re.search(r"- 실제 정답:(.*)", block)
+        user_answer = re.search(r"- 사용자 답:(.*)", block)
+        expected = _normalize_answer(answer.group(1)) if answer else ""
+        given = _normalize_answer(user_answer.group(1)) if user_answer else ""
+        correct = bool(expected) and (given == expected or expected in given)
+        results.append(SingleGradeResult(
+            is_correct=correct,
+            feedback="정답입니다! 핵심을 정확히 짚었어요." if correct else "틀렸습니다.",
+        ))
+    return GradeResultList(results=results)
+
+
+def _fake_recommendations(text: str) -> RecommendResponse:
+    topics = _topics(text, FAKE_LIST_ITEMS)
+    items = []
+    for idx, topic in enumerate(topics[:FAKE_LIST_ITEMS]):
+        slug = hashlib.sha1(topic.encode("utf-8")).hexdigest()[:10]
+        items.append(RecommendItem(
+            title=f"{topic} 학습 자료",
+            description=f"{topic}의 개념과 예제를 다루는 자료",
+            url=f"https://example.com/resources/{slug}",
+            type=_RESOURCE_TYPES[idx % len(_RESOURCE_TYPES)],
+        ))
+    return RecommendResponse(recommendations=items, summary=f"{', '.join(topics[:3])} 중심으로 복습할 수 있는 자료입니다.")
+
+
+def _fake_value(annotation: Any, text: str, rng: random.Random) -> Any:
+    """스키마 필드 타입별 기본값 (전용 생성기가 없는 스키마용)"""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Literal:
+        return args[0]
+    if origin in (typing.Union, types.UnionType):
+        return _fake_value(next(arg for arg in args if arg is not type(None)), text, rng)
+    if origin in (list, List):
+        return [_fake_value(args[0] if args else str, text, rng) for _ in range(FAKE_LIST_ITEMS)]
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _fake_model(annotation, text, rng)
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randint(1, 5)
+    if annotation is float:
+        return round(rng.random(), 3)
+    return rng.choice(_topics(text, 5))
+
+
+def _fake_model(schema: type[BaseModel], text: str, rng: random.Random) -> BaseModel:
+    return schema(**{
+        name: _fake_value(field.annotation, text, rng)
+        for name, field in schema.model_fields.items()
+        if field.is_required()
+    })
+
+
+def fake_structured_output(schema: type[BaseModel], text: str) -> BaseModel:
+    """스키마를 만족하는 결정적 구조화 출력"""
+    rng = _rng(schema.__name__, text)
+    if schema is QuizGenerationOutput:
+        return QuizGenerationOutput(quizzes=_fake_quizzes(text, rng))
+    if schema is QuizResponse:
+        return QuizResponse(quiz_set_id=0, quizzes=_fake_quizzes(text, rng))
+    if schema is GradeResultList:
+        return _fake_grades(text)
+    if schema is RecommendResponse:
+        return _fake_recommendations(text)
+    return _fake_model(schema, text, rng)
+
+
+# -----------------------------
+# fake 모델
+# -----------------------------
+def _latency_sec(rng: random.Random, output_tokens: int) -> float:
+    jitter = rng.uniform(-FAKE_LLM_JITTER_MS, FAKE_LLM_JITTER_MS) if FAKE_LLM_JITTER_MS else 0.0
+    return max(0.0, FAKE_LLM_LATENCY_MS + FAKE_LLM_MS_PER_TOKEN * output_tokens + jitter) / 1000
+
+
+def _usage(messages: List[BaseMessage], output: str) -> dict:
+    input_tokens = sum(count_tokens(_message_text(message)) for message in messages)
+    output_tokens = count_tokens(output)
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+class FakeChatModel(BaseChatModel):
+    """입력만으로 결정적인 응답을 만드는 채팅 모델 (LLM_BACKEND=fake)"""
+
+    model_name: str = "fake-chat"
+    temperature: float = 0.0
+    # with_structured_output 으로 만든 복사본만 설정 (응답을 스키마 JSON 으로 생성)
+    structured_schema: Optional[Any] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def _respond(self, messages: List[BaseMessage]) -> tuple[AIMessage, float]:
+        if self.structured_schema is not None:
+            text = fake_structured_output(self.structured_schema, _last_human_text(messages)).model_dump_json()
+        else:
+            text = _fake_text(messages)
+        usage = _usage(messages, text)
+        delay = _latency_sec(_rng(self.model_name, text), usage["output_tokens"])
+        return AIMessage(content=text, usage_metadata=usage), delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message, delay = self._respond(messages)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message, delay = self._respond(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _pieces(self, messages: List[BaseMessage]) -> tuple[list[str], float, float, dict]:
+        message, delay = self._respond(messages)
+        pieces = re.findall(r"\S+\s*|\s+", message.content)
+        per_piece = FAKE_LLM_MS_PER_TOKEN / 1000 * message.usage_metadata["output_tokens"] / max(1, len(pieces))
+        return pieces, max(0.0, delay - per_piece * len(pieces)), per_piece, message.usage_metadata
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        pieces, first_delay, per_piece, usage = self._pieces(messages)
+        time.sleep(first_delay)
+        for idx, piece in enumerate(pieces):
+            time.sleep(per_piece)
+            chunk = AIMessageChunk(content=piece, usage_metadata=usage if idx == len(pieces) - 1 else None)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        pieces, first_delay, per_piece, usage = self._pieces(messages)
+        await asyncio.sleep(first_delay)
+        for idx, piece in enumerate(pieces):
+            await asyncio.sleep(per_piece)
+            chunk = AIMessageChunk(content=piece, usage_metadata=usage if idx == len(pieces) - 1 else None)
+            yield ChatGenerationChunk(message=chunk)
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs) -> Runnable:
+        """ChatOpenAI.with_structured_output 과 같은 형태 (스키마 객체 반환)
+        모델 호출을 거치므로 콜백(on_llm_end 토큰 사용량 등)도 실제 모델과 같이 발생
+        """
+        model = self.model_copy(update={"structured_schema": schema})
+
+        def _parse(message: AIMessage):
+            parsed = schema.model_validate_json(message.content)
+            if include_raw:
+                return {"raw": message, "parsed": parsed, "parsing_error": None}
+            return parsed
+
+        return model | RunnableLambda(_parse, name=f"{self.model_name}:{schema.__name__}")
+
+
+class FakeEmbeddings(Embeddings):
+    """단어 해시 bag-of-words 임베딩 (같은 단어를 공유하는 텍스트끼리 유사도가 높음, L2 정규화)"""
+
+    def __init__(self, dim: int = FAKE_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _vector(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in _WORD.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dim] += 1.0 if value & (1 << 63) else -1.0
+        norm = float(np.linalg.norm(vector))
+        if norm == 0:
+            vector[0], norm = 1.0, 1.0
+        return (vector / norm).tolist()
+
+    def _delay(self, texts: List[str]) -> float:
+        return (FAKE_EMBEDDING_LATENCY_MS + FAKE_EMBEDDING_MS_PER_TEXT * len(texts)) / 1000
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self._delay(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self._delay(texts))
+        return await asyncio.to_thread(lambda: [self._vector(text) for text in texts])
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+# -----------------------------
+# 백엔드별 모델 생성
+# -----------------------------
+def get_chat_model(temperature: float = 0, model: str = DEFAULT_CHAT_MODEL) -> BaseChatModel:
+    if LLM_BACKEND == ModelBackend.FAKE:
+        return FakeChatModel(model_name=f"fake:{model}", temperature=temperature)
+    # 재시도는 지연 정책(latency_policy)에서 지터를 넣어 처리하므로 클라이언트 자체 재시도는 끔
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=_openai_api_key(),
+        timeout=LLM_TIMEOUT_MAX_SEC,
+        max_retries=0,
+        # 스트리밍 응답에도 토큰 사용량을 포함 (속도 제한 정산 / 사용량 집계)
+        stream_usage=True,
+    )
+
+
+def get_embedding_model(model: str) -> Embeddings:
+    if LLM_BACKEND == ModelBackend.FAKE:
+        return FakeEmbeddings()
+    return OpenAIEmbeddings(model=model, api_key=_openai_api_key())
+
+
+def embedding_cache_model(model: str) -> str:
+    """임베딩 캐시 키에 쓰는 모델 이름 (fake 벡터가 실제 모델 캐시와 섞이지 않도록 구분)"""
+    if LLM_BACKEND == ModelBackend.FAKE:
+        return f"fake-{FAKE_EMBEDDING_DIM}:{model}"
+    return model
@@ -9,18 +9,21 @@ def get_keyword_prompt() -> ChatPromptTemplate:
     자연어 처리(NLP)는 인간의 언어를 컴퓨터가 이해하고 처리하도록 하는 AI 분야이다.
     주요 기술로는 형태소 분석, 구문 분석, 의미 분석 등이 있으며 최근 Transformer 모델이 성능을 크게 향상시켰다.
     """
+    ex1_candidates = "자연어 처리, NLP, 인간, 언어, 컴퓨터, AI 분야, 형태소 분석, 구문 분석, 의미 분석, Transformer 모델, 성능"
     ex1_output = "자연어 처리, NLP, 형태소 분석, 구문 분석, 의미 분석, Transformer"
 
     ex2_context = """
     객체 지향 프로그래밍(OOP)은 객체 간 상호작용으로 프로그램을 구성하는 패러다임이다.
     핵심 개념은 캡슐화, 상속, 다형성, 추상화이며 클래스와 인스턴스를 기반으로 구조를 설계한다.
     """
+    ex2_candidates = "객체 지향 프로그래밍, OOP, 객체, 상호작용, 프로그램, 패러다임, 핵심, 개념, 캡슐화, 상속, 다형성, 추상화, 클래스, 인스턴스, 구조"
     ex2_output = "객체 지향 프로그래밍, OOP, 캡슐화, 상속, 다형성, 추상화, 클래스, 인스턴스"
 
     ex3_context = """
     머신러닝은 데이터로부터 패턴을 학습하여 예측 모델을 만드는 기술이다.
     대표 알고리즘으로는 회귀 분석, SVM, 결정 트리, 앙상블 학습 등이 있다.
     """
+    ex3_candidates = "머신러닝, 데이터, 패턴, 예측 모델, 기술, 대표 알고리즘, 회귀 분석, SVM, 결정 트리, 앙상블 학습"
     ex3_output = "머신러닝, 회귀 분석, SVM, 결정 트리, 앙상블 학습"
 
     # -------------------------------
@@ -49,6 +52,7 @@ def get_keyword_prompt() -> ChatPromptTemplate:
     이미지 생성 등 다양한 응용 분야를 갖는다.
     CNN 구조는 합성곱 연산을 기반으로 하며 최근에는 Vision Transformer(ViT)가 대체 기술로 부상하고 있다.
     """
+    ex6_candidates = "딥러닝 기반 컴퓨터, 컴퓨터 비전, 기술, 이미지 분류, 객체 탐지, 시맨틱 세그멘테이션, 이미지 생성, 응용 분야, CNN 구조, 합성곱 연산, Vision Transformer, ViT, 대체 기술"
     ex6_output = "컴퓨터 비전, 이미지 분류, 객체 탐지, 시맨틱 세그멘테이션, 이미지 생성, CNN, Vision Transformer, ViT"
 
     # -------------------------------
@@ -74,11 +78,16 @@ def get_keyword_prompt() -> ChatPromptTemplate:
             - 동일 개념은 단일 키워드로 통합
             - 불필요한 일반 단어 제거 (예: 과정, 방식, 사용, 예시, 설명)
 
-            4. **중복 제거 + 의미 단위 유지**
+            4. **후보 키워드 활용**
+            - [후보]는 문서 전체 통계로 미리 뽑은 키워드 후보(중요도 순)다.
+            - 후보 중에서 핵심 개념을 골라 순서를 정하고, 표기를 정규화한다.
+            - 후보에 없는 핵심 개념은 [텍스트]에 명확히 나올 때만 추가한다.
+
+            5. **중복 제거 + 의미 단위 유지**
             - 복합 개념은 유지하되, 불필요한 수식어 제거
             - 예: “Transformer 기반 딥러닝 모델” → “Transformer”
 
-            5. **출력 형식**
+            6. **출력 형식**
             - 쉼표(,)로 구분한 한 줄
             - 설명, 불릿, 문장 금지
             - JSON 금지
@@ -89,15 +98,15 @@ def get_keyword_prompt() -> ChatPromptTemplate:
         ),
 
         # 정상 예시 1
-        ("human", f"텍스트:\n{ex1_context}"),
+        ("human", f"텍스트:\n{ex1_context}\n후보: {ex1_candidates}"),
         ("ai", ex1_output),
 
         # 정상 예시 2
-        ("human", f"텍스트:\n{ex2_context}"),
+        ("human", f"텍스트:\n{ex2_context}\n후보: {ex2_candidates}"),
         ("ai", ex2_output),
 
         # 정상 예시 3
-        ("human", f"텍스트:\n{ex3_context}"),
+        ("human", f"텍스트:\n{ex3_context}\n후보: {ex3_candidates}"),
         ("ai", ex3_output),
 
         # 교정형 예시 4
@@ -109,9 +118,9 @@ def get_keyword_prompt() -> ChatPromptTemplate:
         ("ai", ex5_corrected),
 
         # 장문 예시 6
-        ("human", f"텍스트:\n{ex6_context}"),
+        ("human", f"텍스트:\n{ex6_context}\n후보: {ex6_candidates}"),
         ("ai", ex6_output),
 
         # 실제 입력
-        ("human", "텍스트:\n{context}")
+        ("human", "텍스트:\n{context}\n후보: {candidates}")
     ])
\ No newline at end of file
@@ -1,6 +1,15 @@
 # 문서 요약 프롬프트 템플릿 (NLP 강의 기준)
+import hashlib
+from functools import lru_cache
+
 from langchain_core.prompts import ChatPromptTemplate
 
+# 지원하는 요약 스타일
+SUMMARY_TYPES = ("lecture", "bullet", "exam")
+
+# 요약 프롬프트 버전 (프롬프트 구조를 크게 바꾸면 올림 → 스타일별 요약 캐시 무효화)
+SUMMARY_PROMPT_VERSION = "v1"
+
 def get_summary_prompt(summary_type: str) -> ChatPromptTemplate:
     # -------------------------------
     # System Prompt (Mode-dependent)
@@ -137,4 +146,37 @@ def get_summary_prompt(summary_type: str) -> ChatPromptTemplate:
         # Actual Input
         ("system", "\n=================================\n[실제 요청 입력]"),
         ("human", "강의 내용:\n{context}")
-    ])
\ No newline at end of file
+    ])
+
+def get_map_summary_prompt() -> ChatPromptTemplate:
+    """
+    긴 강의 자료의 구간별 중간 요약 프롬프트 (Map 단계)
+    결과는 get_summary_prompt 의 입력(강의 내용)으로 다시 합쳐진다.
+    """
+    return ChatPromptTemplate.from_messages([
+        (
+            "system",
+            """
+            당신은 긴 강의 자료의 '일부 구간'을 정리하는 요약 도우미입니다.
+            이 결과는 최종 요약을 만들기 위한 중간 자료로 사용됩니다.
+
+            [구간 요약 규칙]
+            1. 구간에 등장하는 개념 정의, 처리 흐름, 핵심 원리, 비교 포인트를 빠짐없이 정리.
+            2. 불릿 중심으로 간결하게 작성 (서술형 설명 최소화).
+            3. 전문 용어와 수식, 고유 명사는 원문 그대로 유지.
+            4. 구간에 없는 내용을 추측하거나 추가하지 않음.
+            5. 출력은 정리 내용만 포함 (인사말, 시스템 문구 금지).
+            """
+        ),
+        ("human", "강의 내용(일부 구간):\n{context}")
+    ])
+
+@lru_cache(maxsize=None)
+def get_summary_prompt_version(summary_type: str) -> str:
+    """
+    스타일별 요약 캐시 키에 쓰는 프롬프트 버전
+    수동 버전 + (스타일 프롬프트 + Map 프롬프트) 내용 해시 → 문구만 고쳐도 캐시가 자동으로 갱신됨
+    """
+    content = get_summary_prompt(summary_type).pretty_repr() + get_map_summary_prompt().pretty_repr()
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    return f"{SUMMARY_PROMPT_VERSION}-{digest}"
@@ -1,10 +1,11 @@
 # RAG 검색 로직 (문서 기반 Q&A)
 import chromadb
-from langchain_openai import OpenAIEmbeddings
 from app.core.enums import ChromaDB, CHROMA_PERSIST_DIR
+from app.core.embedding_cache import get_embeddings
+from app.core.embedding_writer import embed_texts_sync, upsert_in_batches
 
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+embeddings = get_embeddings()
 
 client = chromadb.PersistentClient(
     path=CHROMA_PERSIST_DIR,
@@ -14,11 +15,12 @@ client = chromadb.PersistentClient(
 collection = client.get_or_create_collection(ChromaDB.COLLECTION_NAME.value)
 
 def save_chunks(document_id: int, chunks: list[str]):
-    vectors = embeddings.embed_documents(chunks)
-    for idx, chunk in enumerate(chunks):
-        collection.add(
-            documents=[chunk],
-            ids=[f"{document_id}_{idx}"],
-            metadatas=[{"document_id": document_id, "chunk_index": idx}],
-            embeddings=[vectors[idx]]
-        )
\ No newline at end of file
+    # 토큰 기준 배치 임베딩 후 한 번에 upsert
+    vectors = embed_texts_sync(chunks, embeddings=embeddings)
+    upsert_in_batches(
+        collection,
+        ids=[f"{document_id}_{idx}" for idx in range(len(chunks))],
+        embeddings=vectors,
+        documents=chunks,
+        metadatas=[{"document_id": document_id, "chunk_index": idx} for idx in range(len(chunks))],
+    )
\ No newline at end of file
@@ -0,0 +1,375 @@
+# OpenAI 호출 전역 속도 / 동시 호출 제한 (프로세스 단위)
+# - 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷 + 최대 동시 호출 수
+# - 우선순위: 챗봇(대화형) > 채점 > 수집 / 백그라운드 — 한도가 차면 높은 우선순위 요청부터 통과, 같은 우선순위는 도착 순
+# - 채팅 모델(chat)과 임베딩(embedding)은 OpenAI 한도가 따로이므로 리미터도 따로 둠
+# - 호출 전에는 추정 토큰으로 차감하고, 응답에서 실제 사용량을 알 수 있으면 차이를 정산
+# - 이벤트 루프(비동기)와 스레드(동기 호출)가 같은 한도를 공유
+import os
+import time
+import heapq
+import asyncio
+import functools
+import itertools
+import threading
+import contextlib
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.enums import LLMPriority
+
+load_dotenv()
+
+# 채팅 모델 한도 (0 이면 제한 없음)
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "200000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+# 호출 전 토큰 추정 시 더하는 응답 토큰 수 (실제 사용량을 알면 호출 후 정산)
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "800"))
+# 임베딩 모델 한도
+EMBEDDING_RPM_LIMIT = int(os.getenv("EMBEDDING_RPM_LIMIT", "3000"))
+EMBEDDING_TPM_LIMIT = int(os.getenv("EMBEDDING_TPM_LIMIT", "1000000"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "8"))
+
+# 우선순위 → 큐 정렬 순서 (작을수록 먼저)
+PRIORITY_RANK = {
+    LLMPriority.CHAT: 0,
+    LLMPriority.GRADING: 1,
+    LLMPriority.BACKGROUND: 2,
+}
+
+# 현재 요청의 우선순위 (서비스 함수에서 지정, 체인 기본값보다 우선)
+_current_priority: ContextVar[Optional[LLMPriority]] = ContextVar("llm_priority", default=None)
+
+
+def current_priority(default: LLMPriority = LLMPriority.BACKGROUND) -> LLMPriority:
+    priority = _current_priority.get()
+    return default if priority is None else priority
+
+
+@contextlib.contextmanager
+def llm_priority(priority: LLMPriority):
+    """이 블록(및 블록에서 만든 Task / to_thread) 안의 LLM / 임베딩 호출 우선순위 지정"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def prioritized(priority: LLMPriority):
+    """서비스 함수 데코레이터: 함수 안의 모든 LLM / 임베딩 호출을 priority 로 실행"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with llm_priority(priority):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with llm_priority(priority):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _Bucket:
+    """분당 한도 토큰 버킷 (용량 = 분당 한도, 초당 한도/60 씩 충전)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float):
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 쓸 수 있을 때까지 남은 시간 (용량보다 큰 요청은 용량만큼으로 취급)"""
+        if self.unlimited:
+            return 0.0
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float):
+        if not self.unlimited:
+            self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """호출 후 정산 (추정보다 많이 썼으면 음수가 될 수 있음 → 다음 요청이 그만큼 기다림)"""
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level - delta)
+
+
+def _noop():
+    pass
+
+
+def _future_waker(loop: asyncio.AbstractEventLoop, future: asyncio.Future) -> Callable[[], None]:
+    """다른 스레드에서도 호출 가능한 Future 완료 함수"""
+    def _set():
+        if not future.done():
+            future.set_result(None)
+
+    def wake():
+        try:
+            loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘 (대기하던 쪽도 사라짐)
+            pass
+    return wake
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "priority", "requests", "tokens", "enqueued", "wake", "granted", "cancelled", "throttled")
+
+    def __init__(self, priority: LLMPriority, seq: int, requests: int, tokens: int, wake: Callable[[], None]):
+        self.rank = PRIORITY_RANK[priority]
+        self.seq = seq
+        self.priority = priority
+        self.requests = requests
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+        # 바로 허가되지 않고 기다린 적이 있는지 (통계용)
+        self.throttled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class Permit:
+    """허가된 호출 1건 (끝나면 release, 실제 토큰 수를 알면 settle)"""
+
+    def __init__(self, limiter: "RateLimiter", waiter: _Waiter):
+        self.limiter = limiter
+        self.priority = waiter.priority
+        self.tokens = waiter.tokens
+        self._settled = False
+        self._released = False
+
+    def settle(self, actual_tokens: Optional[int]):
+        if actual_tokens is None or self._settled:
+            return
+        self._settled = True
+        self.limiter._settle(actual_tokens - self.tokens)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.limiter._release()
+
+
+class RateLimiter:
+    """RPM / TPM 토큰 버킷 + 동시 호출 수 제한 + 우선순위 대기열"""
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._requests = _Bucket(rpm)
+        self._tokens = _Bucket(tpm)
+        self._in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._queued: Dict[LLMPriority, int] = {p: 0 for p in LLMPriority}
+        self._granted: Dict[LLMPriority, int] = {p: 0 for p in LLMPriority}
+        self._throttled: Dict[LLMPriority, int] = {p: 0 for p in LLMPriority}
+        self._wait_total: Dict[LLMPriority, float] = {p: 0.0 for p in LLMPriority}
+        self._wait_max: Dict[LLMPriority, float] = {p: 0.0 for p in LLMPriority}
+
+    # ---- 대기열 처리 (모두 self._lock 안에서 호출) ----
+    def _enqueue(self, priority: LLMPriority, requests: int, tokens: int) -> _Waiter:
+        waiter = _Waiter(priority, next(self._seq), requests, tokens, _noop)
+        heapq.heappush(self._queue, waiter)
+        self._queued[priority] += 1
+        return waiter
+
+    def _grant(self, waiter: _Waiter, now: float):
+        heapq.heappop(self._queue)
+        self._requests.take(waiter.requests)
+        self._tokens.take(waiter.tokens)
+        self._in_flight += 1
+        self._queued[waiter.priority] -= 1
+        self._granted[waiter.priority] += 1
+        waited = now - waiter.enqueued
+        self._wait_total[waiter.priority] += waited
+        self._wait_max[waiter.priority] = max(self._wait_max[waiter.priority], waited)
+        waiter.granted = True
+        waiter.wake()
+
+    def _dispatch(self) -> Optional[float]:
+        """
+        대기열 앞(높은 우선순위, 먼저 온 순)부터 한도 안에서 허가
+        Returns: 버킷 충전을 기다려야 하면 남은 시간(초), 비었거나 동시 호출 수로 막혔으면 None (release 때 다시 처리)
+        """
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        while self._queue:
+            head = self._queue[0]
+            if head.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            if self.max_concurrency > 0 and self._in_flight >= self.max_concurrency:
+                return None
+            # 앞 요청이 버킷을 기다리는 동안 뒤의 작은 요청이 앞지르지 않음 (큰 요청 기아 방지)
+            delay = max(self._requests.wait_time(head.requests), self._tokens.wait_time(head.tokens))
+            if delay > 0:
+                return delay
+            self._grant(head, now)
+        return None
+
+    def _redispatch(self):
+        """
+        자리가 났을 때 다시 처리
+        동시 호출 수로 막혀 무기한 대기 중이던 맨 앞 요청이 이제 버킷을 기다려야 하면 깨워서 대기 시간을 다시 계산하게 함
+        """
+        if self._dispatch() is not None:
+            self._queue[0].wake()
+
+    def _abandon(self, waiter: _Waiter):
+        """대기 중 취소 / 예외: 대기열에서 빼고, 이미 허가됐으면 동시 호출 자리 반납"""
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+            elif not waiter.cancelled:
+                waiter.cancelled = True
+                self._queued[waiter.priority] -= 1
+            self._redispatch()
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._redispatch()
+
+    def _settle(self, delta: int):
+        with self._lock:
+            self._tokens.adjust(delta)
+
+    def _admit(self, waiter: _Waiter, wake: Callable[[], None]) -> Optional[float]:
+        """허가됐으면 0, 아니면 다음에 확인할 때까지의 시간 (None: 깨울 때까지)"""
+        with self._lock:
+            if waiter.granted:
+                return 0.0
+            waiter.wake = wake
+            delay = self._dispatch()
+            if waiter.granted:
+                return 0.0
+            if not waiter.throttled:
+                waiter.throttled = True
+                self._throttled[waiter.priority] += 1
+            return delay
+
+    # ---- 호출 측 API ----
+    async def acquire(self, priority: LLMPriority, tokens: int = 0, requests: int = 1) -> Permit:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._enqueue(priority, requests, tokens)
+        try:
+            while True:
+                # 허가 / 재계산 요청이 오면 바로 깨어나고, 버킷 충전 대기면 delay 후 다시 확인
+                signal = loop.create_future()
+                delay = self._admit(waiter, _future_waker(loop, signal))
+                if delay == 0.0:
+                    break
+                await asyncio.wait({signal}, timeout=delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return Permit(self, waiter)
+
+    def acquire_sync(self, priority: LLMPriority, tokens: int = 0, requests: int = 1) -> Permit:
+        with self._lock:
+            waiter = self._enqueue(priority, requests, tokens)
+        try:
+            while True:
+                signal = threading.Event()
+                delay = self._admit(waiter, signal.set)
+                if delay == 0.0:
+                    break
+                signal.wait(delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return Permit(self, waiter)
+
+    @contextlib.asynccontextmanager
+    async def limit(self, priority: LLMPriority, tokens: int = 0, requests: int = 1):
+        permit = await self.acquire(priority, tokens, requests)
+        try:
+            yield permit
+        finally:
+            permit.release()
+
+    @contextlib.contextmanager
+    def limit_sync(self, priority: LLMPriority, tokens: int = 0, requests: int = 1):
+        permit = self.acquire_sync(priority, tokens, requests)
+        try:
+            yield permit
+        finally:
+            permit.release()
+
+    def has_capacity(self) -> bool:
+        """대기 중인 요청이 없고 동시 호출 자리가 남았는지 (헤지 같은 추가 요청을 보내도 되는지)"""
+        with self._lock:
+            queued = sum(self._queued.values())
+            return queued == 0 and (self.max_concurrency <= 0 or self._in_flight < self.max_concurrency)
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            queues = []
+            for priority in sorted(LLMPriority, key=PRIORITY_RANK.get):
+                granted = self._granted[priority]
+                queues.append({
+                    "priority": priority.value,
+                    "queued": self._queued[priority],
+                    "granted": granted,
+                    "throttled": self._throttled[priority],
+                    "avg_wait_ms": round(self._wait_total[priority] / granted * 1000, 1) if granted else 0.0,
+                    "max_wait_ms": round(self._wait_max[priority] * 1000, 1),
+                })
+            return {
+                "name": self.name,
+                "rpm_limit": self.rpm,
+                "tpm_limit": self.tpm,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queue_depth": sum(self._queued.values()),
+                "available_requests": None if self._requests.unlimited else int(self._requests.level),
+                "available_tokens": None if self._tokens.unlimited else int(self._tokens.level),
+                "queues": queues,
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(kind: str) -> RateLimiter:
+    """chat | embedding 리미터 싱글톤"""
+    if kind not in _limiters:
+        if kind == "embedding":
+            _limiters[kind] = RateLimiter(kind, EMBEDDING_RPM_LIMIT, EMBEDDING_TPM_LIMIT, EMBEDDING_MAX_CONCURRENCY)
+        else:
+            _limiters[kind] = RateLimiter(kind, LLM_RPM_LIMIT, LLM_TPM_LIMIT, LLM_MAX_CONCURRENCY)
+    return _limiters[kind]
+
+
+def rate_limiter_stats() -> List[dict]:
+    return [get_rate_limiter(kind).stats() for kind in ("chat", "embedding")]
@@ -0,0 +1,103 @@
+# 동일 요청 병합 (single-flight)
+# 같은 키의 호출이 이미 진행 중이면 새로 호출하지 않고 진행 중인 호출의 결과를 함께 받음
+# - 같은 강의를 수업 중에 동시에 열 때 같은 프롬프트 / 같은 임베딩 요청이 한꺼번에 몰리는 경우용
+# - 결과는 공유되므로 호출한 쪽에서 수정할 객체는 복사해서 쓸 것
+# - 응답 캐시와 달리 완료된 결과는 보관하지 않음 (진행 중인 동안만 병합)
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _SyncCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """키별 진행 중 호출 병합 (비동기: 이벤트 루프 Task 공유 / 동기: 스레드 간 Event 대기)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._sync_calls: Dict[str, _SyncCall] = {}
+        self._lock = threading.Lock()
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        # 기다리던 요청 하나가 취소되어도 다른 요청이 기다리는 호출은 계속 진행
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 모두 취소되어 아무도 결과를 받지 않은 실패는 여기서 회수 (미회수 예외 경고 방지)
+        if not task.cancelled():
+            task.exception()
+
+    def run_sync(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._sync_calls.get(key)
+            leader = call is None
+            if leader:
+                call = _SyncCall()
+                self._sync_calls[key] = call
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._sync_calls[key]
+            call.event.set()
+
+    def in_flight(self) -> int:
+        return len(self._tasks) + len(self._sync_calls)
+
+    def stats(self) -> dict:
+        total = self.calls + self.coalesced
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0,
+            "in_flight": self.in_flight(),
+        }
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """이름별 병합 그룹 싱글톤 (통계 조회용으로 등록)"""
+    if name not in _flights:
+        _flights[name] = SingleFlight(name)
+    return _flights[name]
+
+
+def single_flight_stats() -> List[dict]:
+    return [flight.stats() for _, flight in sorted(_flights.items())]
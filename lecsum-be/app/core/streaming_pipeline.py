@@ -0,0 +1,116 @@
+# 대용량 문서 스트리밍 수집 파이프라인
+# 페이지 생산 → (정리 / 페이지 후처리 / 청킹) → (임베딩 / 저장) 3단계를 크기 제한 큐로 연결
+# - 각 단계는 큐가 차면 기다리므로 메모리에는 큐 크기만큼의 페이지 / 청크만 존재 (문서 크기와 무관)
+# - 한 단계가 실패하면 나머지 단계를 취소하고 예외를 그대로 전달
+import os
+import asyncio
+import contextlib
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+from app.core.chunker import TokenChunker
+from app.core.text_cleaner import StreamingCleaner
+
+load_dotenv()
+
+# 단계 사이 큐 크기 (페이지 / 청크 수)
+STREAM_PAGE_QUEUE = int(os.getenv("STREAM_PAGE_QUEUE", "32"))
+STREAM_CHUNK_QUEUE = int(os.getenv("STREAM_CHUNK_QUEUE", "256"))
+# 임베딩 / 저장 배치 크기 (청크 수)
+STREAM_EMBED_BATCH = int(os.getenv("STREAM_EMBED_BATCH", "128"))
+# 저장된 추출 텍스트를 읽을 때 한 번에 읽는 페이지 수
+STREAM_STORE_PAGES_PER_READ = int(os.getenv("STREAM_STORE_PAGES_PER_READ", "64"))
+
+# 큐 종료 표시
+_DONE = object()
+
+
+async def iter_stored_pages(store, content_hash: str) -> AsyncIterator[Document]:
+    """text_store 에 저장된 페이지를 STREAM_STORE_PAGES_PER_READ 단위로 읽으며 하나씩 반환"""
+    page_count = await asyncio.to_thread(store.page_count, content_hash)
+    for start in range(0, page_count, STREAM_STORE_PAGES_PER_READ):
+        docs = await asyncio.to_thread(
+            store.load_pages, content_hash, start, start + STREAM_STORE_PAGES_PER_READ
+        )
+        for doc in docs:
+            yield doc
+
+
+async def run_streaming_ingestion(
+    pages: AsyncIterator[Document],
+    chunker: TokenChunker,
+    on_page: Callable[[Document], Awaitable[None]],
+    prepare_chunk: Callable[[Document], None],
+    embed: Callable[[list[Document]], Awaitable[list[list[float]]]],
+    upsert: Callable[[list[Document], list[list[float]]], Awaitable[None]],
+    on_vectors: Callable[[list[Document], list[list[float]]], None],
+    cleaner: Optional[StreamingCleaner] = None,
+) -> dict:
+    """
+    pages: 페이지 비동기 iterator (원본 파싱 또는 저장된 추출 텍스트)
+    on_page: 정리가 끝난 페이지마다 호출 (추출 텍스트 저장, 키워드 후보 / 요약 입력 누적)
+    prepare_chunk: 청크마다 호출 (메타데이터 / 내용 기반 ID 지정)
+    embed / upsert: 청크 배치 임베딩 / VectorDB 저장
+    on_vectors: 저장이 끝난 배치마다 호출 (핵심 문장 후보 누적)
+    cleaner: 있으면 페이지를 정리한 뒤 다음 단계로 전달 (저장된 텍스트는 이미 정리된 상태)
+    Returns: {pages, chunks, cleaning}
+    """
+    page_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_PAGE_QUEUE)
+    chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_CHUNK_QUEUE)
+    stats = {"pages": 0, "chunks": 0, "cleaning": None}
+
+    async def _produce():
+        async with contextlib.aclosing(pages) as source:
+            async for page in source:
+                await page_queue.put(page)
+        await page_queue.put(_DONE)
+
+    async def _process():
+        stream = chunker.stream()
+
+        async def _emit(cleaned: list[Document]):
+            for page in cleaned:
+                stats["pages"] += 1
+                await on_page(page)
+                for chunk in await asyncio.to_thread(stream.feed, page):
+                    prepare_chunk(chunk)
+                    await chunk_queue.put(chunk)
+
+        while (page := await page_queue.get()) is not _DONE:
+            await _emit(await asyncio.to_thread(cleaner.feed, page) if cleaner else [page])
+        if cleaner:
+            remaining, stats["cleaning"] = await asyncio.to_thread(cleaner.finish)
+            await _emit(remaining)
+        for chunk in stream.flush():
+            prepare_chunk(chunk)
+            await chunk_queue.put(chunk)
+        await chunk_queue.put(_DONE)
+
+    async def _store(batch: list[Document]):
+        vectors = await embed(batch)
+        await upsert(batch, vectors)
+        on_vectors(batch, vectors)
+        stats["chunks"] += len(batch)
+
+    async def _consume():
+        batch: list[Document] = []
+        while (chunk := await chunk_queue.get()) is not _DONE:
+            batch.append(chunk)
+            if len(batch) >= STREAM_EMBED_BATCH:
+                await _store(batch)
+                batch = []
+        if batch:
+            await _store(batch)
+
+    tasks = [asyncio.create_task(stage()) for stage in (_produce, _process, _consume)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # 한 단계가 실패하면 큐에서 기다리는 나머지 단계가 멈추지 않도록 모두 취소
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return stats
@@ -0,0 +1,189 @@
+# 추출 텍스트 정리 (요약 / 임베딩 전 단계)
+# - 여러 페이지에 반복되는 줄(강의명, 교수명, 저작권 문구 등 머리글 / 바닥글)은 처음 나온 페이지에만 남기고 삭제
+# - 페이지 번호만 있는 줄 삭제
+# - 내용이 거의 없는 페이지(이미지만 있는 슬라이드 등)는 빈 페이지로 만듦
+#   (페이지 인덱스가 text_store / 페이지 조회 API 와 어긋나지 않도록 페이지 자체는 유지)
+import os
+import re
+import threading
+from collections import Counter
+
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+from app.core.tokenizer import count_tokens
+
+load_dotenv()
+
+# 전체 페이지 중 이 비율 이상에 나오는 줄을 머리글 / 바닥글로 간주
+BOILERPLATE_PAGE_RATIO = float(os.getenv("BOILERPLATE_PAGE_RATIO", "0.5"))
+# 반복 줄 검출을 적용하는 최소 페이지 수 (짧은 문서는 우연한 반복이 많음)
+BOILERPLATE_MIN_PAGES = int(os.getenv("BOILERPLATE_MIN_PAGES", "4"))
+# 스트리밍 수집에서 반복 줄 검출에 쓰는 앞쪽 표본 페이지 수
+BOILERPLATE_SAMPLE_PAGES = int(os.getenv("BOILERPLATE_SAMPLE_PAGES", "40"))
+# 머리글 / 바닥글 후보 줄의 최대 길이 (본문 문장은 반복되어도 지우지 않음)
+BOILERPLATE_MAX_LINE_CHARS = int(os.getenv("BOILERPLATE_MAX_LINE_CHARS", "80"))
+# 정리 후 토큰 수가 이보다 적은 페이지는 비움
+MIN_PAGE_TOKENS = int(os.getenv("MIN_PAGE_TOKENS", "8"))
+
+# "3", "- 3 -", "3 / 20", "Page 3 of 20", "p. 3"
+_PAGE_NUMBER = re.compile(r"^(?:page|p\.?)?\s*[-–]?\s*\d+\s*(?:(?:/|of)\s*\d+)?\s*[-–]?$", re.IGNORECASE)
+# 줄 앞뒤에 붙은 페이지 번호 ("강의명 | 3", "3 / 20 강의명")
+_EDGE_NUMBER = re.compile(r"^[\d\s/|·\-–]+(?=\D)|(?<=\D)[\s/|·\-–]*\d+(?:\s*/\s*\d+)?$")
+_SPACES = re.compile(r"\s+")
+
+
+def _line_key(line: str) -> str:
+    """반복 줄 비교용 키 (공백 / 대소문자 / 앞뒤 페이지 번호 차이는 무시)"""
+    return _EDGE_NUMBER.sub("", _SPACES.sub(" ", line.strip()).lower()).strip()
+
+
+class CleaningStats:
+    """프로세스 시작 이후 누적 정리 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.original_tokens = 0
+        self.removed_tokens = 0
+        self.removed_lines = 0
+        self.emptied_pages = 0
+
+    def record(self, report: dict):
+        with self._lock:
+            self.documents += 1
+            self.original_tokens += report["original_tokens"]
+            self.removed_tokens += report["removed_tokens"]
+            self.removed_lines += report["removed_lines"]
+            self.emptied_pages += report["emptied_pages"]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "original_tokens": self.original_tokens,
+                "removed_tokens": self.removed_tokens,
+                "removed_ratio": round(self.removed_tokens / self.original_tokens, 4) if self.original_tokens else 0.0,
+                "removed_lines": self.removed_lines,
+                "emptied_pages": self.emptied_pages,
+            }
+
+
+_stats = CleaningStats()
+
+
+def get_cleaning_stats() -> CleaningStats:
+    return _stats
+
+
+def _record(report: dict, source: str | None):
+    """문서 한 건의 정리 결과를 누적 통계에 반영하고, 제거한 내용이 있으면 로그 출력"""
+    _stats.record(report)
+    if report["removed_tokens"]:
+        print(
+            f"+++ {source or '문서'}: 반복 줄 / 빈 페이지 정리로 {report['removed_tokens']}/{report['original_tokens']} 토큰 제거 "
+            f"(줄 {report['removed_lines']}개, 페이지 {report['emptied_pages']}개)"
+        )
+
+
+def _repeated_keys(pages: list[list[str]]) -> set[str]:
+    if len(pages) < BOILERPLATE_MIN_PAGES:
+        return set()
+    page_freq = Counter(
+        key
+        for lines in pages
+        for key in {_line_key(line) for line in lines if len(line.strip()) <= BOILERPLATE_MAX_LINE_CHARS}
+    )
+    threshold = max(2, int(len(pages) * BOILERPLATE_PAGE_RATIO + 0.5))
+    return {key for key, freq in page_freq.items() if freq >= threshold and key}
+
+
+class _PageCleaner:
+    """반복 줄 목록을 받아 페이지를 하나씩 정리하며 정리 결과를 누적"""
+
+    def __init__(self, repeated: set[str]):
+        self.repeated = repeated
+        self._kept_once: set[str] = set()
+        self.report = {"original_tokens": 0, "removed_tokens": 0, "removed_lines": 0, "emptied_pages": 0}
+
+    def clean(self, doc: Document, lines: list[str]) -> Document:
+        page_tokens = count_tokens(doc.page_content or "")
+        self.report["original_tokens"] += page_tokens
+
+        kept: list[str] = []
+        for line in lines:
+            key = _line_key(line)
+            if _PAGE_NUMBER.match(line.strip()):
+                self.report["removed_lines"] += 1
+                continue
+            if key in self.repeated:
+                # 반복 줄은 처음 나온 페이지에만 남김 (표지의 강의명 등)
+                if key in self._kept_once:
+                    self.report["removed_lines"] += 1
+                    continue
+                self._kept_once.add(key)
+            kept.append(line)
+
+        content = "\n".join(kept)
+        content_tokens = count_tokens(content)
+        if content and content_tokens < MIN_PAGE_TOKENS:
+            content, content_tokens = "", 0
+            self.report["emptied_pages"] += 1
+        elif not content and page_tokens:
+            self.report["emptied_pages"] += 1
+
+        self.report["removed_tokens"] += max(0, page_tokens - content_tokens)
+        return Document(page_content=content, metadata=dict(doc.metadata))
+
+
+def _page_lines(doc: Document) -> list[str]:
+    return [line for line in (doc.page_content or "").split("\n") if line.strip()]
+
+
+def clean_pages(docs: list[Document]) -> tuple[list[Document], dict]:
+    """
+    페이지별 Document 목록 정리 (메타데이터 유지, 입력은 수정하지 않음)
+    Returns:
+        (정리된 Document 목록, 정리 결과 {original_tokens, removed_tokens, removed_lines, emptied_pages})
+    """
+    pages = [_page_lines(doc) for doc in docs]
+    cleaner = _PageCleaner(_repeated_keys(pages))
+    cleaned = [cleaner.clean(doc, lines) for doc, lines in zip(docs, pages)]
+    _record(cleaner.report, docs[0].metadata.get("source") if docs else None)
+    return cleaned, cleaner.report
+
+
+class StreamingCleaner:
+    """
+    스트리밍 수집용 정리기
+    앞쪽 BOILERPLATE_SAMPLE_PAGES 페이지만 모아서 반복 줄을 찾고, 이후 페이지는 받는 즉시 정리
+    (머리글 / 바닥글은 문서 전체에 걸쳐 반복되므로 앞부분 표본으로 충분)
+    """
+
+    def __init__(self, sample_pages: int = BOILERPLATE_SAMPLE_PAGES):
+        self.sample_pages = sample_pages
+        self._sample: list[Document] = []
+        self._cleaner: _PageCleaner | None = None
+        self._source: str | None = None
+
+    def _start(self) -> list[Document]:
+        pages = [_page_lines(doc) for doc in self._sample]
+        self._cleaner = _PageCleaner(_repeated_keys(pages))
+        cleaned = [self._cleaner.clean(doc, lines) for doc, lines in zip(self._sample, pages)]
+        self._sample = []
+        return cleaned
+
+    def feed(self, doc: Document) -> list[Document]:
+        """페이지 하나를 넣고 정리가 끝난 페이지 목록을 받음 (표본을 모으는 동안은 빈 목록)"""
+        if self._source is None:
+            self._source = doc.metadata.get("source")
+        if self._cleaner is not None:
+            return [self._cleaner.clean(doc, _page_lines(doc))]
+        self._sample.append(doc)
+        return self._start() if len(self._sample) >= self.sample_pages else []
+
+    def finish(self) -> tuple[list[Document], dict]:
+        """남은 표본 페이지 정리 후 정리 결과 반환"""
+        remaining = self._start() if self._cleaner is None else []
+        _record(self._cleaner.report, self._source)
+        return remaining, self._cleaner.report
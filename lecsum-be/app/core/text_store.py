@@ -0,0 +1,182 @@
+# 문서 추출 텍스트 저장소
+# - 업로드 원본에서 추출한 페이지(슬라이드)별 텍스트를 content_hash 단위 파일로 보관
+# - 페이지마다 독립된 zstd 프레임으로 압축하고 오프셋 인덱스를 두어, 필요한 페이지 범위만 읽어서 해제
+# - 다른 summary_type 재요약 / 키워드 재생성 / 배치 작업에서 원본 파일 재파싱이 필요 없음
+#
+# 파일 구조 (리틀 엔디언)
+#   magic "LSTX" | version u8 | page_count u32 | meta_len u32
+#   offsets u64 × (page_count + 1)  (데이터 영역 시작 기준, 마지막 값 = 데이터 전체 길이)
+#   meta (zstd 압축 JSON: 페이지별 메타데이터 목록)
+#   data (페이지별 zstd 압축 UTF-8 텍스트)
+import os
+import json
+import shutil
+import struct
+import tempfile
+import threading
+from typing import List, Optional
+
+import zstandard
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+from app.core.enums import BASE_DIR
+
+load_dotenv()
+
+TEXT_STORE_DIR = os.getenv("TEXT_STORE_DIR", os.path.join(BASE_DIR, "vectorstore", "texts"))
+TEXT_STORE_COMPRESSION_LEVEL = int(os.getenv("TEXT_STORE_COMPRESSION_LEVEL", "10"))
+
+_MAGIC = b"LSTX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBII")
+
+
+class DocumentTextStore:
+    """content_hash → 페이지별 압축 텍스트 파일"""
+
+    def __init__(self, root: str = TEXT_STORE_DIR, level: int = TEXT_STORE_COMPRESSION_LEVEL):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.level = level
+        # zstd 압축/해제 객체는 스레드 간 공유 불가 → 스레드별 생성
+        self._local = threading.local()
+
+    def _compressor(self) -> zstandard.ZstdCompressor:
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+        return self._local.compressor
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.decompressor
+
+    def _path(self, content_hash: str) -> str:
+        # 한 디렉터리에 파일이 몰리지 않도록 해시 앞 2글자로 분산
+        return os.path.join(self.root, content_hash[:2], f"{content_hash}.lstx")
+
+    def exists(self, content_hash: str) -> bool:
+        return os.path.exists(self._path(content_hash))
+
+    def save(self, content_hash: str, docs: List[Document]):
+        """페이지별 Document 목록 저장 (임시 파일에 쓴 뒤 교체 → 읽는 쪽은 항상 완전한 파일만 봄)"""
+        with self.writer(content_hash) as writer:
+            for doc in docs:
+                writer.add(doc)
+
+    def writer(self, content_hash: str) -> "TextStoreWriter":
+        """페이지를 하나씩 추가하며 저장하는 writer (스트리밍 수집용, with 블록이 정상 종료되면 확정)"""
+        return TextStoreWriter(self, content_hash)
+
+    def _read_header(self, f) -> tuple[int, list[int], int]:
+        magic, version, page_count, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("지원하지 않는 텍스트 저장 파일 형식입니다.")
+        offsets = list(struct.unpack(f"<{page_count + 1}Q", f.read(8 * (page_count + 1))))
+        return page_count, offsets, meta_len
+
+    def page_count(self, content_hash: str) -> int:
+        with open(self._path(content_hash), "rb") as f:
+            return _HEADER.unpack(f.read(_HEADER.size))[2]
+
+    def load_pages(self, content_hash: str, start: int = 0, end: Optional[int] = None) -> List[Document]:
+        """
+        [start, end) 페이지만 읽어서 Document 목록으로 반환 (0-based, end=None 이면 끝까지)
+        범위 밖 인덱스는 잘라서 처리
+        """
+        decompressor = self._decompressor()
+        with open(self._path(content_hash), "rb") as f:
+            page_count, offsets, meta_len = self._read_header(f)
+            start = max(0, start)
+            end = page_count if end is None else min(end, page_count)
+            if start >= end:
+                return []
+
+            metadatas = json.loads(decompressor.decompress(f.read(meta_len)))
+            data_start = f.tell()
+            f.seek(data_start + offsets[start])
+            data = f.read(offsets[end] - offsets[start])
+
+        base = offsets[start]
+        return [
+            Document(
+                page_content=decompressor.decompress(data[offsets[i] - base:offsets[i + 1] - base]).decode("utf-8"),
+                metadata=metadatas[i],
+            )
+            for i in range(start, end)
+        ]
+
+    def load_text(self, content_hash: str, start: int = 0, end: Optional[int] = None) -> str:
+        return "\n".join(doc.page_content for doc in self.load_pages(content_hash, start, end))
+
+    def delete(self, content_hash: str):
+        path = self._path(content_hash)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class TextStoreWriter:
+    """
+    압축한 페이지 블록을 임시 데이터 파일에 바로 기록하고, 끝나면 헤더 / 오프셋 / 메타데이터를 붙여 확정
+    메모리에는 페이지별 오프셋과 메타데이터만 유지
+    """
+
+    def __init__(self, store: DocumentTextStore, content_hash: str):
+        self.store = store
+        self.path = store._path(content_hash)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, self._data_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".data.tmp")
+        self._data = os.fdopen(fd, "wb")
+        self._offsets = [0]
+        self._metadatas: List[dict] = []
+
+    def add(self, doc: Document):
+        block = self.store._compressor().compress((doc.page_content or "").encode("utf-8"))
+        self._data.write(block)
+        self._offsets.append(self._offsets[-1] + len(block))
+        self._metadatas.append(doc.metadata)
+
+    def commit(self):
+        self._data.close()
+        meta = self.store._compressor().compress(
+            json.dumps(self._metadatas, ensure_ascii=False).encode("utf-8")
+        )
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, open(self._data_path, "rb") as data:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, len(self._metadatas), len(meta)))
+                f.write(struct.pack(f"<{len(self._offsets)}Q", *self._offsets))
+                f.write(meta)
+                shutil.copyfileobj(data, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            os.remove(self._data_path)
+
+    def abort(self):
+        self._data.close()
+        if os.path.exists(self._data_path):
+            os.remove(self._data_path)
+
+    def __enter__(self) -> "TextStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+_store: Optional[DocumentTextStore] = None
+
+
+def get_text_store() -> DocumentTextStore:
+    global _store
+    if _store is None:
+        _store = DocumentTextStore()
+    return _store
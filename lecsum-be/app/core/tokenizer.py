@@ -0,0 +1,58 @@
+# 토큰 수 계산 유틸 (gpt-4o 계열 토크나이저 기준)
+from functools import lru_cache
+
+import tiktoken
+
+TOKENIZER_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    tiktoken 인코딩 로드 (최초 1회 BPE 파일 다운로드 필요)
+    네트워크가 없는 환경에서는 None → 근사치 계산으로 대체
+    """
+    try:
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        print(f"⚠️ tiktoken 인코딩 로드 실패, 근사치로 토큰 수를 계산합니다: {e}")
+        return None
+
+
+def _approx_tokens(text: str) -> int:
+    # UTF-8 3바이트 ≒ 1토큰 (한글 1글자 ≒ 1토큰, 영어는 다소 과대 추정 → 안전한 쪽)
+    return (len(text.encode("utf-8")) + 2) // 3
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return _approx_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """최대 토큰 수를 넘지 않도록 텍스트 앞부분만 남김"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    return split_by_tokens(text, max_tokens)[0]
+
+
+def split_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """텍스트를 max_tokens 이하 조각으로 분할"""
+    if not text:
+        return [text]
+    encoding = _get_encoding()
+    if encoding is None:
+        # 근사치 기준 글자 수로 분할
+        step = max(1, len(text) * max_tokens // max(1, _approx_tokens(text)))
+        return [text[i:i + step] for i in range(0, len(text), step)]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    return [
+        encoding.decode(tokens[i:i + max_tokens])
+        for i in range(0, len(tokens), max_tokens)
+    ]
@@ -0,0 +1,357 @@
+# LLM 토큰 / 지연 시간 집계 (체인 × API 경로 × 문서)
+# - 체인 호출(CachedModel 1회)마다 LangChain 콜백으로 프롬프트 / 응답 / 프롬프트 캐시 토큰을 모으고
+#   소요 시간, 재시도 횟수, 응답 캐시 hit 여부와 함께 기록
+# - 태그: chain(체인 이름) / route(HTTP 경로 템플릿 또는 백그라운드 작업 이름) / document(문서 UUID)
+#   route 는 main.py 미들웨어, document 는 서비스 코드에서 usage_context / tag_usage 로 지정
+# - 메모리에 (chain, route, document) 별 누적 → USAGE_FLUSH_INTERVAL_SEC 마다 SQLite 에 합산 저장
+# - 조회: 저장된 합계 + 아직 저장 전인 메모리 누적분 / Prometheus 텍스트 형식 내보내기
+import os
+import time
+import atexit
+import sqlite3
+import threading
+import contextlib
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import merge_configs
+
+from app.core.enums import BASE_DIR
+
+load_dotenv()
+
+USAGE_ACCOUNTING_ENABLED = os.getenv("USAGE_ACCOUNTING_ENABLED", "true").lower() == "true"
+USAGE_ACCOUNTING_PATH = os.getenv(
+    "USAGE_ACCOUNTING_PATH",
+    os.path.join(BASE_DIR, "vectorstore", "usage_accounting.sqlite3"),
+)
+# 메모리 누적분을 디스크에 합산하는 주기 (초)
+USAGE_FLUSH_INTERVAL_SEC = float(os.getenv("USAGE_FLUSH_INTERVAL_SEC", "60"))
+
+# 태그가 없을 때 값
+UNTAGGED = "-"
+# 집계 항목 (저장 / 조회 / 내보내기 순서)
+COUNTERS = (
+    "invocations",
+    "cache_hits",
+    "errors",
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_tokens",
+    "retries",
+    "wall_ms",
+)
+GROUP_FIELDS = ("chain", "route", "document")
+
+# 현재 요청 / 작업의 태그 {"scope": ASGI scope, "route": str, "document": str}
+_usage_tags: ContextVar[Dict[str, Any]] = ContextVar("usage_tags", default={})
+
+
+@contextlib.contextmanager
+def usage_context(route: Optional[str] = None, document: Optional[str] = None, scope: Optional[dict] = None):
+    """이 블록(및 블록에서 만든 Task / to_thread) 안의 LLM 호출 태그 지정 (지정하지 않은 항목은 바깥 값 유지)"""
+    tags = dict(_usage_tags.get())
+    if scope is not None:
+        tags["scope"] = scope
+    if route is not None:
+        tags["route"] = route
+    if document is not None:
+        tags["document"] = document
+    token = _usage_tags.set(tags)
+    try:
+        yield
+    finally:
+        _usage_tags.reset(token)
+
+
+def tag_usage(document: Optional[str] = None):
+    """
+    요청 처리 중 알게 된 문서를 현재 Task 의 나머지 LLM 호출에 태그 (블록을 나누기 어려운 서비스 함수용)
+    요청마다 Task 가 따로이므로 다른 요청에는 영향 없음 — 여러 작업을 도는 워커에서는 usage_context 를 쓸 것
+    """
+    tags = dict(_usage_tags.get())
+    if document is not None:
+        tags["document"] = document
+    _usage_tags.set(tags)
+
+
+def _current_tags() -> tuple[str, str]:
+    """(route, document) — route 는 명시값 > 라우팅된 경로 템플릿(GET /api/quiz/{id}) > 실제 경로"""
+    tags = _usage_tags.get()
+    route = tags.get("route")
+    scope = tags.get("scope")
+    if route is None and scope is not None:
+        matched = scope.get("route")
+        path = getattr(matched, "path", None) or scope.get("path", UNTAGGED)
+        route = f"{scope.get('method', '')} {path}".strip()
+    return route or UNTAGGED, tags.get("document") or UNTAGGED
+
+
+class Invocation:
+    """체인 호출 1회 집계 (재시도 / 헤지로 모델을 여러 번 불러도 한 건)"""
+
+    def __init__(self, chain: str):
+        self.chain = chain
+        self.route, self.document = _current_tags()
+        self.started = time.perf_counter()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.retries = 0
+        self.cache_hit = False
+        self.error = False
+        self._lock = threading.Lock()
+        self._handler = UsageCallbackHandler(self)
+
+    def config(self, config: Optional[RunnableConfig]) -> RunnableConfig:
+        """모델 호출 config 에 집계 콜백 추가 (체인에서 넘어온 콜백은 유지)"""
+        return merge_configs(config, {"callbacks": [self._handler]})
+
+    def add_tokens(self, prompt: int, completion: int, cached: int):
+        with self._lock:
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+            self.cached_tokens += cached
+
+    def add_retry(self):
+        self.retries += 1
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            "invocations": 1,
+            "cache_hits": int(self.cache_hit),
+            "errors": int(self.error),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "retries": self.retries,
+            "wall_ms": int((time.perf_counter() - self.started) * 1000),
+        }
+
+
+def _usage_from_result(response: LLMResult) -> tuple[int, int, int]:
+    """(prompt, completion, cached) — 메시지 usage_metadata 우선, 없으면 llm_output.token_usage"""
+    prompt = completion = cached = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(generation.message, "usage_metadata", None) if isinstance(generation, ChatGeneration) else None
+            if usage:
+                found = True
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+                cached += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    if found:
+        return prompt, completion, cached
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens", 0) or 0,
+        token_usage.get("completion_tokens", 0) or 0,
+        details.get("cached_tokens", 0) or 0,
+    )
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """모델 호출이 끝날 때마다 토큰 사용량을 Invocation 에 더함"""
+
+    # 계산이 가벼우므로 비동기 실행에서도 스레드 풀로 넘기지 않고 바로 실행
+    run_inline = True
+
+    def __init__(self, invocation: Invocation):
+        self.invocation = invocation
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self.invocation.add_tokens(*_usage_from_result(response))
+
+
+class UsageAccounting:
+    """(chain, route, document) 별 누적 + 주기적 SQLite 합산 저장"""
+
+    def __init__(self, path: str = USAGE_ACCOUNTING_PATH, flush_interval_sec: float = USAGE_FLUSH_INTERVAL_SEC):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.flush_interval_sec = flush_interval_sec
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._pending: Dict[tuple, List[int]] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS llm_usage (
+                chain TEXT NOT NULL,
+                route TEXT NOT NULL,
+                document TEXT NOT NULL,
+                invocations INTEGER NOT NULL DEFAULT 0,
+                cache_hits INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0,
+                prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                completion_tokens INTEGER NOT NULL DEFAULT 0,
+                cached_tokens INTEGER NOT NULL DEFAULT 0,
+                retries INTEGER NOT NULL DEFAULT 0,
+                wall_ms INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (chain, route, document)
+            );
+            CREATE INDEX IF NOT EXISTS ix_llm_usage_document ON llm_usage (document);
+            """
+        )
+        self._conn.commit()
+
+    def record(self, invocation: Invocation):
+        key = (invocation.chain, invocation.route, invocation.document)
+        counters = invocation.counters()
+        with self._lock:
+            totals = self._pending.setdefault(key, [0] * len(COUNTERS))
+            for idx, name in enumerate(COUNTERS):
+                totals[idx] += counters[name]
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        """첫 기록 시 주기적 저장 스레드 기동 (종료 시에도 남은 누적분 저장)"""
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="usage-accounting-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval_sec)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ LLM 사용량 저장 실패: {e}")
+
+    def flush(self) -> int:
+        """메모리 누적분을 디스크 합계에 더함, Returns: 저장한 그룹 수"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        columns = ", ".join(COUNTERS)
+        updates = ", ".join(f"{name} = {name} + excluded.{name}" for name in COUNTERS)
+        now = time.time()
+        with self._db_lock:
+            self._conn.executemany(
+                f"""
+                INSERT INTO llm_usage (chain, route, document, {columns}, updated_at)
+                VALUES (?, ?, ?, {", ".join("?" * len(COUNTERS))}, ?)
+                ON CONFLICT (chain, route, document) DO UPDATE SET {updates}, updated_at = excluded.updated_at
+                """,
+                [(*key, *totals, now) for key, totals in pending.items()],
+            )
+            self._conn.commit()
+        return len(pending)
+
+    def query(
+        self,
+        group_by: List[str],
+        chain: Optional[str] = None,
+        route: Optional[str] = None,
+        document: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[dict]:
+        """group_by(chain / route / document 조합) 별 합계, 프롬프트 + 응답 토큰이 많은 순"""
+        self.flush()
+        group_by = [field for field in GROUP_FIELDS if field in group_by]
+        filters = [(field, value) for field, value in zip(GROUP_FIELDS, (chain, route, document)) if value]
+        where = " AND ".join(f"{field} = ?" for field, _ in filters) or "1 = 1"
+        select_groups = ", ".join(group_by) + ", " if group_by else ""
+        group_clause = f"GROUP BY {', '.join(group_by)}" if group_by else ""
+        sums = ", ".join(f"SUM({name})" for name in COUNTERS)
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {select_groups}{sums} FROM llm_usage
+                WHERE {where} {group_clause}
+                ORDER BY SUM(prompt_tokens) + SUM(completion_tokens) DESC
+                LIMIT ?
+                """,
+                [value for _, value in filters] + [limit],
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            values = dict(zip(group_by, row[:len(group_by)]))
+            totals = dict(zip(COUNTERS, (value or 0 for value in row[len(group_by):])))
+            if not totals["invocations"]:
+                continue
+            results.append({
+                **{field: values.get(field) for field in GROUP_FIELDS},
+                **totals,
+                "total_tokens": totals["prompt_tokens"] + totals["completion_tokens"],
+                "avg_wall_ms": round(totals["wall_ms"] / totals["invocations"], 1),
+            })
+        return results
+
+    def prometheus(self) -> str:
+        """
+        Prometheus 텍스트 형식 (레이블: chain, route)
+        문서별 값은 레이블 수가 문서 수만큼 늘어나므로 내보내지 않음 (query 로 조회)
+        """
+        rows = self.query(["chain", "route"], limit=-1)
+        metrics = [
+            ("invocations", "lecsum_llm_invocations_total", "LLM 체인 호출 수"),
+            ("cache_hits", "lecsum_llm_cache_hits_total", "응답 캐시에서 반환한 체인 호출 수"),
+            ("errors", "lecsum_llm_errors_total", "실패한 체인 호출 수"),
+            ("prompt_tokens", "lecsum_llm_prompt_tokens_total", "프롬프트 토큰 수"),
+            ("completion_tokens", "lecsum_llm_completion_tokens_total", "응답 토큰 수"),
+            ("cached_tokens", "lecsum_llm_cached_prompt_tokens_total", "프롬프트 중 OpenAI 프롬프트 캐시로 처리된 토큰 수"),
+            ("retries", "lecsum_llm_retries_total", "재시도 횟수"),
+        ]
+        lines = []
+        for field, name, help_text in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for row in rows:
+                lines.append(f"{name}{{{_labels(chain=row['chain'], route=row['route'])}}} {row[field]}")
+        lines.append("# HELP lecsum_llm_wall_seconds_total 체인 호출 소요 시간 합계")
+        lines.append("# TYPE lecsum_llm_wall_seconds_total counter")
+        for row in rows:
+            lines.append(
+                f"lecsum_llm_wall_seconds_total{{{_labels(chain=row['chain'], route=row['route'])}}} {row['wall_ms'] / 1000:.3f}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    def _escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+@contextlib.contextmanager
+def track_invocation(chain: str):
+    """체인 호출 1회 집계 (블록이 끝나면 기록, 예외면 errors 로 기록 — 취소 / 스트림 중단은 오류 아님)"""
+    invocation = Invocation(chain)
+    try:
+        yield invocation
+    except Exception:
+        invocation.error = True
+        raise
+    finally:
+        if USAGE_ACCOUNTING_ENABLED:
+            get_usage_accounting().record(invocation)
+
+
+_accounting: Optional[UsageAccounting] = None
+
+
+def get_usage_accounting() -> UsageAccounting:
+    global _accounting
+    if _accounting is None:
+        _accounting = UsageAccounting()
+    return _accounting
@@ -1,7 +1,8 @@
 # MySQL CRUD Repository
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 
-from app.models.document import DocumentFile
+from app.models.document import DocumentFile, DocumentSummary
 
 def create_document(
     db: Session,
@@ -12,7 +13,9 @@ def create_document(
     concept_cnt: int | None = None,
     keyword_cnt: int | None = None,
     review_time: int | None = None,
-    
+    content_hash: str | None = None,
+    summary_type: str | None = None,
+    top_sentences: list[str] | None = None,
 ):
     document = DocumentFile(
         uuid=uuid,
@@ -22,12 +25,23 @@ def create_document(
         concept_cnt=concept_cnt,
         keyword_cnt=keyword_cnt,
         review_time=review_time,
+        content_hash=content_hash,
+        summary_type=summary_type,
+        top_sentences=top_sentences,
     )
     db.add(document)
     db.commit()
     db.refresh(document)
     return document
 
+# 문서 정보 갱신 (재업로드)
+def update_document(db: Session, document: DocumentFile, **fields):
+    for key, value in fields.items():
+        setattr(document, key, value)
+    db.commit()
+    db.refresh(document)
+    return document
+
 # 문서 정보 조회
 def get_document_by_id(db: Session, document_id: int):
     return db.query(DocumentFile).filter(DocumentFile.id == document_id).first()
@@ -46,4 +60,66 @@ def get_document_by_uuid(db: Session, uuid: str):
         db.query(DocumentFile)
         .filter(DocumentFile.uuid == uuid)
         .first()
-    )
\ No newline at end of file
+    )
+
+# 동일 내용(sha256) 문서 조회 (summary_type 지정 시 해당 스타일만)
+def get_document_by_hash(db: Session, content_hash: str, summary_type: str | None = None):
+    query = db.query(DocumentFile).filter(DocumentFile.content_hash == content_hash)
+    if summary_type is not None:
+        query = query.filter(DocumentFile.summary_type == summary_type)
+    return query.order_by(DocumentFile.id.asc()).first()
+
+# 스타일별 요약 캐시 조회
+def get_document_summary(db: Session, document_id: int, summary_type: str, prompt_version: str):
+    return (
+        db.query(DocumentSummary)
+        .filter(
+            DocumentSummary.document_id == document_id,
+            DocumentSummary.summary_type == summary_type,
+            DocumentSummary.prompt_version == prompt_version,
+        )
+        .first()
+    )
+
+def has_document_summaries(db: Session, document_id: int, summary_type: str) -> bool:
+    return (
+        db.query(DocumentSummary.id)
+        .filter(
+            DocumentSummary.document_id == document_id,
+            DocumentSummary.summary_type == summary_type,
+        )
+        .first()
+        is not None
+    )
+
+# 스타일별 요약 캐시 저장 (다른 프로세스가 먼저 저장했으면 그 결과 반환)
+def create_document_summary(
+    db: Session,
+    document_id: int,
+    summary_type: str,
+    prompt_version: str,
+    summary: str,
+    concept_cnt: int | None = None,
+    review_time: int | None = None,
+):
+    document_summary = DocumentSummary(
+        document_id=document_id,
+        summary_type=summary_type,
+        prompt_version=prompt_version,
+        summary=summary,
+        concept_cnt=concept_cnt,
+        review_time=review_time,
+    )
+    db.add(document_summary)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return get_document_summary(db, document_id, summary_type, prompt_version)
+    db.refresh(document_summary)
+    return document_summary
+
+# 문서 내용이 바뀌면(재업로드) 스타일별 요약 캐시 삭제
+def delete_document_summaries(db: Session, document_id: int):
+    db.query(DocumentSummary).filter(DocumentSummary.document_id == document_id).delete()
+    db.commit()
@@ -0,0 +1,123 @@
+# 운영(관리자) API 응답 스키마
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# 임베딩 캐시 통계
+class EmbeddingCacheStats(BaseModel):
+    path: str = Field(description="SQLite 캐시 파일 경로")
+    entries: int = Field(description="저장된 임베딩 수")
+    max_entries: int = Field(description="최대 항목 수 (초과 시 LRU 삭제)")
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+
+# LLM 응답 캐시 체인별 카운터
+class LLMCacheChainStats(BaseModel):
+    chain: str = Field(description="체인 이름 (summary, keyword, quiz, grade, enrich, chatbot, recommend 등)")
+    hits: int
+    misses: int
+    hit_rate: float
+
+# LLM 응답 캐시 통계
+class LLMCacheStats(BaseModel):
+    backend: str = Field(description="memory | sqlite | off")
+    entries: int = Field(description="저장된 응답 수")
+    max_entries: int = Field(description="최대 항목 수 (초과 시 LRU 삭제)")
+    evictions: int
+    hits: int
+    misses: int
+    hit_rate: float
+    chains: List[LLMCacheChainStats] = Field(description="체인별 hit / miss (프로세스 시작 이후 누적)")
+
+# LLM 토큰 / 지연 시간 집계
+class LLMUsageRow(BaseModel):
+    chain: Optional[str] = Field(default=None, description="체인 이름 (group_by 에 없으면 null)")
+    route: Optional[str] = Field(default=None, description="API 경로 템플릿 또는 백그라운드 작업 이름 ('-': 태그 없음)")
+    document: Optional[str] = Field(default=None, description="문서 UUID ('-': 문서와 무관한 호출)")
+    invocations: int = Field(description="체인 호출 수 (응답 캐시 hit 포함)")
+    cache_hits: int
+    errors: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int = Field(description="프롬프트 중 OpenAI 프롬프트 캐시로 처리된 토큰 수")
+    total_tokens: int
+    retries: int
+    wall_ms: int = Field(description="체인 호출 소요 시간 합계 (대기열 대기 포함)")
+    avg_wall_ms: float
+
+# 체인별 LLM 지연 시간 / 지연 정책 통계
+class ChainLatencyStats(BaseModel):
+    chain: str
+    samples: int = Field(description="백분위 계산에 쓰인 최근 표본 수")
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    timeout_sec: float = Field(description="현재 호출 1건 시간 제한 (관측 p95 기반)")
+    hedge: bool = Field(description="헤지(중복 요청) 적용 체인 여부")
+    hedge_delay_ms: Optional[float] = Field(default=None, description="중복 요청을 보내기까지의 지연")
+    calls: int
+    timeouts: int
+    retries: int
+    hedges: int = Field(description="중복 요청을 보낸 횟수")
+    hedge_wins: int = Field(description="중복 요청이 먼저 응답한 횟수")
+    failures: int
+
+# OpenAI 전역 속도 제한 통계
+class RateLimiterQueueStats(BaseModel):
+    priority: str = Field(description="chat | grading | background")
+    queued: int = Field(description="현재 대기 중인 요청 수")
+    granted: int = Field(description="허가된 요청 수 (누적)")
+    throttled: int = Field(description="바로 허가되지 않고 기다린 요청 수 (누적)")
+    avg_wait_ms: float
+    max_wait_ms: float
+
+class RateLimiterStats(BaseModel):
+    name: str = Field(description="chat | embedding")
+    rpm_limit: int = Field(description="분당 요청 수 한도 (0: 제한 없음)")
+    tpm_limit: int = Field(description="분당 토큰 수 한도 (0: 제한 없음)")
+    max_concurrency: int
+    in_flight: int = Field(description="현재 진행 중인 호출 수")
+    queue_depth: int = Field(description="전체 대기 요청 수")
+    available_requests: Optional[int] = Field(default=None, description="지금 바로 쓸 수 있는 요청 수 (제한 없으면 null)")
+    available_tokens: Optional[int] = Field(default=None, description="지금 바로 쓸 수 있는 토큰 수 (제한 없으면 null)")
+    queues: List[RateLimiterQueueStats] = Field(description="우선순위별 대기열 (높은 우선순위부터)")
+
+# 진행 중 동일 요청 병합(single-flight) 통계
+class SingleFlightStats(BaseModel):
+    name: str = Field(description="병합 그룹 (llm:<체인>, embedding:<모델>, recommend_resources)")
+    calls: int = Field(description="실제로 실행한 호출 수")
+    coalesced: int = Field(description="진행 중인 호출 결과를 함께 받은 요청 수")
+    coalesced_rate: float
+    in_flight: int = Field(description="현재 진행 중인 호출 수")
+
+# 키워드 코퍼스 통계
+class KeywordCorpusStats(BaseModel):
+    path: str = Field(description="SQLite 코퍼스 파일 경로")
+    documents: int = Field(description="통계에 반영된 문서 수 (content_hash 기준)")
+    terms: int = Field(description="문서 빈도가 기록된 키워드 후보 수")
+    average_length: float = Field(description="문서당 평균 후보 단어 수 (BM25 길이 정규화 기준)")
+
+# 추출 텍스트 정리 통계
+class TextCleaningStats(BaseModel):
+    documents: int = Field(description="정리한 문서 수")
+    original_tokens: int = Field(description="정리 전 토큰 수 합계")
+    removed_tokens: int = Field(description="반복 줄 / 페이지 번호 / 빈 페이지 정리로 제거한 토큰 수")
+    removed_ratio: float
+    removed_lines: int
+    emptied_pages: int = Field(description="내용이 거의 없어 비운 페이지 수")
+
+# 실패 / 중단된 수집 기록
+class IngestionCheckpointItem(BaseModel):
+    content_hash: str
+    summary_type: str
+    document_uuid: str
+    filename: str
+    status: str = Field(description="running (중단) | failed")
+    last_stage: Optional[str] = Field(default=None, description="마지막으로 완료된 단계")
+    error: Optional[str] = None
+    checkpoints: List[str] = Field(description="저장된 단계 결과 (summary:<type>, keywords, chunks, embeddings)")
+    resumable: bool = Field(description="원본 파일 없이 재개 가능 여부 (추출 텍스트 저장됨)")
+    created_at: datetime
+    updated_at: datetime
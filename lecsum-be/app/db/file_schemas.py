@@ -1,6 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 # 문서 목록 조회
 class DocumentSummaryItem(BaseModel):
@@ -26,7 +26,51 @@ class DocumentSummaryDetail(BaseModel):
     concept_cnt: int
     keyword_cnt: int
     review_time: int
+    top_sentences: List[str] = []
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 문서 재업로드(버전 갱신) 결과
+class DocumentReingestResult(BaseModel):
+    document: DocumentSummaryDetail
+    version: int
+    added_chunks: int
+    removed_chunks: int
+    unchanged_chunks: int
+    change_ratio: float
+    summary_regenerated: bool
+
+# 스타일별 요약
+class DocumentStyleSummary(BaseModel):
+    document_id: int
+    summary_type: str
+    prompt_version: Optional[str] = Field(default=None, description="요약 생성에 쓰인 프롬프트 버전 (예전 업로드 요약은 null)")
+    summary: str
+    concept_cnt: int
+    review_time: int
+    cached: bool = Field(description="이미 생성되어 있던 요약인지 여부")
+    created_at: datetime
+
+# 저장된 추출 텍스트 (페이지 단위)
+class DocumentPageText(BaseModel):
+    page: int = Field(description="0-based 페이지(슬라이드) 번호")
+    page_label: Optional[str] = None
+    content: str
+
+# 일괄 업로드 파일별 결과
+class BulkUploadItem(BaseModel):
+    filename: str
+    status: str = Field(description="completed | deduplicated | failed")
+    document: Optional[DocumentSummaryDetail] = None
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
+# 일괄 업로드 결과
+class BulkUploadResult(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_ms: int
+    items: List[BulkUploadItem]
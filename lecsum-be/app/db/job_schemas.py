@@ -0,0 +1,27 @@
+# 문서 수집(Ingestion) Job 요청/응답 스키마
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.db.file_schemas import DocumentSummaryDetail
+
+# 단계 진행 이벤트
+class IngestionStageEvent(BaseModel):
+    stage: str = Field(description="완료된 단계 (parsing, summarizing, ... , completed, failed)")
+    status: str = Field(description="이벤트 발생 시점의 Job 상태")
+    elapsed_ms: int = Field(description="Job 시작 후 경과 시간 (ms)")
+    message: Optional[str] = Field(default=None, description="실패 사유 등 부가 메시지")
+    created_at: datetime
+
+# Job 상세 조회
+class IngestionJobDetail(BaseModel):
+    job_id: str
+    filename: str
+    summary_type: str
+    status: str = Field(description="queued | running | completed | failed")
+    stage: Optional[str] = Field(default=None, description="마지막으로 완료된 단계")
+    events: List[IngestionStageEvent] = []
+    result: Optional[DocumentSummaryDetail] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
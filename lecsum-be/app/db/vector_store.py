@@ -9,7 +9,10 @@ from dotenv import load_dotenv
 from chromadb import Client
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
-from openai import OpenAI
+from app.core.embedding_cache import get_embeddings
+from app.core.enums import ModelBackend
+from app.core.model_backend import LLM_BACKEND
+from app.core.embedding_writer import embed_texts_sync, upsert_in_batches
 
 load_dotenv()
 
@@ -23,19 +26,18 @@ class VectorStore:
         embedding_model: str = "text-embedding-3-small"
     ):
         self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        if not self.api_key and LLM_BACKEND == ModelBackend.OPENAI:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env를 확인하세요.")
 
         os.makedirs(persist_dir, exist_ok=True)
         self.client = Client(Settings(persist_directory=persist_dir, is_persistent=True))
         self.collection = self.client.get_or_create_collection(collection_name)
         self.embedding_model = embedding_model
-        self._openai = OpenAI(api_key=self.api_key)
+        self._embeddings = get_embeddings(embedding_model)
 
     def _embed(self, text: str) -> List[float]:
-        """OpenAI 임베딩 생성"""
-        resp = self._openai.embeddings.create(model=self.embedding_model, input=text)
-        return resp.data[0].embedding
+        """OpenAI 임베딩 생성 (임베딩 캐시 경유)"""
+        return self._embeddings.embed_query(text)
 
     def add_documents(self, docs: List[Dict]):
         """
@@ -43,7 +45,7 @@ class VectorStore:
         docs: [{"id": str, "title": str, "text": str, "summary": Optional[str], "file_id": Optional[str]}]
         raw/summary 두 개의 벡터를 저장합니다.
         """
-        ids, embeddings, metadatas, documents = [], [], [], []
+        ids, texts, metadatas = [], [], []
         for doc in docs:
             base_id = str(doc["id"])
             title = doc.get("title", "제목 없음")
@@ -58,19 +60,19 @@ class VectorStore:
 
             # 원본 텍스트
             ids.append(f"{base_id}::raw")
-            embeddings.append(self._embed(text))
             metadatas.append({**base_meta, "kind": "raw"})
-            documents.append(text)
+            texts.append(text)
 
             # 요약 텍스트가 있으면 별도로 저장
             if summary:
                 ids.append(f"{base_id}::summary")
-                embeddings.append(self._embed(summary))
                 metadatas.append({**base_meta, "kind": "summary"})
-                documents.append(summary)
+                texts.append(summary)
 
         if ids:
-            self.collection.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+            # 텍스트마다 요청하지 않고 배치로 임베딩 후 한 번에 upsert
+            embeddings = embed_texts_sync(texts, embeddings=self._embeddings)
+            upsert_in_batches(self.collection, ids=ids, embeddings=embeddings, metadatas=metadatas, documents=texts)
 
     def query(self, query: str, top_k: int = 3, file_id: Optional[str] = None) -> List[Dict]:
         """유사 문서 검색 (file_id 필터 지원)"""
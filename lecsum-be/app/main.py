@@ -3,7 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.db.database import engine, Base
-from app.routers import summarize_router, quiz_router, chatbot_router
+from app.core.usage_accounting import usage_context
+from app.routers import summarize_router, quiz_router, chatbot_router, admin_router
 
 # DB 테이블 생성
 Base.metadata.create_all(bind=engine)
@@ -24,10 +25,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# LLM 사용량 집계에 API 경로 태그 지정 (경로 템플릿은 라우팅 후 scope 에서 읽음)
+@app.middleware("http")
+async def usage_route_middleware(request, call_next):
+    with usage_context(scope=request.scope):
+        return await call_next(request)
+
 # 라우터 등록
 app.include_router(summarize_router.router)
 app.include_router(quiz_router.router)
 app.include_router(chatbot_router.router)
+app.include_router(admin_router.router)
 
 # HTTP 예외 처리
 @app.exception_handler(HTTPException)
@@ -1,6 +1,7 @@
 # 업로드 문서 DB 모델
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
+from sqlalchemy.dialects.mysql import JSON
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -16,6 +17,13 @@ class DocumentFile(Base):
     concept_cnt = Column(Integer, default=0)
     keyword_cnt = Column(Integer, default=0)
     review_time = Column(Integer, default=0)
+    # 업로드 원본 sha256 (중복 업로드 재사용용) / 요약 스타일
+    content_hash = Column(String(64), index=True)
+    summary_type = Column(String(20))
+    # 핵심 문장 (청크 임베딩 기반 로컬 추출, 문서 등장 순서)
+    top_sentences = Column(JSON, nullable=True)
+    # 재업로드(버전 갱신) 횟수 + 1
+    version = Column(Integer, default=1)
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -28,3 +36,33 @@ class DocumentFile(Base):
         back_populates="document",
         cascade="all, delete-orphan"
     )
+
+    # PDF 1 : N 스타일별 요약
+    summaries = relationship(
+        "DocumentSummary",
+        back_populates="document",
+        cascade="all, delete-orphan"
+    )
+
+# 스타일별 요약 캐시 (요청 시 생성, 프롬프트 버전별로 보관)
+class DocumentSummary(Base):
+    __tablename__ = "document_summaries"
+    __table_args__ = (
+        UniqueConstraint("document_id", "summary_type", "prompt_version", name="uq_document_summary_style"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("document_files.id", ondelete="CASCADE"), nullable=False, index=True)
+    summary_type = Column(String(20), nullable=False)
+    prompt_version = Column(String(64), nullable=False)
+    summary = Column(Text, nullable=False)
+    concept_cnt = Column(Integer, default=0)
+    review_time = Column(Integer, default=0)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # N:1
+    document = relationship("DocumentFile", back_populates="summaries")
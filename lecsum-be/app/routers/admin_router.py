@@ -0,0 +1,185 @@
+# 운영(관리자) API - 캐시 / 수집 상태 조회
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.db.schemas import CommonResponse
+from app.db.database import get_db
+from app.db.admin_schemas import (
+    EmbeddingCacheStats,
+    LLMCacheStats,
+    SingleFlightStats,
+    RateLimiterStats,
+    ChainLatencyStats,
+    LLMUsageRow,
+    KeywordCorpusStats,
+    TextCleaningStats,
+    IngestionCheckpointItem,
+)
+from app.db.file_schemas import DocumentSummaryDetail
+from app.core.embedding_cache import get_embedding_cache
+from app.core.llm_cache import get_llm_cache
+from app.core.single_flight import single_flight_stats
+from app.core.rate_limiter import rate_limiter_stats
+from app.core.latency_policy import latency_stats
+from app.core.usage_accounting import get_usage_accounting, GROUP_FIELDS
+from app.core.keyword_extractor import get_keyword_corpus
+from app.core.text_cleaner import get_cleaning_stats
+from app.services import file_service
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"],
+)
+
+@router.get(
+    "/embedding-cache",
+    response_model=CommonResponse[EmbeddingCacheStats],
+    summary="임베딩 캐시 통계 조회",
+    description="(model, sha256(text)) 키 임베딩 캐시의 항목 수와 hit / miss 카운터를 반환합니다. 카운터는 프로세스 시작 이후 누적값입니다.",
+)
+def get_embedding_cache_stats():
+    stats = get_embedding_cache().stats()
+    return CommonResponse(data=EmbeddingCacheStats(**stats))
+
+
+@router.get(
+    "/llm-cache",
+    response_model=CommonResponse[LLMCacheStats],
+    summary="LLM 응답 캐시 통계 조회",
+    description="(모델, temperature, 프롬프트, 출력 스키마) 키 LLM 응답 캐시의 항목 수와 체인별 hit / miss 카운터를 반환합니다. 카운터는 프로세스 시작 이후 누적값입니다.",
+)
+def get_llm_cache_stats():
+    return CommonResponse(data=LLMCacheStats(**get_llm_cache().stats()))
+
+
+@router.delete(
+    "/llm-cache",
+    response_model=CommonResponse[LLMCacheStats],
+    summary="LLM 응답 캐시 비우기",
+    description="프롬프트 / 모델 변경 후 이전 응답을 재사용하지 않도록 저장된 응답을 모두 삭제합니다. (카운터는 유지)",
+)
+def clear_llm_cache():
+    cache = get_llm_cache()
+    cache.clear()
+    return CommonResponse(message="LLM 응답 캐시를 비웠습니다.", data=LLMCacheStats(**cache.stats()))
+
+
+@router.get(
+    "/llm-usage",
+    response_model=CommonResponse[List[LLMUsageRow]],
+    summary="LLM 토큰 / 소요 시간 사용량 조회",
+    description="체인 / API 경로 / 문서별 프롬프트·응답·프롬프트 캐시 토큰, 호출 수, 소요 시간, 재시도 횟수 합계를 토큰이 많은 순으로 반환합니다. group_by 는 chain, route, document 를 쉼표로 조합합니다. (디스크에 저장된 누적값 + 저장 전 메모리 누적분)",
+)
+def get_llm_usage(
+    group_by: str = Query("chain", description="chain, route, document 조합 (예: chain,route)"),
+    chain: Optional[str] = Query(None),
+    route: Optional[str] = Query(None),
+    document: Optional[str] = Query(None, description="문서 UUID"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    fields = [field.strip() for field in group_by.split(",") if field.strip()]
+    invalid = [field for field in fields if field not in GROUP_FIELDS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 group_by 항목입니다: {', '.join(invalid)}")
+    rows = get_usage_accounting().query(fields, chain=chain, route=route, document=document, limit=limit)
+    return CommonResponse(data=[LLMUsageRow(**row) for row in rows])
+
+
+@router.get(
+    "/llm-usage/metrics",
+    response_class=PlainTextResponse,
+    summary="LLM 사용량 Prometheus 메트릭",
+    description="체인 / API 경로별 호출 수, 토큰 수, 재시도, 소요 시간 누적 카운터를 Prometheus 텍스트 형식으로 반환합니다. (문서별 값은 레이블 수 제한을 위해 제외)",
+)
+def get_llm_usage_metrics():
+    return PlainTextResponse(get_usage_accounting().prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get(
+    "/llm-latency",
+    response_model=CommonResponse[List[ChainLatencyStats]],
+    summary="체인별 LLM 지연 시간 조회",
+    description="체인별 최근 호출의 p50 / p95 / p99 지연 시간과 이를 바탕으로 정한 시간 제한, 헤지 지연, 시간 초과 / 재시도 / 헤지 횟수를 반환합니다. (캐시 hit 은 포함되지 않음)",
+)
+def get_llm_latency():
+    return CommonResponse(data=[ChainLatencyStats(**item) for item in latency_stats()])
+
+
+@router.get(
+    "/rate-limits",
+    response_model=CommonResponse[List[RateLimiterStats]],
+    summary="OpenAI 전역 속도 제한 상태 조회",
+    description="채팅 모델 / 임베딩 리미터별 RPM·TPM 잔여량, 진행 중 호출 수, 우선순위(chat > grading > background)별 대기열 깊이와 대기 시간을 반환합니다.",
+)
+def get_rate_limits():
+    return CommonResponse(data=[RateLimiterStats(**item) for item in rate_limiter_stats()])
+
+
+@router.get(
+    "/single-flight",
+    response_model=CommonResponse[List[SingleFlightStats]],
+    summary="동일 요청 병합 통계 조회",
+    description="동시에 들어온 같은 LLM / 임베딩 / 자료 추천 요청을 한 번의 호출로 병합한 횟수를 그룹별로 반환합니다. 카운터는 프로세스 시작 이후 누적값입니다.",
+)
+def get_single_flight_stats():
+    return CommonResponse(data=[SingleFlightStats(**item) for item in single_flight_stats()])
+
+
+@router.get(
+    "/keyword-corpus",
+    response_model=CommonResponse[KeywordCorpusStats],
+    summary="키워드 코퍼스 통계 조회",
+    description="로컬 키워드 추출(BM25)에 쓰이는 업로드 문서 전체의 문서 수 / 후보 수 / 평균 문서 길이를 반환합니다.",
+)
+def get_keyword_corpus_stats():
+    stats = get_keyword_corpus().stats()
+    return CommonResponse(data=KeywordCorpusStats(**stats))
+
+
+@router.get(
+    "/text-cleaning",
+    response_model=CommonResponse[TextCleaningStats],
+    summary="추출 텍스트 정리 통계 조회",
+    description="업로드 파싱 후 머리글 / 바닥글 / 페이지 번호 / 빈 페이지 정리로 요약 / 임베딩 입력에서 제거한 토큰 수를 반환합니다. 카운터는 프로세스 시작 이후 누적값입니다.",
+)
+def get_text_cleaning_stats():
+    return CommonResponse(data=TextCleaningStats(**get_cleaning_stats().snapshot()))
+
+
+@router.get(
+    "/ingestions",
+    response_model=CommonResponse[List[IngestionCheckpointItem]],
+    summary="실패 / 중단된 수집 목록 조회",
+    description="""
+실패했거나 INGESTION_STALE_SEC 이상 진행이 멈춘 수집과, 저장되어 있는 단계 결과(체크포인트)를 반환합니다.
+- resumable=true 인 항목은 원본 파일 없이 재개할 수 있습니다.
+""",
+)
+def list_unfinished_ingestions(limit: int = 100):
+    items = file_service.list_unfinished_ingestions(limit=limit)
+    return CommonResponse(data=items)
+
+
+@router.post(
+    "/ingestions/{content_hash}/resume",
+    response_model=CommonResponse[DocumentSummaryDetail],
+    summary="중단된 수집 재개",
+    description="""
+저장된 추출 텍스트와 체크포인트된 단계(요약 / 키워드 / 청크 / 임베딩)는 다시 계산하지 않고, 남은 단계부터 이어서 처리합니다.
+- 저장된 추출 텍스트가 없으면 409 (파일 재업로드 필요)
+""",
+)
+async def resume_ingestion(
+    content_hash: str,
+    summary_type: str = "lecture",
+    db: Session = Depends(get_db),
+):
+    document = await file_service.resume_ingestion(
+        db=db,
+        content_hash=content_hash,
+        summary_type=summary_type,
+    )
+    return CommonResponse(message="수집을 재개하여 완료했습니다.", data=document)
@@ -1,17 +1,24 @@
 # app/routers/summarize_router.py
 
-from fastapi import UploadFile, File, APIRouter, Depends
+from fastapi import UploadFile, File, APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Optional
 
 from app.db.schemas import CommonResponse
 from app.db.database import get_db
-from app.services import file_service
+from app.services import file_service, ingestion_service, summary_service
 from app.db.file_schemas import (
     DocumentSummaryItem,
     DocumentSummaryDetail,
+    DocumentReingestResult,
+    BulkUploadResult,
+    DocumentPageText,
+    DocumentStyleSummary,
 )
+from app.db.job_schemas import IngestionJobDetail
+from app.core.enums import IngestionProfile
 
 load_dotenv()
 
@@ -28,21 +35,138 @@ router = APIRouter(
 PDF 또는 PPT(PPTX) 파일을 업로드하여 문서를 요약합니다.
 - 요약 스타일은 summary_type으로 제어합니다. 예: lecture | bullet | exam
 - 핵심 문장은 내부 기준 Top-5로 고정됩니다.
+- profile=fast 이면 키워드를 LLM 보정 없이 로컬 추출(BM25) 결과로 저장합니다. (기본값: INGESTION_PROFILE)
 """,
 )
 async def upload_document(
     file: UploadFile = File(...),
     summary_type: str = "lecture",
+    profile: Optional[IngestionProfile] = None,
     db: Session = Depends(get_db),
 ):
     document = await file_service.register_document(
         db=db,
         file=file,
-        summary_type=summary_type
+        summary_type=summary_type,
+        profile=profile,
     )
     return CommonResponse(data=document)
 
 
+@router.post(
+    "/documents/stream",
+    summary="PDF / PPT 업로드 및 요약 스트리밍 (SSE)",
+    description="""
+파일을 업로드하면 바로 요약을 시작하고, 요약 토큰을 생성되는 대로 text/event-stream 으로 전송합니다.
+- summary 이벤트: {"delta": "..."} (요약 텍스트 조각, 이어 붙이면 전체 요약)
+- 단계 이벤트: parsing | chunking | summarizing | keywords | top_sentences | embedding | deduplicated | saving
+- completed 이벤트의 result 에 저장된 문서 상세(DocumentSummaryDetail)가 포함되며, 이후 스트림이 종료됩니다.
+- 실패 시 failed 이벤트(message 에 사유)를 보내고 종료합니다.
+- 연결이 끊겨도 나머지 단계는 백그라운드에서 끝까지 처리됩니다. (GET /api/uploads/jobs/{job_id})
+- 동시에 처리 중인 스트리밍 업로드가 한도(INGESTION_STREAM_MAX_JOBS)에 도달한 경우 503을 반환합니다.
+""",
+)
+async def upload_document_stream(
+    file: UploadFile = File(...),
+    summary_type: str = "lecture",
+    profile: Optional[IngestionProfile] = None,
+):
+    events = await ingestion_service.start_streaming_job(
+        file=file,
+        summary_type=summary_type,
+        profile=profile,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/documents/bulk",
+    response_model=CommonResponse[BulkUploadResult],
+    summary="PDF / PPT 여러 개 또는 ZIP 일괄 업로드",
+    description="""
+여러 PDF / PPTX 파일 또는 ZIP 압축 파일을 한 번에 업로드하여 모두 요약합니다.
+- ZIP 안의 PDF / PPTX 만 처리하며, 그 외 형식은 파일별 실패로 기록됩니다.
+- 파싱 / LLM / 임베딩 단계는 각각 동시 실행 한도(PARSE_CONCURRENCY, LLM_CONCURRENCY, EMBEDDING_DOC_CONCURRENCY)를 두고 파일 간에 겹쳐서 진행됩니다.
+- 일부 파일이 실패해도 나머지는 계속 처리하며, 파일별 결과(completed | deduplicated | failed)를 반환합니다.
+- 파일 수(BULK_MAX_FILES)와 ZIP 압축 해제 크기 합계(MAX_ZIP_EXTRACT_MB)는 저장 / 압축 해제 전에 검사합니다.
+""",
+)
+async def upload_documents_bulk(
+    files: List[UploadFile] = File(...),
+    summary_type: str = "lecture",
+    profile: Optional[IngestionProfile] = None,
+):
+    result = await ingestion_service.ingest_bulk(
+        files=files,
+        summary_type=summary_type,
+        profile=profile,
+    )
+    return CommonResponse(
+        message=f"{result.total}개 중 {result.succeeded}개 문서를 처리했습니다.",
+        data=result,
+    )
+
+
+@router.post(
+    "/documents/jobs",
+    status_code=202,
+    response_model=CommonResponse[IngestionJobDetail],
+    summary="PDF / PPT 업로드 (비동기 수집 Job)",
+    description="""
+파일을 저장한 뒤 즉시 job_id를 반환하고, 요약/키워드/임베딩은 백그라운드 워커가 처리합니다.
+- 진행 상황: GET /api/uploads/jobs/{job_id}
+- 단계별 이벤트 스트림(SSE): GET /api/uploads/jobs/{job_id}/events
+- 대기열이 가득 찬 경우 503을 반환합니다.
+""",
+)
+async def upload_document_job(
+    file: UploadFile = File(...),
+    summary_type: str = "lecture",
+    profile: Optional[IngestionProfile] = None,
+):
+    job = await ingestion_service.submit_job(
+        file=file,
+        summary_type=summary_type,
+        profile=profile,
+    )
+    return CommonResponse(message="문서 처리 작업이 등록되었습니다.", data=job)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=CommonResponse[IngestionJobDetail],
+    summary="수집 Job 상태 조회",
+)
+def get_upload_job(job_id: str):
+    job = ingestion_service.get_job_detail(job_id)
+    return CommonResponse(data=job)
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="수집 Job 단계별 진행 이벤트 (SSE)",
+    description="""
+text/event-stream 으로 단계가 끝날 때마다 이벤트를 전송합니다.
+- event 이름: parsing | chunking | summarizing | keywords | top_sentences | embedding | deduplicated | saving | completed | failed
+- 요약 토큰은 생성되는 대로 summary 이벤트({"delta": ...})로 전송되며, completed 이벤트에는 result(문서 상세)가 포함됩니다.
+- summarizing / keywords / embedding 은 동시에 실행되어 완료 순서가 달라질 수 있습니다.
+- top_sentences 는 embedding 직후 청크 임베딩으로 로컬 계산합니다 (LLM 호출 없음).
+- completed / failed 이벤트 후 스트림이 종료됩니다.
+""",
+)
+def stream_upload_job_events(job_id: str):
+    events = ingestion_service.stream_job_events(job_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/documents",
     response_model=CommonResponse[List[DocumentSummaryItem]],
@@ -74,4 +198,77 @@ def get_document_detail(
         db=db,
         document_id=id,
     )
-    return CommonResponse(data=document)
\ No newline at end of file
+    return CommonResponse(data=document)
+
+
+@router.get(
+    "/documents/{id}/summary",
+    response_model=CommonResponse[DocumentStyleSummary],
+    summary="스타일별 요약 조회 (없으면 생성)",
+    description="""
+업로드 시 선택한 스타일 외의 요약(lecture | bullet | exam)을 재업로드 없이 조회합니다.
+- 처음 요청된 스타일은 저장된 추출 텍스트로 생성한 뒤 (스타일, 프롬프트 버전) 단위로 저장합니다.
+- 같은 문서 / 스타일을 동시에 요청하면 LLM 호출 한 번의 결과를 함께 받습니다.
+""",
+)
+async def get_document_summary(
+    id: int,
+    summary_type: str = Query("lecture", alias="type"),
+    db: Session = Depends(get_db),
+):
+    summary = await summary_service.get_style_summary(
+        db=db,
+        document_id=id,
+        summary_type=summary_type,
+    )
+    return CommonResponse(data=summary)
+
+
+@router.get(
+    "/documents/{id}/pages",
+    response_model=CommonResponse[List[DocumentPageText]],
+    summary="문서 추출 텍스트 페이지 범위 조회",
+    description="""
+업로드 시 저장한 추출 텍스트에서 [start, end) 페이지만 반환합니다. (0-based, end 생략 시 마지막 페이지까지)
+- 원본 파일을 다시 파싱하지 않습니다.
+""",
+)
+async def get_document_pages(
+    id: int,
+    start: int = 0,
+    end: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    pages = await file_service.load_document_pages(
+        db=db,
+        document_id=id,
+        start=start,
+        end=end,
+    )
+    return CommonResponse(data=pages)
+
+
+@router.put(
+    "/documents/{id}",
+    response_model=CommonResponse[DocumentReingestResult],
+    summary="수정된 강의 자료 재업로드 (버전 갱신)",
+    description="""
+기존 문서에 수정된 PDF / PPTX 를 다시 올려 새 버전으로 갱신합니다.
+- 바뀐 청크만 임베딩하고, 사라진 청크는 VectorDB에서 삭제합니다.
+- 청크 변경 비율이 임계값(REINGEST_SUMMARY_THRESHOLD)을 넘거나 summary_type 이 바뀐 경우에만 요약 / 키워드를 다시 생성합니다.
+- summary_type 을 생략하면 기존 스타일을 유지합니다.
+""",
+)
+async def reupload_document(
+    id: int,
+    file: UploadFile = File(...),
+    summary_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    result = await file_service.reingest_document(
+        db=db,
+        document_id=id,
+        file=file,
+        summary_type=summary_type,
+    )
+    return CommonResponse(message="문서가 갱신되었습니다.", data=result)
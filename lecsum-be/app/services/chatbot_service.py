@@ -1,6 +1,7 @@
 # 챗봇 응답, 자료 추천 로직
 from typing import List, Dict, Optional, Any
 import os
+import asyncio
 import requests
 import json
 from fastapi import HTTPException
@@ -8,31 +9,31 @@ from sqlalchemy.orm import Session
 
 from app.db.mentor_schemas import ChatRequest, ChatResponse, RecommendRequest, RecommendResponse
 from app.db.vector_store import get_vector_store
-from app.core.llm_client import chatbot_llm, chatOpenAI
+from app.core.llm_client import chatbot_llm, recommend_llm
 from app.core.prompt_templates.chatbot_prompt import (
     get_chatbot_system_prompt,
     get_recommendation_system_prompt,
     build_recommendation_prompt
 )
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from app.core.enums import ChromaDB, CHROMA_PERSIST_DIR
+from app.core.single_flight import get_single_flight
+from app.core.rate_limiter import prioritized
+from app.core.usage_accounting import tag_usage
+from app.core.enums import LLMPriority
 from app.crud import file_crud
+from app.services import vector_service
 
+# 같은 문서의 자료 추천이 동시에 몰리면 웹 검색 + LLM 호출을 한 번만 수행
+_recommend_flight = get_single_flight("recommend_resources")
+
+@prioritized(LLMPriority.CHAT)
 async def chat_with_documents(request: ChatRequest, db: Session) -> ChatResponse:
     """
     벡터 DB 기반 Q&A 챗봇 (Chroma 사용)
     - Chroma에서 질문과 유사한 문서 검색 (document_uuid 필터 적용)
     - 대화 히스토리 포함하여 자연스러운 답변 생성
     """
-    # Chroma 벡터 스토어 초기화
-    vectorstore = Chroma(
-        collection_name=ChromaDB.COLLECTION_NAME.value,
-        embedding_function=OpenAIEmbeddings(
-            model="text-embedding-3-small"
-        ),
-        persist_directory=CHROMA_PERSIST_DIR,
-    )
+    # Chroma 벡터 스토어 (질문 임베딩은 임베딩 캐시를 거침)
+    vectorstore = vector_service.get_vectorstore()
     
     # 1. 벡터 검색 (document_id로 uuid 조회 후 필터)
     if request.document_id:
@@ -43,15 +44,16 @@ async def chat_with_documents(request: ChatRequest, db: Session) -> ChatResponse
                 status_code=404,
                 detail="문서를 찾을 수 없습니다."
             )
+        tag_usage(document=document.uuid)
         # 특정 문서로 필터링 (UUID 사용)
-        vec_results = vectorstore.similarity_search(
+        vec_results = await vectorstore.asimilarity_search(
             request.question,
             k=5,
             filter={"document_uuid": document.uuid}
         )
     else:
         # 전체 문서 검색
-        vec_results = vectorstore.similarity_search(request.question, k=5)
+        vec_results = await vectorstore.asimilarity_search(request.question, k=5)
     
     if not vec_results:
         raise HTTPException(
@@ -79,13 +81,14 @@ async def chat_with_documents(request: ChatRequest, db: Session) -> ChatResponse
     messages.append({"role": "user", "content": request.question})
     
     # 5. LLM 호출
-    response = chatbot_llm.invoke(messages)
+    response = await chatbot_llm.ainvoke(messages)
     
     return ChatResponse(
         answer=response.content,
         sources=[]  # 출처 정보 제외
     )
 
+@prioritized(LLMPriority.CHAT)
 async def recommend_resources(request: RecommendRequest, db: Session) -> RecommendResponse:
     """
     MySQL 키워드 + 웹 검색 기반 자료 추천
@@ -101,23 +104,28 @@ async def recommend_resources(request: RecommendRequest, db: Session) -> Recomme
             status_code=404,
             detail="문서를 찾을 수 없습니다."
         )
+    tag_usage(document=document.uuid)
     
     # 2. MySQL에서 저장된 키워드 사용
     keywords = document.keywords if document.keywords else "학습 자료"
-    
-    # 3. Chroma에서 문서 내용 샘플링 (컨텍스트용)
-    vectorstore = Chroma(
-        collection_name=ChromaDB.COLLECTION_NAME.value,
-        embedding_function=OpenAIEmbeddings(
-            model="text-embedding-3-small"
-        ),
-        persist_directory=CHROMA_PERSIST_DIR,
+
+    # 같은 문서 / 키워드 요청이 진행 중이면 그 결과를 함께 사용 (결과는 요청마다 복사)
+    result = await _recommend_flight.run(
+        f"{document.uuid}:{keywords}",
+        lambda: _build_recommendations(document.uuid, document.summary, keywords),
     )
+    return result.model_copy(deep=True)
+
+
+async def _build_recommendations(document_uuid: str, summary: Optional[str], keywords: str) -> RecommendResponse:
+    """문서 내용 샘플 + 웹 검색 결과로 구조화된 추천 생성"""
+    # 3. Chroma에서 문서 내용 샘플링 (컨텍스트용)
+    vectorstore = vector_service.get_vectorstore()
     
-    vec_results = vectorstore.similarity_search(
+    vec_results = await vectorstore.asimilarity_search(
         "핵심 개념 주요 내용",
         k=3,
-        filter={"document_uuid": document.uuid}
+        filter={"document_uuid": document_uuid}
     )
     
     context_text = ""
@@ -128,10 +136,10 @@ async def recommend_resources(request: RecommendRequest, db: Session) -> Recomme
         ])
     else:
         # 벡터 DB에 없으면 요약본 사용
-        context_text = document.summary[:2000] if document.summary else ""
+        context_text = summary[:2000] if summary else ""
     
-    # 4. 웹 검색 (추출된 키워드 사용)
-    search_results = _search_web(keywords)
+    # 4. 웹 검색 (추출된 키워드 사용, 동기 HTTP 호출이므로 스레드에서 실행)
+    search_results = await asyncio.to_thread(_search_web, keywords)
     
     # 5. 프롬프트 구성
     topic_instruction = f"'{keywords}' 관련 학습 자료를 추천해주세요."
@@ -146,8 +154,7 @@ async def recommend_resources(request: RecommendRequest, db: Session) -> Recomme
     user_prompt = build_recommendation_prompt(context_text, web_context, topic_instruction)
     
     # 6. LLM 호출 (구조화된 출력)
-    structured_llm = chatOpenAI.with_structured_output(RecommendResponse)
-    result = structured_llm.invoke([
+    result = await recommend_llm.ainvoke([
         {"role": "system", "content": get_recommendation_system_prompt()},
         {"role": "user", "content": user_prompt}
     ])
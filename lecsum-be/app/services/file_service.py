@@ -1,163 +1,1119 @@
 # PDF / PPT 처리 로직
 import os
-import shutil
 import uuid
+import asyncio
+import hashlib
+import tempfile
+import weakref
+import zipfile
+from datetime import datetime
+from dotenv import load_dotenv
+from typing import Any, Awaitable, Callable
 
 from fastapi import UploadFile, HTTPException
 from sqlalchemy.orm import Session
-
-# LangChain
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
 
+from app.core.llm_client import (
+    summarize_document,
+    astream_summary,
+    keyword_chain,
+    StreamingSummaryContext,
+)
+from app.core.tokenizer import count_tokens, truncate_to_tokens
+from app.core.prompt_templates.summary_prompt import SUMMARY_TYPES, get_summary_prompt_version
+from app.core.chunker import get_chunker
+from app.core.extractive import rank_top_sentences, SentencePool
+from app.core.keyword_extractor import extract_keywords, rank_keywords, CandidateCounter
+from app.core.text_store import get_text_store
+from app.core.text_cleaner import clean_pages, StreamingCleaner
+from app.core.streaming_pipeline import run_streaming_ingestion, iter_stored_pages
+from app.core.ingestion_checkpoint import (
+    get_checkpoint_store,
+    summary_checkpoint,
+    CHECKPOINT_KEYWORDS,
+    CHECKPOINT_CHUNKS,
+    CHECKPOINT_EMBEDDINGS,
+)
+from app.core.document_parser import (
+    parse_document,
+    iter_document_pages,
+    count_pages,
+    is_supported,
+    PARSER_WORKERS,
+)
+
+from app.crud import file_crud
+from app.core.enums import IngestionStage, IngestionProfile, ChromaDB
+from app.core.usage_accounting import usage_context, tag_usage
+from app.services import vector_service
+from app.db.file_schemas import (
+    DocumentSummaryItem,
+    DocumentSummaryDetail,
+    DocumentReingestResult,
+    DocumentPageText,
+)
+from app.db.admin_schemas import IngestionCheckpointItem
 
-from app.core.llm_client import summary_chain, keyword_chain, top_sentence_chain
+# 단계 완료 시 호출되는 콜백 (stage 이름 -> awaitable)
+StageCallback = Callable[[str], Awaitable[None]]
+# 요약 토큰이 생성될 때마다 호출되는 콜백 (delta 텍스트 -> awaitable)
+SummaryCallback = Callable[[str], Awaitable[None]]
 
-from pptx import Presentation
+load_dotenv()
 
-from app.crud import file_crud
-from app.core.enums import ChromaDB, CHROMA_PERSIST_DIR
-from app.db.file_schemas import (DocumentSummaryItem, DocumentSummaryDetail)
+# 업로드 스트리밍 단위 (해시 계산과 파일 저장을 함께 수행)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# 업로드 최대 크기 (MB)
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", "100"))
+# 업로드 임시 파일 디렉터리 (미설정 시 OS 임시 디렉터리)
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None
+
+# 기본 수집 프로필 (standard: 로컬 키워드 후보 + LLM 보정, fast: 로컬 추출만)
+INGESTION_PROFILE = os.getenv("INGESTION_PROFILE", IngestionProfile.STANDARD.value)
+
+# 문서별로 저장하는 키워드 수 / LLM 보정에 넘기는 로컬 후보 수
+KEYWORD_TOP_K = int(os.getenv("KEYWORD_TOP_K", "10"))
+KEYWORD_CANDIDATES = int(os.getenv("KEYWORD_CANDIDATES", "30"))
+# 키워드 보정 호출의 본문 토큰 상한 (후보가 문서 전체를 대표하므로 앞부분만 참고용으로 전달)
+KEYWORD_CONTEXT_TOKENS = int(os.getenv("KEYWORD_CONTEXT_TOKENS", "3000"))
+
+# 문서별로 저장하는 핵심 문장 수
+TOP_SENTENCES_K = int(os.getenv("TOP_SENTENCES_K", "5"))
+
+# 페이지 수가 이 값 이상이면 스트리밍 수집 (페이지 / 청크 / 임베딩을 문서 전체로 메모리에 올리지 않음)
+STREAMING_INGEST_MIN_PAGES = int(os.getenv("STREAMING_INGEST_MIN_PAGES", "300"))
 
-def extract_text_from_pptx(file_path: str) -> str:
-    """PPTX 파일에서 텍스트 추출"""
-    prs = Presentation(file_path)
-    texts: list[str] = []
+# 재업로드 시 청크 변경 비율이 이 값을 넘으면 요약 / 키워드 재생성
+REINGEST_SUMMARY_THRESHOLD = float(os.getenv("REINGEST_SUMMARY_THRESHOLD", "0.2"))
 
-    for slide in prs.slides:
-        for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                texts.append(shape.text)
+# ZIP 일괄 업로드 최대 크기 (MB, 압축 파일 자체 기준)
+MAX_ZIP_UPLOAD_MB = int(os.getenv("MAX_ZIP_UPLOAD_MB", "1024"))
+# ZIP 안의 PDF / PPTX 압축 해제 크기 합계 상한 (MB, 추출 전에 항목 헤더 기준으로 검사)
+MAX_ZIP_EXTRACT_MB = int(os.getenv("MAX_ZIP_EXTRACT_MB", "2048"))
 
-    return "\n".join(texts)
+# 단계별 동시 실행 한도
+# 여러 문서가 동시에 수집될 때(일괄 업로드, Job 워커) 자원별로 따로 제한하여
+# 한 문서가 LLM 응답을 기다리는 동안 다른 문서의 파싱 / 임베딩이 진행되도록 한다.
+PARSE_CONCURRENCY = int(os.getenv("PARSE_CONCURRENCY", str(PARSER_WORKERS)))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+EMBEDDING_DOC_CONCURRENCY = int(os.getenv("EMBEDDING_DOC_CONCURRENCY", "2"))
+
+_parse_semaphore = asyncio.Semaphore(PARSE_CONCURRENCY)
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+_embedding_semaphore = asyncio.Semaphore(EMBEDDING_DOC_CONCURRENCY)
+
+# 동일 내용 문서의 동시 수집 방지용 잠금 (content_hash -> Lock)
+_content_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+# 같은 문서의 동시 재업로드 방지용 잠금 (document.id -> Lock)
+_document_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def validate_summary_type(summary_type: str):
+    """지원하지 않는 요약 스타일이면 400 (업로드 저장 / 파이프라인 실행 전에 호출)"""
+    if summary_type not in SUMMARY_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 요약 스타일입니다. ({' | '.join(SUMMARY_TYPES)})"
+        )
+
+def _too_large(max_mb: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"파일 크기가 너무 큽니다. (최대 {max_mb}MB)"
+    )
 
-async def register_document(db: Session, file: UploadFile, summary_type: str):
+async def _save_to_temp(file: UploadFile, suffix: str, max_mb: int) -> tuple[str, str]:
+    """업로드 스트림을 고유 임시 파일로 저장하면서 sha256 계산 (max_mb 초과 시 413)"""
+    max_bytes = max_mb * 1024 * 1024
+    fd, temp_file_path = tempfile.mkstemp(prefix="lecsum_", suffix=suffix, dir=UPLOAD_TMP_DIR)
+
+    hasher = hashlib.sha256()
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _too_large(max_mb)
+                hasher.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        remove_temp_file(temp_file_path)
+        raise
+
+    return temp_file_path, hasher.hexdigest()
+
+async def save_upload_file(file: UploadFile) -> tuple[str, str]:
     """
-    PDF / PPT 업로드 → 요약 생성 → VectorDB 저장 → MySQL 저장
+    업로드 파일을 요청별 고유 임시 파일로 스트리밍 저장하면서 내용 해시(sha256)를 계산
+    - 같은 파일명이 동시에 올라와도 서로 덮어쓰지 않음
+    - MAX_UPLOAD_MB 초과 시 413
     Returns:
-        dict: {"id": 문서 ID, "summary": 요약}
+        (임시 파일 경로, content_hash)
     """
-    file_uuid = str(uuid.uuid4())
-    filename_lower = file.filename.lower()
-    temp_file_path = f"temp_{file.filename}"
+    if not is_supported(file.filename or ""):
+        raise HTTPException(
+            status_code=400,
+            detail="지원하지 않는 파일 형식입니다. (PDF / PPTX만 가능)"
+        )
 
+    suffix = os.path.splitext(file.filename)[1].lower()
+    return await _save_to_temp(file, suffix, MAX_UPLOAD_MB)
+
+def is_zip_upload(file: UploadFile) -> bool:
+    return (file.filename or "").lower().endswith(".zip")
+
+def _extract_zip_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> tuple[str, str]:
+    """ZIP 항목 하나를 임시 파일로 풀면서 sha256 계산 (실제 압축 해제 크기로 상한 검사)"""
+    max_bytes = MAX_UPLOAD_MB * 1024 * 1024
+    suffix = os.path.splitext(info.filename)[1].lower()
+    fd, temp_file_path = tempfile.mkstemp(prefix="lecsum_", suffix=suffix, dir=UPLOAD_TMP_DIR)
+
+    hasher = hashlib.sha256()
+    written = 0
     try:
-        # 임시 파일 저장
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        with os.fdopen(fd, "wb") as buffer, archive.open(info) as source:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _too_large(MAX_UPLOAD_MB)
+                hasher.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        remove_temp_file(temp_file_path)
+        raise
+
+    return temp_file_path, hasher.hexdigest()
 
-        # 파일 유형별 텍스트 로드
-        if filename_lower.endswith(".pdf"):
-            loader = PyPDFLoader(temp_file_path)
-            docs = loader.load()
+def _too_many_files(max_files: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"한 번에 업로드할 수 있는 파일 수를 초과했습니다. (최대 {max_files}개)"
+    )
+
+def _check_zip_limits(entries: list[tuple[str, zipfile.ZipInfo | None]], max_files: int):
+    """
+    추출 전에 PDF / PPTX 항목 수와 압축 해제 크기 합계 검사 (초과 시 413)
+    - file_size 는 항목 헤더 값이지만 zipfile 은 그 크기까지만 읽어 주므로 실제 추출량의 상한이 됨
+    - 항목 하나가 MAX_UPLOAD_MB 를 넘는 경우는 합계에서 빼고 해당 항목만 실패 처리
+    """
+    max_member_bytes = MAX_UPLOAD_MB * 1024 * 1024
+    members = [info for _, info in entries if info is not None]
+    if len(members) > max_files:
+        raise _too_many_files(max_files)
+    total = sum(info.file_size for info in members if info.file_size <= max_member_bytes)
+    if total > MAX_ZIP_EXTRACT_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=413,
+            detail=f"ZIP 안의 파일 크기 합계가 너무 큽니다. (최대 {MAX_ZIP_EXTRACT_MB}MB)"
+        )
 
-        elif filename_lower.endswith(".pptx"):
-            text = extract_text_from_pptx(temp_file_path)
-            docs = [Document(page_content=text, metadata={})]
+def _extract_zip(zip_path: str, max_files: int) -> list[tuple[str, str | None, str | None, str | None]]:
+    """
+    ZIP 안의 PDF / PPTX 를 각각 임시 파일로 추출 (동기)
+    - PDF / PPTX 항목이 max_files 개를 넘거나 압축 해제 크기 합계가 MAX_ZIP_EXTRACT_MB 를 넘으면
+      아무것도 풀지 않고 413
+    Returns:
+        [(파일명, 임시 파일 경로, content_hash, 오류 메시지)] (오류가 있으면 경로/해시는 None)
+    """
+    max_member_bytes = MAX_UPLOAD_MB * 1024 * 1024
+    results = []
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            # (파일명, 추출할 항목) — 지원하지 않는 형식이면 항목 None
+            entries: list[tuple[str, zipfile.ZipInfo | None]] = []
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                # 디렉터리 / macOS 메타데이터 / 숨김 파일 제외
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                entries.append((name, info if is_supported(name) else None))
+            _check_zip_limits(entries, max_files)
 
-        else:
+            for name, info in entries:
+                if info is None:
+                    results.append((name, None, None, "지원하지 않는 파일 형식입니다. (PDF / PPTX만 가능)"))
+                    continue
+                if info.file_size > max_member_bytes:
+                    results.append((name, None, None, str(_too_large(MAX_UPLOAD_MB).detail)))
+                    continue
+                try:
+                    temp_file_path, content_hash = _extract_zip_member(archive, info)
+                    results.append((name, temp_file_path, content_hash, None))
+                except HTTPException as e:
+                    results.append((name, None, None, str(e.detail)))
+    except BaseException as e:
+        # 이미 추출한 임시 파일 정리
+        for _, temp_file_path, _, _ in results:
+            if temp_file_path:
+                remove_temp_file(temp_file_path)
+        if isinstance(e, zipfile.BadZipFile):
             raise HTTPException(
                 status_code=400,
-                detail="지원하지 않는 파일 형식입니다. (PDF / PPTX만 가능)"
+                detail="손상되었거나 올바르지 않은 ZIP 파일입니다."
             )
+        raise
+    return results
 
-        full_text = "\n".join(doc.page_content for doc in docs)
+async def save_zip_upload(file: UploadFile, max_files: int) -> list[tuple[str, str | None, str | None, str | None]]:
+    """
+    ZIP 업로드를 임시 저장 후 PDF / PPTX 항목을 개별 임시 파일로 추출
+    - 압축 파일 자체는 MAX_ZIP_UPLOAD_MB, 각 항목은 MAX_UPLOAD_MB,
+      PDF / PPTX 항목 수는 max_files, 압축 해제 크기 합계는 MAX_ZIP_EXTRACT_MB 상한 적용 (추출 전 검사)
+    - 지원하지 않는 형식 / 크기 초과 항목은 오류 메시지와 함께 반환 (나머지는 계속 처리)
+    """
+    zip_path, _ = await _save_to_temp(file, ".zip", MAX_ZIP_UPLOAD_MB)
+    try:
+        return await asyncio.to_thread(_extract_zip, zip_path, max_files)
+    finally:
+        remove_temp_file(zip_path)
 
-        # 요약 생성
-        summary_result = summary_chain.invoke({
-            "context": full_text,
-            "summary_type": summary_type
-        })
+def remove_temp_file(temp_file_path: str):
+    """임시 파일 삭제"""
+    if os.path.exists(temp_file_path):
+        os.remove(temp_file_path)
+
+async def _notify_stage(on_stage: StageCallback | None, stage: IngestionStage):
+    """단계 완료 콜백 호출 (Job 모드의 진행 상황 이벤트용)"""
+    if on_stage is not None:
+        await on_stage(stage.value)
+
+async def _run_stage(
+    coro: Awaitable,
+    on_stage: StageCallback | None,
+    stage: IngestionStage,
+    semaphore: asyncio.Semaphore | None = None,
+):
+    """단계 코루틴 실행 후 완료 이벤트 발행 (semaphore 가 있으면 해당 자원 한도 안에서 실행)"""
+    if semaphore is None:
+        result = await coro
+    else:
+        async with semaphore:
+            result = await coro
+    await _notify_stage(on_stage, stage)
+    return result
 
-        summary = (
-            summary_result.content
-            if hasattr(summary_result, "content")
-            else str(summary_result)
+async def _summarize(texts: list[str], summary_type: str, on_summary: SummaryCallback | None) -> str:
+    """요약 생성 (on_summary 가 있으면 스트리밍으로 생성하며 토큰마다 콜백 호출)"""
+    if on_summary is None:
+        return await summarize_document(texts, summary_type)
+
+    parts: list[str] = []
+    async for delta in astream_summary(texts, summary_type):
+        parts.append(delta)
+        await on_summary(delta)
+    return "".join(parts)
+
+def llm_slot() -> asyncio.Semaphore:
+    """LLM 동시 호출 한도 (수집 외의 요약 생성 등에서도 공유)"""
+    return _llm_semaphore
+
+async def _parse(file_path: str, filename: str) -> list:
+    """파싱 단계 (PARSE_CONCURRENCY 한도) + 머리글 / 바닥글 / 빈 페이지 정리"""
+    async with _parse_semaphore:
+        docs = await parse_document(file_path, filename)
+    docs, _ = await asyncio.to_thread(clean_pages, docs)
+    return docs
+
+async def register_document(db: Session, file: UploadFile, summary_type: str, profile: str | None = None):
+    """
+    PDF / PPT 업로드 → 요약 생성 → VectorDB 저장 → MySQL 저장
+    Returns:
+        DocumentSummaryDetail
+    """
+    validate_summary_type(summary_type)
+    temp_file_path, content_hash = await save_upload_file(file)
+
+    try:
+        return await ingest_document(
+            db=db,
+            file_path=temp_file_path,
+            filename=file.filename,
+            summary_type=summary_type,
+            content_hash=content_hash,
+            profile=profile,
         )
+    finally:
+        remove_temp_file(temp_file_path)
 
-        keyword_result = keyword_chain.invoke({"context": full_text})
+async def ingest_document(
+    db: Session,
+    file_path: str | None,
+    filename: str,
+    summary_type: str,
+    on_stage: StageCallback | None = None,
+    content_hash: str | None = None,
+    on_summary: SummaryCallback | None = None,
+    profile: str | None = None,
+):
+    """
+    저장된 파일에 대해 수집 파이프라인을 실행한다.
+    content_hash 가 같은 문서가 이미 있으면 결과를 재사용한다.
+    - 같은 summary_type: 기존 문서를 그대로 반환 (LLM / 임베딩 호출 없음)
+    - 다른 summary_type: 요약만 새로 생성, 키워드와 청크 임베딩은 복사
+    on_stage: 각 단계가 끝날 때마다 단계 이름으로 호출되는 비동기 콜백
+    on_summary: 요약 토큰을 생성되는 대로 받는 비동기 콜백 (스트리밍 업로드용)
+    file_path 가 None 이면 저장된 추출 텍스트로만 진행 (중단된 수집 재개)
+    profile: fast 이면 키워드를 LLM 보정 없이 로컬 추출 결과로 확정 (기본값 INGESTION_PROFILE)
+    """
+    validate_summary_type(summary_type)
+    profile = profile or INGESTION_PROFILE
+    if content_hash is None:
+        file_uuid = str(uuid.uuid4())
+        with usage_context(document=file_uuid):
+            return await _run_pipeline(
+                db, file_path, filename, summary_type, on_stage, file_uuid,
+                on_summary=on_summary, profile=profile,
+            )
+
+    lock = _content_locks.get(content_hash)
+    if lock is None:
+        lock = asyncio.Lock()
+        _content_locks[content_hash] = lock
+
+    # 동일 파일이 동시에 올라오면 뒤 요청은 앞 요청 결과를 재사용
+    async with lock:
+        existing = file_crud.get_document_by_hash(db, content_hash, summary_type)
+        if existing:
+            if on_summary is not None and existing.summary:
+                await on_summary(existing.summary)
+            await _notify_stage(on_stage, IngestionStage.DEDUPLICATED)
+            return _to_summary_detail(existing)
+
+        # 단계 결과를 content_hash 기준으로 체크포인트하며 실행
+        # (이전에 실패한 같은 수집이 있으면 그때의 document_uuid 와 단계 결과를 이어서 사용)
+        store = get_checkpoint_store()
+        file_uuid = await asyncio.to_thread(
+            store.start, content_hash, summary_type, filename, str(uuid.uuid4())
+        )
+        on_stage = _tracking_stage_callback(on_stage, content_hash, summary_type)
+
+        try:
+            source = file_crud.get_document_by_hash(db, content_hash)
+            with usage_context(document=file_uuid):
+                if source:
+                    result = await _fork_document(
+                        db, source, file_path, filename, summary_type, on_stage, content_hash, file_uuid, on_summary
+                    )
+                else:
+                    result = await _run_pipeline(
+                        db, file_path, filename, summary_type, on_stage, file_uuid, content_hash, on_summary, profile
+                    )
+        except Exception as e:
+            await asyncio.to_thread(store.mark_failed, content_hash, summary_type, str(e) or type(e).__name__)
+            raise
+
+        await asyncio.to_thread(store.mark_completed, content_hash, summary_type)
+        await asyncio.to_thread(store.clear, content_hash)
+        return result
+
+def _tracking_stage_callback(
+    on_stage: StageCallback | None,
+    content_hash: str,
+    summary_type: str,
+) -> StageCallback:
+    """단계 완료 시 수집 기록의 last_stage 도 갱신하는 콜백"""
+    store = get_checkpoint_store()
+
+    async def _on_stage(stage: str):
+        await asyncio.to_thread(store.mark_stage, content_hash, summary_type, stage)
+        if on_stage is not None:
+            await on_stage(stage)
+
+    return _on_stage
+
+def _dump_documents(docs: list) -> list[dict]:
+    return [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs]
+
+def _load_documents(items: list[dict]) -> list:
+    return [Document(page_content=item["page_content"], metadata=item["metadata"]) for item in items]
+
+async def _checkpointed(
+    content_hash: str | None,
+    stage: str,
+    compute: Callable[[], Awaitable[Any]],
+    vectors: bool = False,
+) -> Any:
+    """
+    단계 결과 체크포인트가 있으면 재사용, 없으면 계산 후 저장
+    (content_hash 가 없으면 그대로 계산)
+    """
+    if content_hash is None:
+        return await compute()
 
-        # 키워드 결과 정규화 (LLM 출력 형태 다양성 대응)
-        if hasattr(keyword_result, "content"):
-            raw_keywords = keyword_result.content
-        else:
-            raw_keywords = str(keyword_result)
+    store = get_checkpoint_store()
+    load, save = (store.get_vectors, store.put_vectors) if vectors else (store.get_json, store.put_json)
+    cached = await asyncio.to_thread(load, content_hash, stage)
+    if cached is not None:
+        return cached
 
-        # 문자열 → 리스트 변환 (쉼표/줄바꿈 기준)
-        keywords = [
-            k.strip()
-            for k in raw_keywords.replace("\n", ",").split(",")
-            if k.strip()
-        ]
+    value = await compute()
+    await asyncio.to_thread(save, content_hash, stage, value)
+    return value
 
-        top_sentences = top_sentence_chain.invoke({
-            "context": full_text,
-            "k": 5
+def _page_texts(docs: list) -> list[str]:
+    """정리 후 비어 있는 페이지를 뺀 페이지별 텍스트"""
+    return [doc.page_content for doc in docs if doc.page_content]
+
+async def _parse_stored(file_path: str | None, filename: str, content_hash: str | None) -> list:
+    """
+    텍스트 추출 결과를 content_hash 단위로 저장하고 재사용
+    (이미 저장된 내용이면 파일을 다시 파싱하지 않음)
+    """
+    if content_hash is None:
+        return await _parse(file_path, filename)
+
+    store = get_text_store()
+    if await asyncio.to_thread(store.exists, content_hash):
+        return await asyncio.to_thread(store.load_pages, content_hash)
+
+    if not file_path:
+        raise HTTPException(
+            status_code=409,
+            detail="저장된 추출 텍스트가 없습니다. 파일을 다시 업로드해주세요."
+        )
+    docs = await _parse(file_path, filename)
+    await asyncio.to_thread(store.save, content_hash, docs)
+    return docs
+
+async def _summarize_checkpointed(
+    texts: list[str],
+    summary_type: str,
+    on_summary: SummaryCallback | None,
+    content_hash: str | None,
+) -> str:
+    """요약 (스타일별 체크포인트, 재사용 시 스트리밍 콜백에는 한 번에 전달)"""
+    computed = False
+
+    async def _compute():
+        nonlocal computed
+        computed = True
+        return _summary_text(await _summarize(texts, summary_type, on_summary))
+
+    summary = await _checkpointed(content_hash, summary_checkpoint(summary_type), _compute)
+    if not computed and on_summary is not None and summary:
+        await on_summary(summary)
+    return summary
+
+async def _fork_document(
+    db: Session,
+    source,
+    file_path: str | None,
+    filename: str,
+    summary_type: str,
+    on_stage: StageCallback | None,
+    content_hash: str,
+    file_uuid: str,
+    on_summary: SummaryCallback | None = None,
+):
+    """같은 내용의 기존 문서에서 키워드 / 청크를 복사하고 요약만 새 스타일로 생성"""
+    docs = await _parse_stored(file_path, filename, content_hash)
+    await _notify_stage(on_stage, IngestionStage.PARSING)
+
+    summary_result, _ = await asyncio.gather(
+        _run_stage(
+            _summarize_checkpointed(
+                _page_texts(docs),
+                summary_type,
+                on_summary,
+                content_hash,
+            ),
+            on_stage, IngestionStage.SUMMARIZING, _llm_semaphore,
+        ),
+        _run_stage(
+            vector_service.copy_document_chunks(source.uuid, file_uuid, filename),
+            on_stage, IngestionStage.DEDUPLICATED,
+        ),
+    )
+
+    summary = _summary_text(summary_result)
+
+    return await _save_document(
+        db, file_uuid, filename, summary, source.keywords or "",
+        summary_type, content_hash, on_stage, source.top_sentences or [],
+    )
+
+def _summary_text(summary_result) -> str:
+    return (
+        summary_result.content
+        if hasattr(summary_result, "content")
+        else str(summary_result)
+    )
+
+def _parse_keywords(keyword_result) -> list[str]:
+    # 키워드 결과 정규화 (LLM 출력 형태 다양성 대응)
+    if hasattr(keyword_result, "content"):
+        raw_keywords = keyword_result.content
+    else:
+        raw_keywords = str(keyword_result)
+
+    # 문자열 → 리스트 변환 (쉼표/줄바꿈 기준)
+    return [
+        k.strip()
+        for k in raw_keywords.replace("\n", ",").split(",")
+        if k.strip()
+    ]
+
+def summary_stats(summary: str, keywords: list[str]) -> dict:
+    """요약 기반 추가 메타데이터 (개념 수 / 키워드 수 / 예상 복습 시간)"""
+    word_count = len(summary.split())
+    return {
+        "concept_cnt": summary.count("###"),
+        "keyword_cnt": len(keywords),
+        "review_time": max(1, word_count // 50),
+    }
+
+def _split_documents(docs: list) -> list:
+    # 문서 청킹 (컬렉션 설정의 토큰 예산, 페이지 경계 유지)
+    return get_chunker(ChromaDB.COLLECTION_NAME.value).split_documents(docs)
+
+def _attach_chunk_metadata(splits: list, file_uuid: str, filename: str, keywords_str: str):
+    for doc in splits:
+        doc.metadata.update({
+            "document_id": doc.id,
+            "document_uuid": file_uuid,
+            "filename": filename,
+            "keywords": keywords_str,
         })
+    # 내용 기반 청크 ID (재업로드 시 변경분 비교용)
+    vector_service.assign_chunk_ids(splits, file_uuid)
+
+async def _save_document(
+    db: Session,
+    file_uuid: str,
+    filename: str,
+    summary: str,
+    keywords_str: str,
+    summary_type: str,
+    content_hash: str | None,
+    on_stage: StageCallback | None,
+    top_sentences: list[str] | None = None,
+):
+    """요약 통계 계산 후 MySQL 저장"""
+    keywords = [k for k in keywords_str.split(", ") if k]
+
+    # MySQL 저장
+    document = file_crud.create_document(
+        db=db,
+        uuid=file_uuid,
+        name=filename,
+        summary=summary,
+        keywords=keywords_str,
+        content_hash=content_hash,
+        summary_type=summary_type,
+        top_sentences=top_sentences or [],
+        **summary_stats(summary, keywords),
+    )
+    # 업로드 스타일 요약도 스타일별 요약 캐시에 등록
+    _cache_style_summary(db, document)
+    await _notify_stage(on_stage, IngestionStage.SAVING)
 
-        keywords_str = ", ".join(keywords)
+    return _to_summary_detail(document)
 
-        # 문서 청킹
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
+def _cache_style_summary(db: Session, document):
+    """문서에 저장된 요약을 (summary_type, 현재 프롬프트 버전) 캐시로 등록"""
+    file_crud.create_document_summary(
+        db=db,
+        document_id=document.id,
+        summary_type=document.summary_type,
+        prompt_version=get_summary_prompt_version(document.summary_type),
+        summary=document.summary,
+        concept_cnt=document.concept_cnt,
+        review_time=document.review_time,
+    )
+
+def _to_summary_detail(document) -> DocumentSummaryDetail:
+    return DocumentSummaryDetail(
+        id=document.id,
+        uuid=document.uuid,
+        name=document.name,
+        summary=document.summary,
+        keywords=document.keywords.split(", ") if document.keywords else [],
+        concept_cnt=document.concept_cnt or 0,
+        keyword_cnt=document.keyword_cnt or 0,
+        review_time=document.review_time or 0,
+        top_sentences=document.top_sentences or [],
+        created_at=document.created_at,
+    )
+
+async def _run_pipeline(
+    db: Session,
+    file_path: str | None,
+    filename: str,
+    summary_type: str,
+    on_stage: StageCallback | None,
+    file_uuid: str,
+    content_hash: str | None = None,
+    on_summary: SummaryCallback | None = None,
+    profile: str = IngestionProfile.STANDARD.value,
+):
+    """
+    전체 수집 파이프라인
+    파싱 → 청킹 → (요약 | 키워드 | 핵심 문장 | 임베딩 동시 실행) → VectorDB / MySQL 저장
+    content_hash 가 있으면 각 단계 결과를 체크포인트하고, 재시도 시 완료된 단계는 건너뜀
+    """
+    if await _page_count(file_path, filename, content_hash) >= STREAMING_INGEST_MIN_PAGES:
+        return await _run_streaming_pipeline(
+            db, file_path, filename, summary_type, on_stage, file_uuid, content_hash, on_summary, profile
         )
-        splits = splitter.split_documents(docs)
 
-        for doc in splits:
-            doc.metadata.update({
-                "document_id": doc.id,
-                "document_uuid": file_uuid,
-                "filename": file.filename,
-                "keywords": keywords_str,
-            })
+    # 파일 유형별 텍스트 로드 (CPU 작업이므로 전용 프로세스 풀에서 실행)
+    docs = await _parse_stored(file_path, filename, content_hash)
+    await _notify_stage(on_stage, IngestionStage.PARSING)
+
+    full_text = "\n".join(_page_texts(docs))
 
-        # ChromaDB 저장
-        vectorstore = Chroma(
-            collection_name=ChromaDB.COLLECTION_NAME.value,
-            embedding_function=OpenAIEmbeddings(
-                model="text-embedding-3-small"
+    # 문서 청킹
+    async def _chunk():
+        return _dump_documents(await asyncio.to_thread(_split_documents, docs))
+
+    splits = _load_documents(await _checkpointed(content_hash, CHECKPOINT_CHUNKS, _chunk))
+    await _notify_stage(on_stage, IngestionStage.CHUNKING)
+
+    # 요약 / 키워드 / 청크 임베딩(+ 핵심 문장)은 서로 독립적이므로 동시에 실행
+    # → 전체 지연 시간이 각 단계의 합이 아닌 가장 느린 단계 수준으로 줄어듦
+    summary, keywords_str, (vectors, top_sentences) = await asyncio.gather(
+        _run_stage(
+            _summarize_checkpointed(
+                _page_texts(docs),
+                summary_type,
+                on_summary,
+                content_hash,
             ),
-            persist_directory=CHROMA_PERSIST_DIR,
-        )
-        vectorstore.add_documents(splits)
-        
-                # 추가 메타데이터 계산
-        concept_count = summary.count("###")
-        keyword_count = len(keywords)
-        word_count = len(summary.split())
-        review_time_min = max(1, word_count // 50)
-
-        # MySQL 저장
-        document = file_crud.create_document(
-            db=db,
-            uuid=file_uuid,
-            name=file.filename,
-            summary=summary,
-            keywords=keywords_str,
-            concept_cnt=concept_count,
-            keyword_cnt=keyword_count,
-            review_time=review_time_min
-        )
-
-        return DocumentSummaryDetail(
-            id=document.id,
-            uuid=document.uuid,
-            name=document.name,
-            summary=document.summary,
-            keywords=document.keywords.split(", ") if document.keywords else [],
-            concept_cnt=concept_count,
-            keyword_cnt=keyword_count,
-            review_time=review_time_min,
-            created_at=document.created_at,
+            on_stage, IngestionStage.SUMMARIZING, _llm_semaphore,
+        ),
+        _run_stage(
+            _extract_keywords(full_text, content_hash or file_uuid, profile, content_hash),
+            on_stage, IngestionStage.KEYWORDS,
+        ),
+        _embed_and_rank(splits, content_hash, on_stage),
+    )
+
+    # 키워드는 청크 메타데이터에 포함되므로 임베딩 계산 후 저장 시점에 채움
+    _attach_chunk_metadata(splits, file_uuid, filename, keywords_str)
+
+    # ChromaDB 저장 (미리 계산한 임베딩 사용, 내용 기반 ID upsert 이므로 재시도해도 중복 없음)
+    await vector_service.add_embedded_documents(splits, vectors)
+
+    return await _save_document(
+        db, file_uuid, filename, summary, keywords_str,
+        summary_type, content_hash, on_stage, top_sentences,
+    )
+
+async def _extract_keywords(
+    full_text: str,
+    doc_key: str | None,
+    profile: str,
+    content_hash: str | None,
+) -> str:
+    """
+    키워드 추출
+    1. 로컬 BM25 후보 추출 (doc_key 가 있으면 업로드 문서 전체 코퍼스 통계에 이 문서 반영, 수 ms)
+    2. standard 프로필이면 LLM 이 후보를 골라 순서 / 표기만 보정 (실패 시 로컬 결과 사용)
+    Returns: 쉼표로 연결한 키워드 문자열
+    """
+    candidates = await asyncio.to_thread(extract_keywords, full_text, KEYWORD_CANDIDATES, doc_key)
+    return await _refine_keywords(candidates, full_text, profile, content_hash)
+
+async def _refine_keywords(
+    candidates: list[str],
+    context_text: str,
+    profile: str,
+    content_hash: str | None,
+) -> str:
+    """로컬 후보를 LLM 으로 보정 (fast 프로필 / 보정 실패 시 로컬 후보 상위 KEYWORD_TOP_K 개)"""
+    if profile == IngestionProfile.FAST or not candidates:
+        return ", ".join(candidates[:KEYWORD_TOP_K])
+
+    async def _refine():
+        async with _llm_semaphore:
+            result = await keyword_chain.ainvoke({
+                "context": truncate_to_tokens(context_text, KEYWORD_CONTEXT_TOKENS),
+                "candidates": ", ".join(candidates),
+            })
+        return _parse_keywords(result)
+
+    try:
+        keywords = await _checkpointed(content_hash, CHECKPOINT_KEYWORDS, _refine)
+    except Exception as e:
+        print(f"⚠️ 키워드 보정 실패, 로컬 추출 결과를 사용합니다: {e}")
+        keywords = []
+    return ", ".join((keywords or candidates)[:KEYWORD_TOP_K])
+
+async def _embed_and_rank(splits: list, content_hash: str | None, on_stage: StageCallback | None):
+    """
+    청크 임베딩 후 그 임베딩으로 핵심 문장 선정 (로컬 계산, LLM 호출 없음)
+    Returns: (vectors, top_sentences)
+    """
+    vectors = await _run_stage(
+        _checkpointed(
+            content_hash, CHECKPOINT_EMBEDDINGS,
+            lambda: vector_service.embed_documents(splits),
+            vectors=True,
+        ),
+        on_stage, IngestionStage.EMBEDDING, _embedding_semaphore,
+    )
+    top_sentences = await _run_stage(
+        asyncio.to_thread(
+            rank_top_sentences, [doc.page_content for doc in splits], vectors, TOP_SENTENCES_K
+        ),
+        on_stage, IngestionStage.TOP_SENTENCES,
+    )
+    return vectors, top_sentences
+
+async def _page_count(file_path: str | None, filename: str, content_hash: str | None) -> int:
+    """저장된 추출 텍스트 또는 원본 파일의 페이지 수 (수집 방식 선택용)"""
+    store = get_text_store()
+    if content_hash is not None and await asyncio.to_thread(store.exists, content_hash):
+        return await asyncio.to_thread(store.page_count, content_hash)
+    if not file_path:
+        return 0
+    try:
+        return await asyncio.to_thread(count_pages, file_path, filename)
+    except Exception:
+        # 페이지 수를 못 세는 파일은 기존 파이프라인에서 파싱 오류로 처리
+        return 0
+
+async def _run_streaming_pipeline(
+    db: Session,
+    file_path: str | None,
+    filename: str,
+    summary_type: str,
+    on_stage: StageCallback | None,
+    file_uuid: str,
+    content_hash: str | None = None,
+    on_summary: SummaryCallback | None = None,
+    profile: str = IngestionProfile.STANDARD.value,
+):
+    """
+    대용량 문서 수집 (페이지 수 STREAMING_INGEST_MIN_PAGES 이상)
+    페이지를 읽는 대로 정리 → 추출 텍스트 저장 / 키워드 후보 / 요약 중간 결과 누적 → 청킹 → 임베딩 → VectorDB 저장
+    - 메모리에는 단계 사이 큐, 요약 대기 그룹, 키워드 후보 빈도표, 핵심 문장 후보 풀만 유지
+    - 청크 / 임베딩은 체크포인트하지 않음 (임베딩 캐시 + 내용 기반 ID upsert 로 재시도 비용을 줄임)
+    - 키워드는 청크 저장 후에 정해지므로 마지막에 청크 메타데이터를 일괄 갱신
+    """
+    text_store = get_text_store()
+    writer = None
+    cleaner = None
+    if content_hash is not None and await asyncio.to_thread(text_store.exists, content_hash):
+        # 이미 정리되어 저장된 텍스트
+        pages = iter_stored_pages(text_store, content_hash)
+    elif file_path:
+        pages = iter_document_pages(file_path, filename, _parse_semaphore)
+        cleaner = StreamingCleaner()
+        if content_hash is not None:
+            writer = text_store.writer(content_hash)
+    else:
+        raise HTTPException(
+            status_code=409,
+            detail="저장된 추출 텍스트가 없습니다. 파일을 다시 업로드해주세요."
         )
 
+    # 이전 시도에서 요약이 끝났으면 요약 입력을 다시 만들지 않음
+    summary_done = content_hash is not None and await asyncio.to_thread(
+        get_checkpoint_store().get_json, content_hash, summary_checkpoint(summary_type)
+    ) is not None
+    summary_context = None if summary_done else StreamingSummaryContext(_llm_semaphore)
+    counter = CandidateCounter()
+    pool = SentencePool()
+    # 키워드 보정 호출에 참고용으로 넘길 앞부분 본문
+    head_texts: list[str] = []
+    head_tokens = 0
+    assign_id = vector_service.ChunkIdAssigner(file_uuid)
+
+    async def _on_page(page: Document):
+        nonlocal head_tokens
+        if writer is not None:
+            await asyncio.to_thread(writer.add, page)
+        if not page.page_content:
+            return
+        await asyncio.to_thread(counter.add, page.page_content)
+        if head_tokens < KEYWORD_CONTEXT_TOKENS:
+            head_texts.append(page.page_content)
+            head_tokens += count_tokens(page.page_content)
+        if summary_context is not None:
+            await summary_context.add(page.page_content)
+
+    def _prepare_chunk(doc: Document):
+        doc.metadata.update({
+            "document_id": doc.id,
+            "document_uuid": file_uuid,
+            "filename": filename,
+            "keywords": "",
+        })
+        doc.id = assign_id(doc.page_content)
+
+    async def _embed(batch: list) -> list[list[float]]:
+        async with _embedding_semaphore:
+            return await vector_service.embed_documents(batch)
+
+    def _on_vectors(batch: list, vectors: list[list[float]]):
+        for doc, vector in zip(batch, vectors):
+            pool.add(doc.page_content, vector)
+
+    try:
+        stats = await run_streaming_ingestion(
+            pages,
+            get_chunker(ChromaDB.COLLECTION_NAME.value),
+            on_page=_on_page,
+            prepare_chunk=_prepare_chunk,
+            embed=_embed,
+            upsert=vector_service.add_embedded_documents,
+            on_vectors=_on_vectors,
+            cleaner=cleaner,
+        )
+        if writer is not None:
+            await asyncio.to_thread(writer.commit)
+            writer = None
+    except BaseException:
+        if writer is not None:
+            await asyncio.to_thread(writer.abort)
+        if summary_context is not None:
+            summary_context.cancel()
+        raise
+
+    print(f"+++ {filename}: 스트리밍 수집 (페이지 {stats['pages']}개, 청크 {stats['chunks']}개)")
+    for stage in (IngestionStage.PARSING, IngestionStage.CHUNKING, IngestionStage.EMBEDDING):
+        await _notify_stage(on_stage, stage)
+
+    async def _keywords() -> str:
+        candidates = await asyncio.to_thread(
+            rank_keywords, counter, KEYWORD_CANDIDATES, content_hash or file_uuid
+        )
+        return await _refine_keywords(candidates, "\n".join(head_texts), profile, content_hash)
+
+    # 요약 중간 결과 합치기(Map 호출 포함)는 LLM 슬롯을 잡기 전에 끝냄 (같은 세마포어를 중첩해서 잡지 않도록)
+    summary_texts = [await summary_context.context()] if summary_context is not None else []
+    summary, keywords_str, top_sentences = await asyncio.gather(
+        _run_stage(
+            _summarize_checkpointed(summary_texts, summary_type, on_summary, content_hash),
+            on_stage, IngestionStage.SUMMARIZING, _llm_semaphore,
+        ),
+        _run_stage(_keywords(), on_stage, IngestionStage.KEYWORDS),
+        _run_stage(
+            asyncio.to_thread(pool.select, TOP_SENTENCES_K),
+            on_stage, IngestionStage.TOP_SENTENCES,
+        ),
+    )
+
+    await vector_service.set_chunk_keywords(file_uuid, keywords_str)
+
+    return await _save_document(
+        db, file_uuid, filename, summary, keywords_str,
+        summary_type, content_hash, on_stage, top_sentences,
+    )
+
+async def reingest_document(
+    db: Session,
+    document_id: int,
+    file: UploadFile,
+    summary_type: str | None = None,
+) -> DocumentReingestResult:
+    """
+    기존 문서에 수정된 파일을 다시 올리는 버전 갱신
+    - 청크는 내용 기반 ID 이므로 새 분할 결과와 기존 ID 를 비교
+    - 새로 생긴 청크만 임베딩 / upsert, 사라진 청크는 삭제, 그대로인 청크는 메타데이터만 갱신
+    - 변경 비율이 REINGEST_SUMMARY_THRESHOLD 를 넘을 때만 요약 / 키워드 재생성
+    - 같은 문서의 재업로드는 문서별 잠금으로 하나씩 처리 (버전 / 청크 비교가 엇갈리지 않도록)
+    """
+    document = file_crud.get_document_by_id(db, document_id)
+    if not document:
+        raise HTTPException(
+            status_code=404,
+            detail="문서를 찾을 수 없습니다."
+        )
+    tag_usage(document=document.uuid)
+    if summary_type is not None:
+        validate_summary_type(summary_type)
+
+    temp_file_path, content_hash = await save_upload_file(file)
+
+    lock = _document_locks.get(document.id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _document_locks[document.id] = lock
+
+    try:
+        async with lock:
+            # 앞선 재업로드가 반영한 버전 / 내용 해시로 다시 읽음
+            db.refresh(document)
+            return await _reingest_locked(db, document, file.filename, temp_file_path, content_hash, summary_type)
     finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        remove_temp_file(temp_file_path)
+
+async def _reingest_locked(
+    db: Session,
+    document,
+    filename: str,
+    temp_file_path: str,
+    content_hash: str,
+    summary_type: str | None,
+) -> DocumentReingestResult:
+    """문서 잠금 안에서 실행하는 재업로드 본체"""
+    summary_type = summary_type or document.summary_type or "lecture"
+    previous_hash = document.content_hash
+
+    # 내용이 완전히 같으면 아무 작업도 하지 않음
+    if content_hash == document.content_hash and summary_type == document.summary_type:
+        return DocumentReingestResult(
+            document=_to_summary_detail(document),
+            version=document.version or 1,
+            added_chunks=0,
+            removed_chunks=0,
+            unchanged_chunks=len(await vector_service.get_chunk_ids(document.uuid)),
+            change_ratio=0.0,
+            summary_regenerated=False,
+        )
+
+    docs = await _parse_stored(temp_file_path, filename, content_hash)
+    splits = await asyncio.to_thread(_split_documents, docs)
+    _attach_chunk_metadata(splits, document.uuid, filename, document.keywords or "")
+
+    existing_ids = set(await vector_service.get_chunk_ids(document.uuid))
+    new_ids = {doc.id for doc in splits}
+    added = [doc for doc in splits if doc.id not in existing_ids]
+    unchanged = [doc for doc in splits if doc.id in existing_ids]
+    removed_ids = list(existing_ids - new_ids)
+
+    change_ratio = (len(added) + len(removed_ids)) / max(1, len(existing_ids), len(new_ids))
+    regenerate = (
+        change_ratio > REINGEST_SUMMARY_THRESHOLD
+        or summary_type != document.summary_type
+    )
+
+    summary = document.summary
+    keywords_str = document.keywords or ""
+    if regenerate:
+        # 같은 강의의 이전 버전이 이미 키워드 코퍼스에 반영되어 있으므로 새 버전은 DF 에 더하지 않음
+        # (재업로드마다 같은 강의의 용어 DF 가 부풀지 않도록, 점수 계산에만 코퍼스 사용)
+        summary_result, keywords_str, vectors = await asyncio.gather(
+            _run_stage(
+                summarize_document(_page_texts(docs), summary_type),
+                None, IngestionStage.SUMMARIZING, _llm_semaphore,
+            ),
+            _extract_keywords(
+                "\n".join(_page_texts(docs)), None, INGESTION_PROFILE, None
+            ),
+            vector_service.embed_documents(added),
+        )
+        summary = _summary_text(summary_result)
+        for doc in splits:
+            doc.metadata["keywords"] = keywords_str
+    else:
+        vectors = await vector_service.embed_documents(added)
+
+    # 핵심 문장은 새 청크 임베딩 + 기존 청크 임베딩으로 다시 선정 (LLM 호출 없음)
+    stored_vectors = await vector_service.get_chunk_embeddings([doc.id for doc in unchanged])
+    added_vectors = dict(zip((doc.id for doc in added), vectors))
+    ranked = [doc for doc in splits if doc.id in added_vectors or doc.id in stored_vectors]
+    top_sentences = await asyncio.to_thread(
+        rank_top_sentences,
+        [doc.page_content for doc in ranked],
+        [added_vectors.get(doc.id) or stored_vectors[doc.id] for doc in ranked],
+        TOP_SENTENCES_K,
+    )
+
+    # 변경분만 반영
+    await vector_service.add_embedded_documents(added, vectors)
+    await vector_service.delete_chunks(removed_ids)
+    await vector_service.update_chunk_metadata(unchanged)
+
+    keywords = [k for k in keywords_str.split(", ") if k]
+    document = file_crud.update_document(
+        db=db,
+        document=document,
+        name=filename,
+        summary=summary,
+        keywords=keywords_str,
+        content_hash=content_hash,
+        summary_type=summary_type,
+        version=(document.version or 1) + 1,
+        top_sentences=top_sentences,
+        **summary_stats(summary, keywords),
+    )
+    # 내용이 바뀌었으므로 다른 스타일 요약 캐시는 무효화
+    file_crud.delete_document_summaries(db, document.id)
+    if regenerate:
+        _cache_style_summary(db, document)
+
+    # 이전 버전의 추출 텍스트는 같은 내용을 쓰는 다른 문서가 없을 때만 삭제
+    if previous_hash and previous_hash != content_hash and not file_crud.get_document_by_hash(db, previous_hash):
+        await asyncio.to_thread(get_text_store().delete, previous_hash)
+
+    return DocumentReingestResult(
+        document=_to_summary_detail(document),
+        version=document.version,
+        added_chunks=len(added),
+        removed_chunks=len(removed_ids),
+        unchanged_chunks=len(unchanged),
+        change_ratio=round(change_ratio, 4),
+        summary_regenerated=regenerate,
+    )
+
+def list_unfinished_ingestions(limit: int = 100) -> list[IngestionCheckpointItem]:
+    """실패했거나 중단된 수집 목록 (체크포인트된 단계 포함)"""
+    return [
+        IngestionCheckpointItem(
+            **{**item, "created_at": datetime.fromtimestamp(item["created_at"]),
+               "updated_at": datetime.fromtimestamp(item["updated_at"])},
+            resumable=get_text_store().exists(item["content_hash"]),
+        )
+        for item in get_checkpoint_store().list_unfinished(limit)
+    ]
+
+async def resume_ingestion(db: Session, content_hash: str, summary_type: str) -> DocumentSummaryDetail:
+    """
+    중단된 수집을 마지막으로 완료된 단계부터 이어서 실행
+    (저장된 추출 텍스트가 없으면 원본 파일이 필요하므로 409)
+    """
+    validate_summary_type(summary_type)
+    record = get_checkpoint_store().get_ingestion(content_hash, summary_type)
+    if not record:
+        raise HTTPException(
+            status_code=404,
+            detail="수집 기록을 찾을 수 없습니다."
+        )
+
+    return await ingest_document(
+        db=db,
+        file_path=None,
+        filename=record["filename"],
+        summary_type=summary_type,
+        content_hash=content_hash,
+    )
+
+async def load_document_pages(
+    db: Session,
+    document_id: int,
+    start: int = 0,
+    end: int | None = None,
+) -> list[DocumentPageText]:
+    """
+    저장된 추출 텍스트에서 [start, end) 페이지만 로드 (원본 파일 재파싱 없음)
+    """
+    document = file_crud.get_document_by_id(db, document_id)
+    if not document:
+        raise HTTPException(
+            status_code=404,
+            detail="문서를 찾을 수 없습니다."
+        )
+
+    store = get_text_store()
+    if not document.content_hash or not await asyncio.to_thread(store.exists, document.content_hash):
+        raise HTTPException(
+            status_code=404,
+            detail="저장된 추출 텍스트가 없습니다. 파일을 다시 업로드해주세요."
+        )
+
+    docs = await asyncio.to_thread(store.load_pages, document.content_hash, start, end)
+    return [
+        DocumentPageText(
+            page=doc.metadata.get("page", start + idx),
+            page_label=doc.metadata.get("page_label"),
+            content=doc.page_content,
+        )
+        for idx, doc in enumerate(docs)
+    ]
 
 def list_documents(db: Session, limit: int, offset: int):
     """
@@ -199,11 +1155,4 @@ def get_document_detail(db: Session, document_id: int):
             detail="문서를 찾을 수 없습니다."
         )
 
-    return DocumentSummaryDetail(
-        id=document.id,
-        uuid=document.uuid,
-        name=document.name,
-        summary=document.summary,
-        keywords=document.keywords.split(", ") if document.keywords else [],
-        created_at=document.created_at,
-    )
+    return _to_summary_detail(document)
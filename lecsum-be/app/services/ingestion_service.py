@@ -0,0 +1,490 @@
+# 문서 수집(Ingestion) Job 처리 로직
+# - 업로드 요청은 파일만 임시 저장하고 즉시 job_id 반환
+# - 제한된 개수의 백그라운드 워커가 큐에서 Job을 꺼내 파이프라인 실행
+# - 단계별 진행 이벤트를 상태 조회 / SSE 스트림으로 제공
+import os
+import json
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from fastapi import UploadFile, HTTPException
+from dotenv import load_dotenv
+
+from app.db.database import SessionLocal
+from app.db.job_schemas import IngestionStageEvent, IngestionJobDetail
+from app.db.file_schemas import DocumentSummaryDetail, BulkUploadItem, BulkUploadResult
+from app.core.enums import IngestionJobStatus, IngestionStage
+from app.core.usage_accounting import usage_context
+from app.services import file_service
+
+load_dotenv()
+
+# 동시에 파이프라인을 실행하는 워커 수
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+# 대기열 최대 길이 (초과 시 503 반환)
+INGESTION_QUEUE_SIZE = int(os.getenv("INGESTION_QUEUE_SIZE", "100"))
+# 대기열을 거치지 않는 스트리밍 업로드의 동시 실행 한도 (초과 시 503 반환)
+INGESTION_STREAM_MAX_JOBS = int(os.getenv("INGESTION_STREAM_MAX_JOBS", str(INGESTION_WORKERS)))
+# 메모리에 보관하는 Job 최대 개수 (오래된 완료 Job부터 제거)
+INGESTION_JOB_RETENTION = int(os.getenv("INGESTION_JOB_RETENTION", "500"))
+# 일괄 업로드에서 동시에 파이프라인에 올리는 문서 수 (파싱 결과가 메모리에 쌓이지 않도록 제한)
+BULK_MAX_IN_FLIGHT = int(os.getenv("BULK_MAX_IN_FLIGHT", "8"))
+# 일괄 업로드 1회 최대 파일 수
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "500"))
+
+# SSE 스트림 종료 단계
+TERMINAL_STATUSES = (IngestionJobStatus.COMPLETED, IngestionJobStatus.FAILED)
+
+
+class IngestionJob:
+    """수집 Job 한 건의 상태와 이벤트 구독자 관리"""
+
+    def __init__(
+        self,
+        filename: str,
+        summary_type: str,
+        file_path: str,
+        content_hash: str | None = None,
+        profile: str | None = None,
+    ):
+        self.job_id = str(uuid.uuid4())
+        self.filename = filename
+        self.summary_type = summary_type
+        self.profile = profile
+        self.file_path = file_path
+        self.content_hash = content_hash
+        self.status = IngestionJobStatus.QUEUED
+        self.stage: str | None = None
+        self.events: list[IngestionStageEvent] = []
+        self.result: DocumentSummaryDetail | None = None
+        self.error: str | None = None
+        # 스트리밍으로 받은 요약 토큰 (뒤늦게 구독한 클라이언트에게 재전송)
+        self.summary_parts: list[str] = []
+        self.created_at = datetime.now()
+        self.updated_at = self.created_at
+        self._started = time.monotonic()
+        self._subscribers: list[asyncio.Queue] = []
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def _publish(self, stage: str, message: str | None = None):
+        event = IngestionStageEvent(
+            stage=stage,
+            status=self.status.value,
+            elapsed_ms=int((time.monotonic() - self._started) * 1000),
+            message=message,
+            created_at=datetime.now(),
+        )
+        self.stage = stage
+        self.updated_at = event.created_at
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def mark_running(self):
+        self.status = IngestionJobStatus.RUNNING
+        self._started = time.monotonic()
+        self.updated_at = datetime.now()
+
+    async def record_stage(self, stage: str):
+        """file_service.ingest_document 의 단계 완료 콜백"""
+        self._publish(stage)
+
+    async def record_summary(self, delta: str):
+        """file_service.ingest_document 의 요약 토큰 콜백"""
+        self.summary_parts.append(delta)
+        for queue in self._subscribers:
+            queue.put_nowait(delta)
+
+    def complete(self, result: DocumentSummaryDetail):
+        self.status = IngestionJobStatus.COMPLETED
+        self.result = result
+        self._publish(IngestionJobStatus.COMPLETED.value)
+
+    def fail(self, error: str):
+        self.status = IngestionJobStatus.FAILED
+        self.error = error
+        self._publish(IngestionJobStatus.FAILED.value, message=error)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def to_detail(self) -> IngestionJobDetail:
+        return IngestionJobDetail(
+            job_id=self.job_id,
+            filename=self.filename,
+            summary_type=self.summary_type,
+            status=self.status.value,
+            stage=self.stage,
+            events=list(self.events),
+            result=self.result,
+            error=self.error,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+
+_jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+_queue: asyncio.Queue | None = None
+_workers: list[asyncio.Task] = []
+_background_tasks: set[asyncio.Task] = set()
+# 실행 중인 스트리밍 업로드 수 (업로드 저장 전에 자리를 잡고 파이프라인이 끝나면 반환)
+_streaming_jobs = 0
+
+
+def _queue_full_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="처리 대기 중인 문서가 너무 많습니다. 잠시 후 다시 시도해주세요."
+    )
+
+
+def _release_streaming_slot(_task: asyncio.Task | None = None):
+    global _streaming_jobs
+    _streaming_jobs -= 1
+
+
+def _ensure_workers():
+    """첫 요청 시 워커 풀 기동 (이벤트 루프 안에서 호출되어야 함)"""
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=INGESTION_QUEUE_SIZE)
+    alive = [task for task in _workers if not task.done()]
+    _workers[:] = alive
+    for _ in range(INGESTION_WORKERS - len(alive)):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+def _remember(job: IngestionJob):
+    _jobs[job.job_id] = job
+    # 보관 한도 초과 시 끝난 Job부터 제거
+    if len(_jobs) > INGESTION_JOB_RETENTION:
+        for job_id in [jid for jid, j in _jobs.items() if j.is_finished]:
+            if len(_jobs) <= INGESTION_JOB_RETENTION:
+                break
+            del _jobs[job_id]
+
+
+async def _worker():
+    while True:
+        job = await _queue.get()
+        try:
+            # 워커는 처음 기동한 요청의 컨텍스트를 물려받으므로 사용량 태그를 Job 단위로 다시 지정
+            with usage_context(route="ingestion_job"):
+                await _run_job(job)
+        finally:
+            _queue.task_done()
+
+
+async def _run_job(job: IngestionJob):
+    db = SessionLocal()
+    job.mark_running()
+    try:
+        result = await file_service.ingest_document(
+            db=db,
+            file_path=job.file_path,
+            filename=job.filename,
+            summary_type=job.summary_type,
+            on_stage=job.record_stage,
+            content_hash=job.content_hash,
+            on_summary=job.record_summary,
+            profile=job.profile,
+        )
+        job.complete(result)
+    except HTTPException as e:
+        job.fail(str(e.detail))
+    except Exception as e:
+        print(f"⚠️ Ingestion Job {job.job_id} 실패: {e}")
+        job.fail(f"문서 처리 중 오류: {str(e)}")
+    finally:
+        db.close()
+        file_service.remove_temp_file(job.file_path)
+
+
+async def start_streaming_job(
+    file: UploadFile,
+    summary_type: str,
+    profile: str | None = None,
+    heartbeat_sec: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    업로드 후 대기열을 거치지 않고 바로 파이프라인을 시작하고 SSE 스트림을 반환
+    - 요약 토큰은 생성되는 대로 summary 이벤트로 전송
+    - 나머지 단계(키워드 / 임베딩 / 저장)는 백그라운드에서 이어서 진행되며
+      클라이언트 연결이 끊겨도 끝까지 처리됨 (GET /jobs/{job_id} 로 조회 가능)
+    - 마지막 completed 이벤트에 저장된 DocumentSummaryDetail 포함
+    - 동시에 실행 중인 스트리밍 업로드가 INGESTION_STREAM_MAX_JOBS 개면 업로드를 저장하기 전에 503
+    (파일 형식 / 크기 오류는 스트림 시작 전에 4xx)
+    """
+    global _streaming_jobs
+    file_service.validate_summary_type(summary_type)
+    if _streaming_jobs >= INGESTION_STREAM_MAX_JOBS:
+        raise _queue_full_error()
+    _streaming_jobs += 1
+
+    try:
+        temp_file_path, content_hash = await file_service.save_upload_file(file)
+    except BaseException:
+        _release_streaming_slot()
+        raise
+    job = IngestionJob(
+        filename=file.filename,
+        summary_type=summary_type,
+        file_path=temp_file_path,
+        content_hash=content_hash,
+        profile=profile,
+    )
+    _remember(job)
+
+    task = asyncio.create_task(_run_job(job))
+    # 태스크가 GC 되지 않도록 완료 시까지 참조 유지
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(_release_streaming_slot)
+
+    return _iter_job_events(job, heartbeat_sec)
+
+
+async def submit_job(file: UploadFile, summary_type: str, profile: str | None = None) -> IngestionJobDetail:
+    """
+    업로드 파일을 임시 저장 후 수집 Job을 대기열에 등록한다.
+    파이프라인은 백그라운드 워커에서 실행되며 즉시 job 정보를 반환한다.
+    """
+    file_service.validate_summary_type(summary_type)
+    _ensure_workers()
+
+    temp_file_path, content_hash = await file_service.save_upload_file(file)
+    job = IngestionJob(
+        filename=file.filename,
+        summary_type=summary_type,
+        file_path=temp_file_path,
+        content_hash=content_hash,
+        profile=profile,
+    )
+
+    try:
+        _queue.put_nowait(job)
+    except asyncio.QueueFull:
+        file_service.remove_temp_file(temp_file_path)
+        raise _queue_full_error()
+
+    _remember(job)
+    return job.to_detail()
+
+
+def _get_job(job_id: str) -> IngestionJob:
+    job = _jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail="수집 작업을 찾을 수 없습니다."
+        )
+    return job
+
+
+def get_job_detail(job_id: str) -> IngestionJobDetail:
+    """수집 Job 상태 조회"""
+    return _get_job(job_id).to_detail()
+
+
+def _format_sse(event: IngestionStageEvent, result: DocumentSummaryDetail | None = None) -> str:
+    data = event.model_dump(mode="json")
+    if result is not None:
+        data["result"] = result.model_dump(mode="json")
+    return f"event: {event.stage}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _format_summary_sse(delta: str) -> str:
+    return f"event: summary\ndata: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+
+
+def _format_job_event(job: IngestionJob, event: IngestionStageEvent) -> str:
+    # 완료 이벤트에는 저장된 문서 상세를 함께 전송
+    result = job.result if event.stage == IngestionJobStatus.COMPLETED.value else None
+    return _format_sse(event, result)
+
+
+def stream_job_events(job_id: str, heartbeat_sec: float = 15.0) -> AsyncIterator[str]:
+    """
+    수집 Job 진행 이벤트를 SSE 형식으로 스트리밍
+    - 이미 발생한 이벤트(와 지금까지 생성된 요약)를 먼저 재전송한 뒤 새 이벤트를 이어서 전송
+    - 요약 토큰은 summary 이벤트({"delta": ...}), 완료 이벤트에는 result(DocumentSummaryDetail) 포함
+    - 완료/실패 이벤트 전송 후 스트림 종료
+    (없는 Job이면 스트림 시작 전에 404)
+    """
+    return _iter_job_events(_get_job(job_id), heartbeat_sec)
+
+
+async def _iter_job_events(job: IngestionJob, heartbeat_sec: float) -> AsyncIterator[str]:
+    # 구독과 기존 이벤트 스냅샷 사이에 await가 없으므로 이벤트 누락/중복 없음
+    queue = job.subscribe()
+    events, summary = list(job.events), "".join(job.summary_parts)
+    try:
+        if summary:
+            yield _format_summary_sse(summary)
+        for event in events:
+            yield _format_job_event(job, event)
+        if job.is_finished:
+            return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat_sec)
+            except asyncio.TimeoutError:
+                # 프록시 연결 유지를 위한 주석 라인
+                yield ": keep-alive\n\n"
+                continue
+            if isinstance(event, str):
+                yield _format_summary_sse(event)
+                continue
+            yield _format_job_event(job, event)
+            if event.stage in (status.value for status in TERMINAL_STATUSES):
+                return
+    finally:
+        job.unsubscribe(queue)
+
+
+async def _ingest_bulk_item(
+    filename: str,
+    file_path: str,
+    content_hash: str,
+    summary_type: str,
+    profile: str | None,
+    in_flight: asyncio.Semaphore,
+) -> BulkUploadItem:
+    """일괄 업로드 파일 한 건 수집 (실패해도 예외 대신 실패 결과 반환)"""
+    stages: list[str] = []
+
+    async def _record(stage: str):
+        stages.append(stage)
+
+    async with in_flight:
+        started = time.monotonic()
+        # 문서별로 세션을 분리 (동시에 여러 문서를 저장)
+        db = SessionLocal()
+        try:
+            document = await file_service.ingest_document(
+                db=db,
+                file_path=file_path,
+                filename=filename,
+                summary_type=summary_type,
+                on_stage=_record,
+                content_hash=content_hash,
+                profile=profile,
+            )
+            deduplicated = stages == [IngestionStage.DEDUPLICATED.value]
+            return BulkUploadItem(
+                filename=filename,
+                status="deduplicated" if deduplicated else IngestionJobStatus.COMPLETED.value,
+                document=document,
+                elapsed_ms=int((time.monotonic() - started) * 1000),
+            )
+        except HTTPException as e:
+            error = str(e.detail)
+        except Exception as e:
+            print(f"⚠️ 일괄 업로드 파일 처리 실패 ({filename}): {e}")
+            error = f"문서 처리 중 오류: {str(e)}"
+        finally:
+            db.close()
+            file_service.remove_temp_file(file_path)
+
+        return BulkUploadItem(
+            filename=filename,
+            status=IngestionJobStatus.FAILED.value,
+            error=error,
+            elapsed_ms=int((time.monotonic() - started) * 1000),
+        )
+
+
+async def ingest_bulk(
+    files: List[UploadFile],
+    summary_type: str,
+    profile: str | None = None,
+) -> BulkUploadResult:
+    """
+    여러 파일 / ZIP 일괄 업로드
+    - ZIP 은 안의 PDF / PPTX 를 개별 파일로 풀어서 처리
+    - 모든 파일을 동시에 파이프라인에 올리되, 파싱 / LLM / 임베딩 단계는
+      file_service 의 단계별 동시 실행 한도로 따로 제한 → 단계가 겹쳐서 진행(파이프라이닝)
+    - 파일 하나가 실패해도 나머지는 계속 처리하고 파일별 결과를 반환
+    - 파일 수 한도(BULK_MAX_FILES)는 저장 / 압축 해제 전에 검사
+      (개별 파일 수가 넘으면 요청 전체 413, ZIP 은 남은 한도를 넘으면 풀지 않고 해당 ZIP 만 실패)
+    """
+    file_service.validate_summary_type(summary_type)
+    plain_files = sum(1 for file in files if not file_service.is_zip_upload(file))
+    if plain_files > BULK_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 업로드할 수 있는 파일 수를 초과했습니다. (최대 {BULK_MAX_FILES}개)"
+        )
+
+    started = time.monotonic()
+    items: list[BulkUploadItem | None] = []
+    # (items 내 위치, 파일명, 임시 경로, content_hash)
+    pending: list[tuple[int, str, str, str]] = []
+    # ZIP 에서 풀어서 한도에 포함된 파일 수
+    zip_members = 0
+
+    try:
+        for file in files:
+            try:
+                if file_service.is_zip_upload(file):
+                    # 개별 파일 몫을 남겨 두고 ZIP 에 허용할 항목 수 계산
+                    members = await file_service.save_zip_upload(
+                        file, max_files=BULK_MAX_FILES - plain_files - zip_members
+                    )
+                    zip_members += sum(1 for _, temp_file_path, _, _ in members if temp_file_path)
+                else:
+                    temp_file_path, content_hash = await file_service.save_upload_file(file)
+                    members = [(file.filename, temp_file_path, content_hash, None)]
+            except HTTPException as e:
+                items.append(BulkUploadItem(
+                    filename=file.filename or "",
+                    status=IngestionJobStatus.FAILED.value,
+                    error=str(e.detail),
+                ))
+                continue
+
+            for filename, temp_file_path, content_hash, error in members:
+                if error is not None:
+                    items.append(BulkUploadItem(
+                        filename=filename,
+                        status=IngestionJobStatus.FAILED.value,
+                        error=error,
+                    ))
+                    continue
+                pending.append((len(items), filename, temp_file_path, content_hash))
+                items.append(None)
+    except BaseException:
+        for _, _, temp_file_path, _ in pending:
+            file_service.remove_temp_file(temp_file_path)
+        raise
+
+    in_flight = asyncio.Semaphore(BULK_MAX_IN_FLIGHT)
+    results = await asyncio.gather(*(
+        _ingest_bulk_item(filename, temp_file_path, content_hash, summary_type, profile, in_flight)
+        for _, filename, temp_file_path, content_hash in pending
+    ))
+    for (index, _, _, _), result in zip(pending, results):
+        items[index] = result
+
+    failed = sum(1 for item in items if item.status == IngestionJobStatus.FAILED.value)
+    return BulkUploadResult(
+        total=len(items),
+        succeeded=len(items) - failed,
+        failed=failed,
+        elapsed_ms=int((time.monotonic() - started) * 1000),
+        items=items,
+    )
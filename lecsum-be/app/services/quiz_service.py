@@ -1,4 +1,5 @@
 # 문제 생성, 채점, 해설 생성 로직
+import os
 import asyncio
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
@@ -8,8 +9,15 @@ from app.db.quiz_schemas import *
 from app.services import vector_service
 from app.core.llm_client import quiz_critic_refiner_chain , grade_chain, enrich_chain, retry_quiz_chain
 from app.core.searches import search_and_format_run
+from app.core.rate_limiter import prioritized
+from app.core.usage_accounting import tag_usage
+from app.core.enums import LLMPriority
 
+# 오답 해설 보강(검색 + LLM) 동시 실행 수 (문제 수가 많아도 한 번에 몰리지 않도록)
+GRADE_ENRICH_CONCURRENCY = int(os.getenv("GRADE_ENRICH_CONCURRENCY", "4"))
 
+
+@prioritized(LLMPriority.GRADING)
 async def generate_and_save_quiz(db: Session, request: QuizRequest) -> QuizResponse:
     # [MySQL] document_id로 PDF 정보(UUID) 조회
     document = file_crud.get_document_by_id(db, request.document_id)
@@ -18,6 +26,7 @@ async def generate_and_save_quiz(db: Session, request: QuizRequest) -> QuizRespo
     
     # UUID 추출 (VectorDB 검색용)
     file_uuid = document.uuid 
+    tag_usage(document=file_uuid)
 
     # [VectorDB] 관련 문서 검색
     # file_id 필터에 찾아낸 UUID를 넣습니다.
@@ -75,6 +84,7 @@ async def generate_and_save_quiz(db: Session, request: QuizRequest) -> QuizRespo
         quizzes=response_items
     )
 
+@prioritized(LLMPriority.GRADING)
 async def grade_quiz_set(db: Session, request: GradeRequest) -> GradeResponse:
     # 1. 퀴즈 데이터 조회
     quizzes = quiz_crud.get_quizzes_by_ids(db, request.quiz_id_list)
@@ -147,6 +157,7 @@ async def grade_quiz_set(db: Session, request: GradeRequest) -> GradeResponse:
         db.rollback()
         raise e
 
+@prioritized(LLMPriority.GRADING)
 async def grade_retry_quiz_set(db: Session, request) -> GradeResponse:
     """
     재시험 채점 (retry_quiz_set_id 사용)
@@ -280,6 +291,11 @@ async def grade_and_enrich_pipeline(formatted_block: str, quizzes: list, user_an
     # Step 2: 오답에 대한 보강 작업 준비
     enrich_tasks = []
     target_indices = []
+    semaphore = asyncio.Semaphore(GRADE_ENRICH_CONCURRENCY)
+
+    async def _enrich(quiz, user_ans, feedback):
+        async with semaphore:
+            return await run_enrichment_task(quiz, user_ans, feedback)
 
     for i, result in enumerate(grading_result.results):
         if not result.is_correct: # 오답 -> Enrichment 대상
@@ -289,10 +305,10 @@ async def grade_and_enrich_pipeline(formatted_block: str, quizzes: list, user_an
             
             # 태스크 예약
             enrich_tasks.append(
-                run_enrichment_task(quiz, user_ans, result.feedback)
+                _enrich(quiz, user_ans, result.feedback)
             )
 
-    # Step 3: 병렬 실행 (RAG Enrichment)
+    # Step 3: 병렬 실행 (RAG Enrichment, 최대 GRADE_ENRICH_CONCURRENCY 개씩)
     if enrich_tasks:
         print(f"⚠️ {len(enrich_tasks)}개의 오답에 대해 심화 해설 생성 중...")
         enriched_feedbacks = await asyncio.gather(*enrich_tasks)
@@ -349,6 +365,7 @@ def get_wrong_answer_list(db: Session, limit: int, offset: int):
 
     return items
 
+@prioritized(LLMPriority.GRADING)
 async def create_retry_quiz(db: Session, request: RetryQuizRequest) -> RetryQuizResponse:
     """
     선택한 틀린 문제들로 재시험 생성
@@ -0,0 +1,120 @@
+# 스타일별 요약 (lecture | bullet | exam) 지연 생성 로직
+# - 업로드 시 요약은 한 스타일만 생성, 다른 스타일은 처음 요청될 때 저장된 추출 텍스트로 생성
+# - (문서, 스타일, 프롬프트 버전) 단위로 MySQL 에 캐시 → 프롬프트가 바뀌면 자동으로 다시 생성
+# - 같은 문서 / 스타일에 대한 동시 요청은 하나의 LLM 호출을 공유 (single-flight)
+import asyncio
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.db.file_schemas import DocumentStyleSummary
+from app.core.llm_client import summarize_document
+from app.core.text_store import get_text_store
+from app.core.usage_accounting import tag_usage
+from app.core.prompt_templates.summary_prompt import get_summary_prompt_version
+from app.crud import file_crud
+from app.services import file_service, vector_service
+
+# 진행 중인 요약 생성 (document_id, summary_type, prompt_version) -> Task
+_in_flight: dict[tuple[int, str, str], asyncio.Task] = {}
+
+
+def _to_style_summary(document_id: int, cached, cached_hit: bool) -> DocumentStyleSummary:
+    return DocumentStyleSummary(
+        document_id=document_id,
+        summary_type=cached.summary_type,
+        prompt_version=cached.prompt_version,
+        summary=cached.summary,
+        concept_cnt=cached.concept_cnt or 0,
+        review_time=cached.review_time or 0,
+        cached=cached_hit,
+        created_at=cached.created_at,
+    )
+
+
+async def _load_texts(document) -> list[str]:
+    """요약 입력: 저장된 추출 텍스트 (없는 예전 문서는 VectorDB 청크로 대체)"""
+    store = get_text_store()
+    if document.content_hash and await asyncio.to_thread(store.exists, document.content_hash):
+        docs = await asyncio.to_thread(store.load_pages, document.content_hash)
+    else:
+        docs = await vector_service.get_document_chunks(document.uuid)
+
+    texts = [doc.page_content for doc in docs if doc.page_content]
+    if not texts:
+        raise HTTPException(
+            status_code=409,
+            detail="요약할 문서 내용이 없습니다. 파일을 다시 업로드해주세요."
+        )
+    return texts
+
+
+async def _generate(document_id: int, summary_type: str, prompt_version: str):
+    """요약 생성 후 캐시 저장 (요청 세션과 별도 세션 사용 → 먼저 요청한 클라이언트가 끊겨도 완료)"""
+    db = SessionLocal()
+    try:
+        document = file_crud.get_document_by_id(db, document_id)
+        tag_usage(document=document.uuid)
+        texts = await _load_texts(document)
+
+        async with file_service.llm_slot():
+            summary = await summarize_document(texts, summary_type)
+
+        stats = file_service.summary_stats(summary, [])
+        return file_crud.create_document_summary(
+            db=db,
+            document_id=document_id,
+            summary_type=summary_type,
+            prompt_version=prompt_version,
+            summary=summary,
+            concept_cnt=stats["concept_cnt"],
+            review_time=stats["review_time"],
+        )
+    finally:
+        db.close()
+
+
+async def get_style_summary(db: Session, document_id: int, summary_type: str) -> DocumentStyleSummary:
+    """
+    문서의 summary_type 스타일 요약 조회 (없으면 생성)
+    - 캐시 hit: LLM 호출 없음
+    - 업로드 스타일이면서 캐시 기록이 없는 예전 문서: 문서에 저장된 요약 사용
+    - miss: 생성 중인 같은 요청이 있으면 그 결과를 함께 기다림
+    """
+    file_service.validate_summary_type(summary_type)
+
+    document = file_crud.get_document_by_id(db, document_id)
+    if not document:
+        raise HTTPException(
+            status_code=404,
+            detail="문서를 찾을 수 없습니다."
+        )
+
+    prompt_version = get_summary_prompt_version(summary_type)
+    cached = file_crud.get_document_summary(db, document_id, summary_type, prompt_version)
+    if cached:
+        return _to_style_summary(document_id, cached, cached_hit=True)
+
+    if document.summary_type == summary_type and not file_crud.has_document_summaries(db, document_id, summary_type):
+        return DocumentStyleSummary(
+            document_id=document_id,
+            summary_type=summary_type,
+            prompt_version=None,
+            summary=document.summary,
+            concept_cnt=document.concept_cnt or 0,
+            review_time=document.review_time or 0,
+            cached=True,
+            created_at=document.created_at,
+        )
+
+    key = (document_id, summary_type, prompt_version)
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_generate(document_id, summary_type, prompt_version))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    # 요청이 취소되어도 공유 중인 생성 작업은 계속 진행
+    generated = await asyncio.shield(task)
+    return _to_style_summary(document_id, generated, cached_hit=False)
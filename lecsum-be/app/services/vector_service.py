@@ -1,7 +1,13 @@
 # vector_service.py
+import uuid
+import asyncio
+import hashlib
+
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.documents import Document
 from app.core.enums import ChromaDB, CHROMA_PERSIST_DIR
+from app.core.embedding_cache import get_embeddings
+from app.core.embedding_writer import embed_texts, aupsert_in_batches
 
 
 _vectorstore: Chroma | None = None
@@ -14,14 +20,168 @@ def get_vectorstore() -> Chroma:
     if _vectorstore is None:
         _vectorstore = Chroma(
             collection_name=ChromaDB.COLLECTION_NAME.value,
-            embedding_function=OpenAIEmbeddings(
-                model="text-embedding-3-small"
-            ),
+            embedding_function=get_embeddings(),
             persist_directory=CHROMA_PERSIST_DIR,
         )
     return _vectorstore
 
 
+class ChunkIdAssigner:
+    """
+    내용 기반 청크 ID: {document_uuid}:{sha256(text) 앞 32자}[:n]
+    같은 문서에서 같은 텍스트가 반복되면 등장 순번(n)을 붙여 구분
+    → 재업로드 시 ID 비교만으로 바뀐 청크를 찾을 수 있음
+    청크가 나오는 순서대로 호출하면 되므로 스트리밍 수집에서도 같은 ID 가 나옴
+    """
+
+    def __init__(self, document_uuid: str):
+        self.document_uuid = document_uuid
+        self._seen: dict[str, int] = {}
+
+    def __call__(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+        occurrence = self._seen.get(digest, 0)
+        self._seen[digest] = occurrence + 1
+        return f"{self.document_uuid}:{digest}" if occurrence == 0 else f"{self.document_uuid}:{digest}:{occurrence}"
+
+
+def chunk_ids(document_uuid: str, texts: list[str]) -> list[str]:
+    assign = ChunkIdAssigner(document_uuid)
+    return [assign(text) for text in texts]
+
+
+def assign_chunk_ids(documents: list[Document], document_uuid: str):
+    """청크 Document 에 내용 기반 ID 지정"""
+    for doc, chunk_id in zip(documents, chunk_ids(document_uuid, [doc.page_content for doc in documents])):
+        doc.id = chunk_id
+
+
+async def get_chunk_ids(document_uuid: str) -> list[str]:
+    """문서에 저장된 청크 ID 목록"""
+    collection = get_vectorstore()._collection
+    data = await asyncio.to_thread(
+        collection.get,
+        where={"document_uuid": document_uuid},
+        include=[],
+    )
+    return data["ids"]
+
+
+async def get_document_chunks(document_uuid: str) -> list[Document]:
+    """문서에 저장된 청크를 페이지 순서로 반환 (추출 텍스트가 없는 예전 문서용)"""
+    collection = get_vectorstore()._collection
+    data = await asyncio.to_thread(
+        collection.get,
+        where={"document_uuid": document_uuid},
+        include=["documents", "metadatas"],
+    )
+    documents = [
+        Document(id=chunk_id, page_content=text, metadata=meta or {})
+        for chunk_id, text, meta in zip(data["ids"], data["documents"], data["metadatas"])
+    ]
+    return sorted(documents, key=lambda doc: doc.metadata.get("page_start", doc.metadata.get("page", 0)))
+
+
+async def get_chunk_embeddings(ids: list[str]) -> dict[str, list[float]]:
+    """청크 ID → 저장된 임베딩 (재업로드 시 변경 없는 청크의 재임베딩 방지)"""
+    if not ids:
+        return {}
+    collection = get_vectorstore()._collection
+    data = await asyncio.to_thread(collection.get, ids=ids, include=["embeddings"])
+    return {chunk_id: list(vector) for chunk_id, vector in zip(data["ids"], data["embeddings"])}
+
+
+async def delete_chunks(ids: list[str]):
+    """청크 삭제"""
+    if not ids:
+        return
+    collection = get_vectorstore()._collection
+    await asyncio.to_thread(collection.delete, ids=ids)
+
+
+async def update_chunk_metadata(documents: list[Document]):
+    """임베딩은 그대로 두고 메타데이터만 갱신 (페이지 번호 / 키워드 변경 반영)"""
+    if not documents:
+        return
+    collection = get_vectorstore()._collection
+    await asyncio.to_thread(
+        collection.update,
+        ids=[doc.id for doc in documents],
+        metadatas=[doc.metadata for doc in documents],
+    )
+
+
+async def set_chunk_keywords(document_uuid: str, keywords: str, batch_size: int = 1000):
+    """
+    문서의 모든 청크 메타데이터에 키워드 기록 (스트리밍 수집은 키워드가 정해지기 전에 청크를 저장하므로)
+    Chroma update 는 지정한 메타데이터 키만 덮어씀
+    """
+    ids = await get_chunk_ids(document_uuid)
+    collection = get_vectorstore()._collection
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        await asyncio.to_thread(
+            collection.update,
+            ids=batch,
+            metadatas=[{"keywords": keywords} for _ in batch],
+        )
+
+
+async def embed_documents(documents: list[Document]) -> list[list[float]]:
+    """
+    청크 임베딩만 계산 (저장은 add_embedded_documents 에서 수행)
+    """
+    if not documents:
+        return []
+    return await embed_texts(
+        [doc.page_content for doc in documents],
+        embeddings=get_vectorstore().embeddings,
+    )
+
+
+async def add_embedded_documents(documents: list[Document], vectors: list[list[float]]):
+    """
+    미리 계산된 임베딩과 함께 청크를 Chroma에 저장 (임베딩 재계산 없음)
+    """
+    if not documents:
+        return
+    await aupsert_in_batches(
+        get_vectorstore()._collection,
+        ids=[doc.id or str(uuid.uuid4()) for doc in documents],
+        embeddings=vectors,
+        documents=[doc.page_content for doc in documents],
+        metadatas=[doc.metadata for doc in documents],
+    )
+
+
+async def copy_document_chunks(source_uuid: str, target_uuid: str, filename: str) -> int:
+    """
+    기존 문서의 청크를 임베딩째로 복사하여 새 document_uuid 로 저장 (임베딩 API 호출 없음)
+    Returns: 복사된 청크 수
+    """
+    collection = get_vectorstore()._collection
+    data = await asyncio.to_thread(
+        collection.get,
+        where={"document_uuid": source_uuid},
+        include=["embeddings", "documents", "metadatas"],
+    )
+    if not data["ids"]:
+        return 0
+
+    metadatas = [
+        {**(meta or {}), "document_uuid": target_uuid, "filename": filename}
+        for meta in data["metadatas"]
+    ]
+    await aupsert_in_batches(
+        collection,
+        ids=chunk_ids(target_uuid, data["documents"]),
+        embeddings=data["embeddings"],
+        documents=data["documents"],
+        metadatas=metadatas,
+    )
+    return len(data["ids"])
+
+
 def get_retriever(document_uuid: str):
     """
     특정 PDF(document_id)에 대한 retriever 생성
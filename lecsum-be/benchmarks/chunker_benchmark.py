@@ -0,0 +1,196 @@
+# 청킹 방식 비교 벤치마크
+# 기존 글자 수 분할기(RecursiveCharacterTextSplitter 1000 / 200)와 토큰 기준 청커를
+# 같은 강의 자료에 적용해 인덱스 크기와 검색 품질을 비교한다.
+#
+# 사용법 (lecsum-be 디렉터리에서):
+#   python -m benchmarks.chunker_benchmark 강의자료/*.pdf 강의자료/*.pptx
+#   python -m benchmarks.chunker_benchmark --chunk-tokens 300 500 800 --embeddings openai 강의자료/
+#   python -m benchmarks.chunker_benchmark --queries queries.json 강의자료/
+#
+# 검색 품질
+# - queries.json: [{"file": "1주차.pdf", "query": "...", "page": 3}, ...] (page 는 0-based)
+# - 없으면 각 페이지에서 문장을 뽑아 일부 단어를 지운 변형 문장을 질의로 사용 (정답 = 그 페이지)
+# - 질의가 속한 파일의 청크 안에서만 검색 (서비스의 document_uuid 필터와 동일)
+# - 정답 페이지를 포함하는 청크가 top-k 안에 있으면 적중: recall@k, MRR, top-k 컨텍스트 토큰 수
+#
+# 임베딩
+# - hash (기본): 글자 n-gram 해시 벡터. API 호출 없이 분할 방식 간 상대 비교용
+# - openai: 실제 서비스 임베딩 모델 (임베딩 캐시 경유, OPENAI_API_KEY 필요)
+import os
+import sys
+import json
+import random
+import hashlib
+import argparse
+import statistics
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.core.tokenizer import count_tokens
+from app.core.chunker import ChunkingConfig, TokenChunker
+from app.core.document_parser import load_documents, is_supported
+
+HASH_DIM = 1024
+
+
+def _collect_files(paths: list[str]) -> list[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names) if is_supported(name))
+        elif is_supported(path):
+            files.append(path)
+    return files
+
+
+def _hash_embed(texts: list[str]) -> np.ndarray:
+    """글자 2/3-gram 해시 벡터 (L2 정규화)"""
+    vectors = np.zeros((len(texts), HASH_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        compact = "".join(text.split())
+        for n in (2, 3):
+            for i in range(len(compact) - n + 1):
+                digest = hashlib.md5(compact[i:i + n].encode("utf-8")).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % HASH_DIM] += 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-9)
+
+
+def _openai_embed(texts: list[str]) -> np.ndarray:
+    from app.core.embedding_cache import get_embeddings
+    from app.core.embedding_writer import embed_texts_sync
+
+    vectors = np.asarray(embed_texts_sync(texts, embeddings=get_embeddings()), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-9)
+
+
+def _synthetic_queries(docs_by_file: dict, per_page: int, seed: int) -> list[dict]:
+    """페이지 문장에서 단어 일부를 지운 변형 문장을 질의로 생성"""
+    rng = random.Random(seed)
+    queries = []
+    for filename, docs in docs_by_file.items():
+        for doc in docs:
+            sentences = [
+                s.strip()
+                for line in doc.page_content.split("\n")
+                for s in line.replace("? ", "?\n").replace(". ", ".\n").split("\n")
+                if len(s.split()) >= 6
+            ]
+            for sentence in rng.sample(sentences, min(per_page, len(sentences))):
+                words = sentence.split()
+                kept = [w for w in words if rng.random() > 0.3] or words
+                queries.append({"file": filename, "query": " ".join(kept), "page": doc.metadata["page"]})
+    return queries
+
+
+def _chunk_pages(chunk) -> tuple[int, int]:
+    page = chunk.metadata.get("page", 0)
+    return chunk.metadata.get("page_start", page), chunk.metadata.get("page_end", page)
+
+
+def _index_stats(name: str, chunks_by_file: dict, dim: int) -> dict:
+    token_counts = [count_tokens(c.page_content) for chunks in chunks_by_file.values() for c in chunks]
+    text_bytes = sum(len(c.page_content.encode("utf-8")) for chunks in chunks_by_file.values() for c in chunks)
+    mean = statistics.mean(token_counts) if token_counts else 0
+    return {
+        "splitter": name,
+        "chunks": len(token_counts),
+        "embedded_tokens": sum(token_counts),
+        "tokens_mean": round(mean, 1),
+        "tokens_cv": round(statistics.pstdev(token_counts) / mean, 3) if mean else 0,
+        "tokens_min": min(token_counts, default=0),
+        "tokens_p95": int(np.percentile(token_counts, 95)) if token_counts else 0,
+        "tokens_max": max(token_counts, default=0),
+        # float32 벡터 + 원문 텍스트
+        "index_mb": round((len(token_counts) * dim * 4 + text_bytes) / 1024 / 1024, 2),
+    }
+
+
+def _retrieval_stats(chunks_by_file: dict, queries: list[dict], embed, k: int) -> dict:
+    hits, reciprocal_ranks, context_tokens = 0, [], []
+    for filename, chunks in chunks_by_file.items():
+        file_queries = [q for q in queries if q["file"] == filename]
+        if not chunks or not file_queries:
+            continue
+        chunk_vectors = embed([c.page_content for c in chunks])
+        query_vectors = embed([q["query"] for q in file_queries])
+        scores = query_vectors @ chunk_vectors.T
+
+        for query, row in zip(file_queries, scores):
+            ranked = np.argsort(-row)[:k]
+            context_tokens.append(sum(count_tokens(chunks[i].page_content) for i in ranked))
+            rank = next(
+                (pos for pos, i in enumerate(ranked, 1)
+                 if _chunk_pages(chunks[i])[0] <= query["page"] <= _chunk_pages(chunks[i])[1]),
+                None,
+            )
+            if rank is not None:
+                hits += 1
+                reciprocal_ranks.append(1 / rank)
+            else:
+                reciprocal_ranks.append(0.0)
+
+    total = len(reciprocal_ranks)
+    return {
+        "queries": total,
+        f"recall@{k}": round(hits / total, 3) if total else 0,
+        "mrr": round(sum(reciprocal_ranks) / total, 3) if total else 0,
+        "context_tokens_mean": round(statistics.mean(context_tokens), 1) if context_tokens else 0,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="청킹 방식별 인덱스 크기 / 검색 품질 비교")
+    parser.add_argument("paths", nargs="+", help="PDF / PPTX 파일 또는 디렉터리")
+    parser.add_argument("--chunk-tokens", type=int, nargs="+", default=[500], help="비교할 토큰 청크 크기")
+    parser.add_argument("--overlap-tokens", type=int, default=50)
+    parser.add_argument("--embeddings", choices=["hash", "openai"], default="hash")
+    parser.add_argument("--queries", help="질의 JSON 파일 (없으면 페이지 문장으로 자동 생성)")
+    parser.add_argument("--queries-per-page", type=int, default=2)
+    parser.add_argument("--k", type=int, default=3, help="검색 결과 수 (서비스 retriever 기본값 3)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    files = _collect_files(args.paths)
+    if not files:
+        sys.exit("PDF / PPTX 파일을 찾을 수 없습니다.")
+
+    docs_by_file = {os.path.basename(path): load_documents(path, os.path.basename(path)) for path in files}
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = json.load(f)
+    else:
+        queries = _synthetic_queries(docs_by_file, args.queries_per_page, args.seed)
+
+    embed = _openai_embed if args.embeddings == "openai" else _hash_embed
+    dim = 1536 if args.embeddings == "openai" else HASH_DIM
+
+    splitters = {"char_1000_200": RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)}
+    for chunk_tokens in args.chunk_tokens:
+        config = ChunkingConfig(chunk_tokens=chunk_tokens, overlap_tokens=min(args.overlap_tokens, chunk_tokens - 1))
+        splitters[f"token_{chunk_tokens}"] = TokenChunker(config)
+
+    print(f"파일 {len(files)}개, 페이지 {sum(len(d) for d in docs_by_file.values())}개, 질의 {len(queries)}개, 임베딩={args.embeddings}")
+    rows = []
+    for name, splitter in splitters.items():
+        chunks_by_file = {
+            filename: splitter.split_documents([doc.model_copy(deep=True) for doc in docs])
+            for filename, docs in docs_by_file.items()
+        }
+        rows.append({
+            **_index_stats(name, chunks_by_file, dim),
+            **_retrieval_stats(chunks_by_file, queries, embed, args.k),
+        })
+
+    columns = list(rows[0].keys())
+    widths = [max(len(col), *(len(str(row[col])) for row in rows)) for col in columns]
+    print("  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[col]).ljust(w) for col, w in zip(columns, widths)))
+
+
+if __name__ == "__main__":
+    main()
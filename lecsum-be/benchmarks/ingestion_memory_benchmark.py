@@ -0,0 +1,193 @@
+# 수집 방식별 메모리 사용량 비교 벤치마크
+# 같은 합성 강의 자료(페이지마다 머리글 / 바닥글 포함)를 기존 일괄 수집과 스트리밍 수집으로 처리하고
+# 파이썬 힙 최대 사용량(tracemalloc)과 프로세스 최대 RSS 를 페이지 수별로 비교한다.
+#
+# 사용법 (lecsum-be 디렉터리에서):
+#   python -m benchmarks.ingestion_memory_benchmark
+#   python -m benchmarks.ingestion_memory_benchmark --pages 100 400 1600 3200
+#
+# - 외부 호출 없음: 임베딩은 단어 해시 벡터, 요약 Map 호출은 고정 길이 문자열을 돌려주는 가짜 체인
+# - VectorDB 저장은 버리고, 추출 텍스트는 임시 디렉터리의 text_store 에 실제로 기록
+# - RSS 는 실행마다 별도 프로세스를 띄워 측정 (이전 실행의 메모리가 섞이지 않도록)
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+from app.core import llm_client
+from app.core.chunker import TokenChunker
+from app.core.extractive import rank_top_sentences, SentencePool
+from app.core.keyword_extractor import CandidateCounter, KeywordCorpus, rank_keywords
+from app.core.text_cleaner import clean_pages, StreamingCleaner
+from app.core.text_store import DocumentTextStore
+from app.core.streaming_pipeline import run_streaming_ingestion
+
+HASH_DIM = 1536
+WORDS = (
+    "트랜잭션 인덱스 정규화 데이터베이스 격리 수준 로그 회복 잠금 스케줄 직렬성 조인 질의 최적화 "
+    "transaction index btree hash join buffer page recovery commit rollback"
+).split()
+
+
+def _synthetic_page(rng: random.Random, idx: int, total: int) -> Document:
+    sentences = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + "에 대해 설명한다."
+        for _ in range(rng.randint(15, 30))
+    ]
+    content = f"데이터베이스 시스템 | {idx + 1}\n" + "\n".join(sentences) + f"\n© 2024 lecsum  {idx + 1} / {total}"
+    return Document(page_content=content, metadata={"page": idx, "source": "benchmark.pdf"})
+
+
+def _pages(total: int, seed: int):
+    rng = random.Random(seed)
+    for idx in range(total):
+        yield _synthetic_page(rng, idx, total)
+
+
+def _hash_embed(texts: list[str]) -> list[list[float]]:
+    vectors = []
+    for text in texts:
+        vector = np.zeros(HASH_DIM, dtype=np.float32)
+        for word in text.split():
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % HASH_DIM] += 1.0
+        vectors.append(vector.tolist())
+    return vectors
+
+
+async def _fake_map(inputs: dict) -> str:
+    return "중간 요약 " * 200
+
+
+def _install_fakes():
+    llm_client.map_summary_chain = RunnableLambda(lambda x: None, afunc=_fake_map)
+
+
+async def _run_in_memory(total: int, seed: int, workdir: str) -> dict:
+    store = DocumentTextStore(os.path.join(workdir, "texts"))
+    corpus = KeywordCorpus(os.path.join(workdir, "corpus.sqlite3"))
+    docs, _ = clean_pages(list(_pages(total, seed)))
+    store.save("in_memory", docs)
+    texts = [doc.page_content for doc in docs if doc.page_content]
+    chunks = TokenChunker().split_documents(docs)
+    vectors = _hash_embed([chunk.page_content for chunk in chunks])
+    counter = CandidateCounter()
+    counter.add("\n".join(texts))
+    keywords = rank_keywords(counter, 10, "in_memory", corpus)
+    top_sentences = rank_top_sentences([chunk.page_content for chunk in chunks], vectors, 5)
+    context = await llm_client._prepare_summary_context(texts)
+    return {"chunks": len(chunks), "keywords": len(keywords), "top": len(top_sentences), "context": len(context)}
+
+
+async def _run_streaming(total: int, seed: int, workdir: str) -> dict:
+    store = DocumentTextStore(os.path.join(workdir, "texts"))
+    corpus = KeywordCorpus(os.path.join(workdir, "corpus.sqlite3"))
+    counter = CandidateCounter()
+    pool = SentencePool()
+    summary_context = llm_client.StreamingSummaryContext()
+
+    async def _source():
+        for page in _pages(total, seed):
+            yield page
+
+    async def _embed(batch):
+        return _hash_embed([doc.page_content for doc in batch])
+
+    async def _discard(batch, vectors):
+        return None
+
+    def _on_vectors(batch, vectors):
+        for doc, vector in zip(batch, vectors):
+            pool.add(doc.page_content, vector)
+
+    with store.writer("streaming") as writer:
+        async def _on_page(page):
+            writer.add(page)
+            if page.page_content:
+                counter.add(page.page_content)
+                await summary_context.add(page.page_content)
+
+        stats = await run_streaming_ingestion(
+            _source(), TokenChunker(),
+            on_page=_on_page,
+            prepare_chunk=lambda doc: None,
+            embed=_embed,
+            upsert=_discard,
+            on_vectors=_on_vectors,
+            cleaner=StreamingCleaner(),
+        )
+    keywords = rank_keywords(counter, 10, "streaming", corpus)
+    top_sentences = pool.select(5)
+    context = await summary_context.context()
+    return {"chunks": stats["chunks"], "keywords": len(keywords), "top": len(top_sentences), "context": len(context)}
+
+
+MODES = {"in_memory": _run_in_memory, "streaming": _run_streaming}
+
+
+def _measure(mode: str, total: int, seed: int) -> dict:
+    """현재 프로세스에서 한 번 실행하고 tracemalloc 최대값 / 최대 RSS / 소요 시간 측정"""
+    _install_fakes()
+    with tempfile.TemporaryDirectory() as workdir:
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = asyncio.run(MODES[mode](total, seed, workdir))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    # ru_maxrss: Linux 는 KB, macOS 는 byte
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    maxrss_mb = maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+    return {
+        "mode": mode,
+        "pages": total,
+        **result,
+        "heap_peak_mb": round(peak / (1024 * 1024), 1),
+        "max_rss_mb": round(maxrss_mb, 1),
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="일괄 수집 / 스트리밍 수집 메모리 사용량 비교")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 400, 1600])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--single", nargs=2, metavar=("MODE", "PAGES"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(_measure(args.single[0], int(args.single[1]), args.seed)))
+        return
+
+    rows = []
+    for total in args.pages:
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.ingestion_memory_benchmark",
+                 "--single", mode, str(total), "--seed", str(args.seed)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            rows.append(json.loads(output.strip().splitlines()[-1]))
+
+    columns = list(rows[0].keys())
+    widths = [max(len(col), *(len(str(row[col])) for row in rows)) for col in columns]
+    print("  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[col]).ljust(w) for col, w in zip(columns, widths)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+-- 업로드 문서 중복 제거용 컬럼 추가
+-- content_hash: 업로드 원본 sha256, summary_type: 요약 스타일 (lecture | bullet | exam)
+
+ALTER TABLE document_files
+ADD COLUMN content_hash VARCHAR(64) NULL AFTER review_time,
+ADD COLUMN summary_type VARCHAR(20) NULL AFTER content_hash,
+ADD INDEX ix_document_files_content_hash (content_hash);
@@ -0,0 +1,4 @@
+-- 문서별 핵심 문장 컬럼 추가 (청크 임베딩 기반 로컬 추출 결과)
+
+ALTER TABLE document_files
+ADD COLUMN top_sentences JSON NULL AFTER keywords;
@@ -0,0 +1,4 @@
+-- 문서 재업로드(버전 갱신)용 컬럼 추가
+
+ALTER TABLE document_files
+ADD COLUMN version INT NOT NULL DEFAULT 1 AFTER summary_type;
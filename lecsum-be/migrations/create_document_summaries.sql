@@ -0,0 +1,16 @@
+-- 스타일별 요약 캐시 테이블 생성
+-- (document_id, summary_type, prompt_version) 당 요약 1개, 프롬프트가 바뀌면 새 버전으로 다시 생성
+
+CREATE TABLE IF NOT EXISTS document_summaries (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    document_id INT NOT NULL,
+    summary_type VARCHAR(20) NOT NULL,
+    prompt_version VARCHAR(64) NOT NULL,
+    summary TEXT NOT NULL,
+    concept_cnt INT DEFAULT 0,
+    review_time INT DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    UNIQUE KEY uq_document_summary_style (document_id, summary_type, prompt_version),
+    INDEX ix_document_summaries_document_id (document_id),
+    FOREIGN KEY (document_id) REFERENCES document_files(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
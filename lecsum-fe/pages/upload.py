@@ -1,4 +1,5 @@
 # pages/upload.py
+import time
 import streamlit as st
 import requests
 from pathlib import Path
@@ -8,6 +9,24 @@ import markdown as _markdown
 
 API_BASE_URL = "http://localhost:8000"
 
+# 수집 Job 폴링 설정
+JOB_POLL_INTERVAL_SEC = 1.0
+JOB_TIMEOUT_SEC = 600
+
+# 단계별 표시 문구 (요약/키워드/임베딩 등은 동시에 진행되어 완료 순서가 바뀔 수 있음)
+STAGE_LABELS = {
+    "queued": "대기열에서 순서를 기다리는 중...",
+    "parsing": "문서 텍스트를 추출했습니다.",
+    "chunking": "문서를 분할했습니다.",
+    "summarizing": "요약을 생성했습니다.",
+    "keywords": "키워드를 추출했습니다.",
+    "top_sentences": "핵심 문장을 추출했습니다.",
+    "embedding": "임베딩을 계산했습니다.",
+    "deduplicated": "이미 처리된 문서의 결과를 재사용했습니다.",
+    "saving": "결과를 저장했습니다.",
+    "completed": "완료되었습니다.",
+}
+
 def _md_to_html(md_text: str) -> str:
     """
     Convert markdown text to HTML for Streamlit rendering.
@@ -197,7 +216,7 @@ def render_upload_page():
         with st.spinner("AI가 문서를 분석하고 있습니다..."):
             try:
                 response = requests.post(
-                    f"{API_BASE_URL}/api/uploads/documents?summary_type={summary_type}",
+                    f"{API_BASE_URL}/api/uploads/documents/jobs?summary_type={summary_type}",
                     files={
                         "file": (
                             uploaded_file.name,
@@ -209,7 +228,36 @@ def render_upload_page():
                 )
 
                 response.raise_for_status()
-                result = response.json()
+                job = response.json()["data"]
+
+                # 단계별 진행 상황 폴링
+                progress_bar = st.progress(0, text=STAGE_LABELS["queued"])
+                total_stages = len(STAGE_LABELS) - 2
+                deadline = time.monotonic() + JOB_TIMEOUT_SEC
+                while job["status"] not in ("completed", "failed") and time.monotonic() < deadline:
+                    time.sleep(JOB_POLL_INTERVAL_SEC)
+                    job_res = requests.get(
+                        f"{API_BASE_URL}/api/uploads/jobs/{job['job_id']}",
+                        timeout=30
+                    )
+                    job_res.raise_for_status()
+                    job = job_res.json()["data"]
+
+                    # 완료된 단계 수 기준 진행률
+                    percent = min(100, int(len(job.get("events", [])) / total_stages * 100))
+                    label = STAGE_LABELS.get(job.get("stage") or "queued", STAGE_LABELS["queued"])
+                    progress_bar.progress(percent, text=label)
+
+                progress_bar.empty()
+
+                if job["status"] == "completed":
+                    result = {"status": True, "data": job["result"]}
+                else:
+                    result = {
+                        "status": False,
+                        "message": job.get("error") or "처리 시간이 초과되었습니다.",
+                        "data": None,
+                    }
 
                 if result.get("status"):
                     document_id = result["data"]["id"]
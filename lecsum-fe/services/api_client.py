@@ -50,6 +50,35 @@ class APIClient:
         )
 
         return response.json()
+
+    def create_upload_job(self, file, summary_type: str) -> dict:
+        """
+        비동기 수집 Job 등록 (즉시 job_id 반환)
+        POST /api/uploads/documents/jobs
+        """
+        files = {
+            "file": (file.name, file, file.type)
+        }
+        response = requests.post(
+            f"{self.base_url}/api/uploads/documents/jobs",
+            params={"summary_type": summary_type},
+            files=files,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_upload_job(self, job_id: str) -> dict:
+        """
+        수집 Job 상태 조회
+        GET /api/uploads/jobs/{job_id}
+        """
+        response = requests.get(
+            f"{self.base_url}/api/uploads/jobs/{job_id}",
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
     
     def get_documents(self, limit: int = 10, offset: int = 0) -> dict:
         """